@@ -0,0 +1,84 @@
+"""
+Query latency of the in-memory AvailabilityIndex on synthetic data.
+
+Usage (from the project root, no database needed):
+    python benchmarks/bench_availability.py --vehicles 10000 --reservations 1000000
+
+--blocking is the share of reservations that are Pending/Active (only those
+are indexed). Use 1.0 for the worst case where every reservation blocks.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.availability_index import AvailabilityIndex
+
+TYPES = ["Car", "Truck", "SUV", "Van", "Motorcycle"]
+
+
+def build(vehicle_count, reservation_count, blocking, first_day, days):
+    vehicles = [
+        {'vehicle_id': i, 'type': random.choice(TYPES), 'status': 'Available'}
+        for i in range(1, vehicle_count + 1)
+    ]
+    reservations = []
+    for i in range(1, int(reservation_count * blocking) + 1):
+        start = first_day + timedelta(days=random.randrange(days))
+        reservations.append({
+            'reservation_id': i,
+            'vehicle_id': random.randint(1, vehicle_count),
+            'start_date': start,
+            'end_date': start + timedelta(days=random.randint(1, 14))
+        })
+
+    index = AvailabilityIndex()
+    started = time.perf_counter()
+    index.load(vehicles, reservations)
+    print(f"Indexed {len(reservations)} blocking reservations for {vehicle_count} vehicles "
+          f"in {time.perf_counter() - started:.2f}s")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, default=10000)
+    parser.add_argument("--reservations", type=int, default=1000000)
+    parser.add_argument("--blocking", type=float, default=0.1)
+    parser.add_argument("--days", type=int, default=2500, help="history the reservations are spread over")
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    first_day = date(2020, 1, 1)
+    index = build(args.vehicles, args.reservations, args.blocking, first_day, args.days)
+
+    for label, vehicle_type in (("all types", None), ("one type", "SUV")):
+        timings = []
+        for _ in range(args.queries):
+            start = first_day + timedelta(days=random.randrange(args.days))
+            end = start + timedelta(days=random.randint(1, 7))
+            t0 = time.perf_counter()
+            index.available_vehicles(start, end, vehicle_type)
+            timings.append((time.perf_counter() - t0) * 1000)
+        timings.sort()
+        print(f"available_vehicles ({label:<9}) p50 {statistics.median(timings):.3f} ms   "
+              f"p99 {timings[int(len(timings) * 0.99)]:.3f} ms")
+
+    timings = []
+    for _ in range(args.queries):
+        start = first_day + timedelta(days=random.randrange(args.days))
+        t0 = time.perf_counter()
+        index.is_available(random.randint(1, args.vehicles), start, start + timedelta(days=3))
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    print(f"is_available                   p50 {statistics.median(timings):.3f} ms   "
+          f"p99 {timings[int(len(timings) * 0.99)]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
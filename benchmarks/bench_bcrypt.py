@@ -0,0 +1,61 @@
+"""
+Login throughput of the bcrypt worker pool in src/utils/password_hasher.py.
+
+Usage (from the project root, no database needed):
+    python benchmarks/bench_bcrypt.py --logins 64 --rounds 12 --max-workers 8
+
+Runs the same batch of password checks with 1, 2, 4 ... --max-workers
+hashing threads and prints logins/sec for each, so the hash_workers and
+bcrypt_rounds settings in AUTH_CONFIG can be picked for the target machine.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import wait
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import AUTH_CONFIG
+from src.utils import password_hasher
+
+
+def run(logins, workers, password_hash):
+    # Fresh pool per run so each worker count is measured on its own
+    AUTH_CONFIG['hash_workers'] = workers
+    password_hasher._executor = None
+    executor = password_hasher.get_hash_executor()
+
+    started = time.perf_counter()
+    futures = [password_hasher.check_password_async("secret", password_hash) for _ in range(logins)]
+    wait(futures)
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+
+    if not all(f.result() for f in futures):
+        raise SystemExit("Password check failed")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=AUTH_CONFIG['bcrypt_rounds'])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    password_hash = password_hasher.hash_password("secret", rounds=args.rounds)
+    print(f"bcrypt cost {args.rounds}, {args.logins} logins, {os.cpu_count()} CPUs\n")
+
+    workers = 1
+    baseline = None
+    while workers <= args.max_workers:
+        elapsed = run(args.logins, workers, password_hash)
+        baseline = baseline or elapsed
+        print(f"{workers:>3} workers  {args.logins / elapsed:8.1f} logins/sec   "
+              f"{elapsed * 1000 / args.logins:7.1f} ms/login   x{baseline / elapsed:.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Latency of AdminController.get_dashboard_stats against the old four-query version,
+and of the earnings analytics against the join they replaced.
+
+Usage (from the project root, after running the seeder):
+    python benchmarks/bench_dashboard_stats.py --seed 1000000 --runs 50
+
+--seed inserts that many synthetic reservations first (spread over the
+existing users and vehicles); leave it out to benchmark the data as-is.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.controllers.admin_controller import AdminController
+from src.database.db_manager import DBManager
+from src.database import earnings_rollup
+
+STATUSES = ["Completed"] * 80 + ["Cancelled"] * 10 + ["Active"] * 5 + ["Pending"] * 5
+
+
+def seed_reservations(db, count, batch_size=10000):
+    user_ids = [r['user_id'] for r in db.fetch_all("SELECT user_id FROM Users")]
+    vehicle_ids = [r['vehicle_id'] for r in db.fetch_all("SELECT vehicle_id FROM Vehicles")]
+    if not user_ids or not vehicle_ids:
+        raise SystemExit("Seed users and vehicles first (python src/database/seeder.py)")
+
+    query = """
+        INSERT INTO Reservations (user_id, vehicle_id, start_date, end_date, status, insurance_added, total_cost)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """
+    first_day = date(2020, 1, 1)
+    start = time.perf_counter()
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        for offset in range(0, count, batch_size):
+            rows = []
+            for _ in range(min(batch_size, count - offset)):
+                start_date = first_day + timedelta(days=random.randrange(2500))
+                days = random.randint(1, 14)
+                rows.append((
+                    random.choice(user_ids), random.choice(vehicle_ids),
+                    start_date, start_date + timedelta(days=days),
+                    random.choice(STATUSES), random.random() < 0.3,
+                    round(random.uniform(500, 4000) * days, 2)
+                ))
+            cursor.executemany(query, rows)
+            conn.commit()
+        # Rows inserted behind the controller's back have to be rolled up too
+        earnings_rollup.rebuild(cursor)
+        conn.commit()
+        cursor.close()
+    print(f"Seeded {count} reservations in {time.perf_counter() - start:.1f}s")
+
+
+def old_dashboard_stats(db):
+    # The previous implementation: four queries, four round trips
+    return (
+        db.fetch_one("SELECT SUM(total_cost) as total FROM Reservations WHERE status != 'Cancelled'"),
+        db.fetch_one("SELECT COUNT(*) as count FROM Reservations WHERE status = 'Active'"),
+        db.fetch_one("SELECT COUNT(*) as count FROM Users"),
+        db.fetch_one("SELECT COUNT(*) as count FROM Vehicles"),
+    )
+
+
+def measure(label, fn, runs):
+    fn()  # Warm up caches
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{label:<14} mean {statistics.mean(timings):8.2f} ms   p50 {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def old_earnings_by_type(db):
+    # Before the Earnings_Daily rollup: a join and GROUP BY over every reservation
+    return db.fetch_all("""
+        SELECT v.type, SUM(r.total_cost) as earnings
+        FROM Reservations r
+        JOIN Vehicles v ON r.vehicle_id = v.vehicle_id
+        WHERE r.status != 'Cancelled'
+        GROUP BY v.type
+    """)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="synthetic reservations to insert first")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    db = DBManager()
+    if args.seed:
+        seed_reservations(db, args.seed)
+
+    count = db.fetch_one("SELECT COUNT(*) as count FROM Reservations")['count']
+    print(f"Reservations in database: {count}\n")
+
+    controller = AdminController()
+    measure("four-query", lambda: old_dashboard_stats(db), args.runs)
+    measure("aggregated", controller.get_dashboard_stats, args.runs)
+    print()
+    measure("by-type join", lambda: old_earnings_by_type(db), args.runs)
+    measure("by-type rollup", controller.get_earnings_by_type, args.runs)
+    measure("monthly rollup", lambda: controller.get_earnings_series('month'), args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare queries/sec for connect-per-query against the shared connection pool.
+
+Usage (from the project root, with the database configured in src/config.py):
+    python benchmarks/bench_db_pool.py --queries 2000 --threads 4
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import mysql.connector
+from src.config import DB_CONFIG
+from src.database.db_manager import DBManager
+
+QUERY = "SELECT vehicle_id, daily_rate FROM Vehicles WHERE vehicle_id = %s"
+
+
+def connect_per_query(n):
+    # What DBManager used to do: a full handshake for every query
+    for i in range(n):
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(QUERY, (i % 8 + 1,))
+        cursor.fetchall()
+        cursor.close()
+        conn.close()
+
+
+def pooled(n):
+    db = DBManager()
+    for i in range(n):
+        db.fetch_all(QUERY, (i % 8 + 1,))
+
+
+def run(label, fn, queries, threads):
+    per_thread = queries // threads
+    workers = [threading.Thread(target=fn, args=(per_thread,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    total = per_thread * threads
+    print(f"{label:<20} {total:>7} queries in {elapsed:7.2f}s  ->  {total / elapsed:9.1f} queries/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    run("connect-per-query", connect_per_query, args.queries, args.threads)
+    run("pooled", pooled, args.queries, args.threads)
+
+    metrics = DBManager().get_pool_metrics()
+    print("\nPool metrics:")
+    for key, value in metrics.items():
+        print(f"  {key:<22} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Quote throughput of the pricing engine: quote() per row vs quote_many().
+
+Usage (from the project root, no database needed):
+    python benchmarks/bench_pricing.py --quotes 100000 --equipment 6
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import pricing
+
+TYPES = ["Car", "Truck", "SUV", "Van", "Motorcycle"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quotes", type=int, default=100000)
+    parser.add_argument("--equipment", type=int, default=6, help="size of the equipment catalog")
+    args = parser.parse_args()
+
+    equipment_rates = {i: random.choice([150, 200, 300, 500]) for i in range(1, args.equipment + 1)}
+    rates = [random.choice([800, 1500, 2500, 3500]) for _ in range(args.quotes)]
+    types = [random.choice(TYPES) for _ in range(args.quotes)]
+    days = [random.randint(1, 14) for _ in range(args.quotes)]
+    insurance = [random.random() < 0.3 for _ in range(args.quotes)]
+    equipment_sets = [random.sample(list(equipment_rates), random.randint(0, min(2, args.equipment)))
+                      for _ in range(args.quotes)]
+
+    started = time.perf_counter()
+    looped = [
+        pricing.quote(rate, v_type, d, ins, [equipment_rates[e] for e in eq])
+        for rate, v_type, d, ins, eq in zip(rates, types, days, insurance, equipment_sets)
+    ]
+    loop_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    equipment_daily = pricing.equipment_daily_totals(equipment_sets, equipment_rates)
+    vectorized = pricing.quote_many(rates, types, days, insurance, equipment_daily)
+    vector_time = time.perf_counter() - started
+
+    mismatches = sum(1 for a, b in zip(looped, vectorized.tolist()) if abs(a - b) > 0.005)
+    print(f"quote() loop   {args.quotes / loop_time:12,.0f} quotes/sec   ({loop_time * 1000:.1f} ms)")
+    print(f"quote_many()   {args.quotes / vector_time:12,.0f} quotes/sec   ({vector_time * 1000:.1f} ms)")
+    print(f"Speedup x{loop_time / vector_time:.1f}, mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
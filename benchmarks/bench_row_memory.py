@@ -0,0 +1,81 @@
+"""
+Memory held by 100k result rows as dictionary-cursor dicts versus tuples and
+the slotted models in src/models.
+
+Usage (from the project root, no database needed):
+    python benchmarks/bench_row_memory.py --rows 100000
+
+Rows are synthetic but shaped like what mysql-connector returns (ints, str,
+Decimal, date, datetime). "dict, SELECT *" includes created_at, as the
+controllers' SELECT * queries did; the other variants use the model COLUMNS.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.vehicle import Vehicle, vehicle_from_row
+from src.models.reservation import Reservation
+
+TYPES = ["Car", "Truck", "SUV", "Van", "Motorcycle"]
+BRANDS = ["Toyota", "Mitsubishi", "Ford", "Honda", "Nissan", "Isuzu"]
+
+
+def vehicle_rows(count):
+    created = datetime(2024, 1, 1, 9, 0)
+    for i in range(1, count + 1):
+        yield (i, random.choice(BRANDS), f"Model {i % 500}", random.randint(2010, 2025), f"ABC-{i:06d}",
+               random.choice(TYPES), "Available", Decimal(random.randint(800, 6000)).quantize(Decimal("0.01")), created)
+
+
+def reservation_rows(count):
+    first_day = date(2020, 1, 1)
+    created = datetime(2024, 1, 1, 9, 0)
+    for i in range(1, count + 1):
+        start = first_day + timedelta(days=random.randrange(2500))
+        yield (i, random.randint(1, 50000), random.randint(1, 10000), start, start + timedelta(days=random.randint(1, 14)),
+               "Completed", random.random() < 0.3, Decimal(random.randint(1000, 60000)).quantize(Decimal("0.01")), created)
+
+
+def measure(label, build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<20} {size / 1024 / 1024:8.1f} MiB   {size / len(rows):6.0f} B/row   built in {elapsed * 1000:7.1f} ms")
+    del rows
+
+
+def compare(name, raw, columns, factory):
+    all_columns = columns + ('created_at',)
+    width = len(columns)
+    print(f"{name} ({len(raw)} rows)")
+    # The raw values are shared by every variant, so only the containers are measured
+    measure("dict, SELECT *", lambda: [dict(zip(all_columns, r)) for r in raw])
+    measure("dict, projected", lambda: [dict(zip(columns, r[:width])) for r in raw])
+    measure("tuple, projected", lambda: [r[:width] for r in raw])
+    measure("slotted model", lambda: [factory(r[:width]) for r in raw])
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    compare("Vehicles", list(vehicle_rows(args.rows)), Vehicle.COLUMNS, vehicle_from_row)
+    compare("Reservations", list(reservation_rows(args.rows)), Reservation.COLUMNS, Reservation.from_row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Cold start of the desktop app: import cost of src/main.py and time until the
+login window has been drawn.
+
+Usage (from the project root; the first-frame timing needs a display):
+    python benchmarks/bench_startup.py --runs 5 --top 15
+
+Every run is a fresh interpreter. The import report comes from
+`python -X importtime`; the run fails if any module listed in HEAVY_MODULES
+is imported before a user has logged in, so lazy-import regressions show up.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Must not be imported just to show the login window
+HEAVY_MODULES = ("mysql", "bcrypt", "PIL", "tkcalendar", "numpy")
+
+FIRST_FRAME = """
+import sys
+sys.path.insert(0, {root!r})
+from src.main import MainApp
+app = MainApp()
+app.update()
+print("first-frame", flush=True)
+app.destroy()
+"""
+
+
+def import_report(top):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import src.main"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"Importing src.main failed:\n{result.stderr}")
+
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, self_us, cumulative, name = [part.strip() for part in line.replace("import time:", "| ").split("|")]
+        modules.append((int(cumulative), int(self_us), name))
+
+    total_us = sum(self_us for _, self_us, _ in modules)
+    print(f"Modules imported by src.main: {len(modules)}, {total_us / 1000:.1f} ms in total\n")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_us, name in sorted(modules, reverse=True)[:top]:
+        print(f"{cumulative / 1000:10.1f}ms {self_us / 1000:8.1f}ms  {name}")
+
+    return sorted({name.strip().split('.')[0] for _, _, name in modules} & set(HEAVY_MODULES))
+
+
+def time_to_first_frame(runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-c", FIRST_FRAME.format(root=ROOT)], cwd=ROOT,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        for line in proc.stdout:
+            if line.strip() == "first-frame":
+                timings.append((time.perf_counter() - started) * 1000)
+                break
+        _, stderr = proc.communicate()
+        if proc.returncode != 0:
+            print(f"Could not open the window (no display?):\n{stderr.strip().splitlines()[-1]}")
+            return None
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    heavy = import_report(args.top)
+
+    timings = time_to_first_frame(args.runs)
+    if timings:
+        print(f"\nTime to first frame over {len(timings)} runs: "
+              f"median {statistics.median(timings):.0f} ms, best {min(timings):.0f} ms")
+
+    if heavy:
+        print(f"\nREGRESSION: imported before login: {', '.join(heavy)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
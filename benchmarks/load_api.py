@@ -0,0 +1,159 @@
+"""
+Load test for the HTTP API (src/api/server.py): many concurrent keep-alive
+clients, reporting throughput and p50/p99 latency per endpoint.
+
+Usage (from the project root, with the API running against a seeded database):
+    python -m src.api.server --port 8080
+    python benchmarks/load_api.py --url http://127.0.0.1:8080 --clients 200 --requests 20000
+
+The default mix is read heavy (availability searches and queues); --book adds
+booking attempts in a far-future window (--year) so they don't collide with
+real data. Conflicts (409) are expected under contention and are not errors.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+TYPES = ["All", "Car", "Truck", "SUV", "Van", "Motorcycle"]
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        keep_alive = True
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+            elif name.lower() == 'connection' and value.strip().lower() == 'close':
+                keep_alive = False
+        data = await self.reader.readexactly(length)
+        if not keep_alive:
+            await self.close()
+        return status, data
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def next_request(args, user_ids, vehicle_ids, first_day):
+    """(label, method, path, payload) for one request of the mix"""
+    start = first_day + timedelta(days=random.randrange(args.days))
+    end = start + timedelta(days=random.randint(0, 4))
+    roll = random.random()
+    if args.book and roll < args.book:
+        return ("book", "POST", "/reservations", {
+            'user_id': random.choice(user_ids), 'vehicle_id': random.choice(vehicle_ids),
+            'start_date': start.isoformat(), 'end_date': end.isoformat(), 'insurance': False, 'equipment_ids': []
+        })
+    if roll < 0.7:
+        return ("availability", "GET", f"/vehicles/available?type={random.choice(TYPES)}"
+                f"&start={start.isoformat()}&end={end.isoformat()}", None)
+    if roll < 0.85:
+        return ("pending", "GET", "/reservations/pending", None)
+    return ("stats", "GET", "/stats", None)
+
+
+async def worker(client, count, args, user_ids, vehicle_ids, first_day, timings, statuses):
+    try:
+        for _ in range(count):
+            label, method, path, payload = next_request(args, user_ids, vehicle_ids, first_day)
+            started = time.perf_counter()
+            try:
+                status, _ = await client.request(method, path, payload)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await client.close()
+                status = 'conn'
+            timings[label].append((time.perf_counter() - started) * 1000)
+            statuses[status] += 1
+    finally:
+        await client.close()
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+
+    # IDs for booking requests come from the database the API is serving
+    user_ids, vehicle_ids = [1], [1]
+    if args.book:
+        from src.database.db_manager import DBManager
+        db = DBManager()
+        user_ids = [r['user_id'] for r in db.fetch_all("SELECT user_id FROM Users")]
+        vehicle_ids = [r['vehicle_id'] for r in db.fetch_all("SELECT vehicle_id FROM Vehicles")]
+
+    first_day = date(args.year, 1, 1)
+    timings = defaultdict(list)
+    statuses = defaultdict(int)
+    per_client = args.requests // args.clients
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        worker(Client(host, port), per_client, args, user_ids, vehicle_ids, first_day, timings, statuses)
+        for _ in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    total = per_client * args.clients
+    print(f"Requests:   {total} from {args.clients} clients in {elapsed:.2f}s ({total / elapsed:.1f} req/s)")
+    print(f"Statuses:   {dict(sorted(statuses.items(), key=str))}")
+    everything = sorted(t for values in timings.values() for t in values)
+    for label, values in sorted(timings.items()) + [("all", everything)]:
+        values.sort()
+        print(f"{label:<13} n={len(values):<7} p50 {statistics.median(values):8.2f} ms   "
+              f"p99 {percentile(values, 0.99):8.2f} ms   max {values[-1]:8.2f} ms")
+
+    failed = sum(count for status, count in statuses.items() if status == 'conn' or status >= 500)
+    return 0 if failed == 0 else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--book", type=float, default=0.0, help="share of requests that try to book (0-1)")
+    parser.add_argument("--days", type=int, default=60, help="width of the date window searched and booked")
+    parser.add_argument("--year", type=int, default=2099)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
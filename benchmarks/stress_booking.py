@@ -0,0 +1,124 @@
+"""
+Fire concurrent booking attempts at RentalController.create_reservation and
+check that no two Pending/Active reservations of a vehicle overlap.
+
+Usage (from the project root, against a local MySQL/MariaDB seeded with
+src/database/seeder.py):
+    python benchmarks/stress_booking.py --attempts 5000 --threads 32 --vehicles 4
+
+Bookings are placed in a far-future window (--year) so they don't collide
+with real data; pass --cleanup to delete them afterwards.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import POOL_CONFIG
+from src.controllers.rental_controller import RentalController, BookingConflictError
+from src.database.db_manager import DBManager
+from src.database import earnings_rollup
+
+
+def worker(controller, attempts, user_ids, vehicle_ids, first_day, days, results, lock):
+    booked = conflicts = errors = 0
+    for _ in range(attempts):
+        start = first_day + timedelta(days=random.randrange(days))
+        end = start + timedelta(days=random.randint(0, 4))
+        try:
+            controller.create_reservation(random.choice(user_ids), random.choice(vehicle_ids), start, end, False, [])
+            booked += 1
+        except BookingConflictError:
+            conflicts += 1
+        except Exception as e:
+            errors += 1
+            print(f"Error: {e}")
+    with lock:
+        results['booked'] += booked
+        results['conflicts'] += conflicts
+        results['errors'] += errors
+
+
+def count_overlaps(db, first_day, last_day):
+    row = db.fetch_one("""
+        SELECT COUNT(*) as overlaps
+        FROM Reservations a
+        JOIN Reservations b
+          ON a.vehicle_id = b.vehicle_id AND a.reservation_id < b.reservation_id
+         AND a.start_date <= b.end_date AND a.end_date >= b.start_date
+        WHERE a.status IN ('Pending', 'Active') AND b.status IN ('Pending', 'Active')
+          AND a.start_date BETWEEN %s AND %s AND b.start_date BETWEEN %s AND %s
+    """, (first_day, last_day, first_day, last_day))
+    return row['overlaps']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--vehicles", type=int, default=4, help="fewer vehicles means more contention")
+    parser.add_argument("--days", type=int, default=60, help="width of the booking window")
+    parser.add_argument("--year", type=int, default=2099)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    # One connection per thread so the pool isn't the bottleneck being measured
+    POOL_CONFIG['pool_size'] = args.threads
+
+    db = DBManager()
+    user_ids = [r['user_id'] for r in db.fetch_all("SELECT user_id FROM Users")]
+    vehicle_ids = [r['vehicle_id'] for r in db.fetch_all("SELECT vehicle_id FROM Vehicles LIMIT %s", (args.vehicles,))]
+    if not user_ids or not vehicle_ids:
+        raise SystemExit("Seed users and vehicles first (python src/database/seeder.py)")
+
+    first_day = date(args.year, 1, 1)
+    last_day = first_day + timedelta(days=args.days + 5)
+
+    # Each thread gets its own controller, like separate counter PCs would
+    results = {'booked': 0, 'conflicts': 0, 'errors': 0}
+    lock = threading.Lock()
+    per_thread = args.attempts // args.threads
+    threads = [
+        threading.Thread(target=worker, args=(RentalController(), per_thread, user_ids, vehicle_ids,
+                                              first_day, args.days, results, lock))
+        for _ in range(args.threads)
+    ]
+
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    attempts = per_thread * args.threads
+    overlaps = count_overlaps(db, first_day, last_day)
+    print(f"Attempts:   {attempts} over {len(vehicle_ids)} vehicles with {args.threads} threads")
+    print(f"Booked:     {results['booked']}")
+    print(f"Conflicts:  {results['conflicts']}")
+    print(f"Errors:     {results['errors']}")
+    print(f"Throughput: {attempts / elapsed:.1f} attempts/sec ({elapsed:.2f}s)")
+    print(f"Overlaps:   {overlaps}  ->  {'OK' if overlaps == 0 else 'DOUBLE BOOKED'}")
+
+    if args.cleanup:
+        with db.transaction() as cursor:
+            # Their change feed events go too, or dashboards would poll events for missing reservations
+            cursor.execute("""
+                DELETE e FROM Reservation_Events e
+                JOIN Reservations r ON r.reservation_id = e.reservation_id
+                WHERE r.start_date BETWEEN %s AND %s
+            """, (first_day, last_day))
+            cursor.execute("DELETE FROM Reservations WHERE start_date BETWEEN %s AND %s", (first_day, last_day))
+            # The deleted bookings were counted in the earnings rollup
+            earnings_rollup.rebuild(cursor)
+
+    sys.exit(0 if overlaps == 0 and results['errors'] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
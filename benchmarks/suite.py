@@ -0,0 +1,286 @@
+"""
+Reproducible benchmark suite: generate a synthetic dataset at scale, time the
+key controller paths against it, and compare results between commits.
+
+Usage (from the project root, against a database created with the seeder -
+use a dedicated one, e.g. set DB_CONFIG['database'] or pass --database):
+    python benchmarks/suite.py --database rental_bench generate --vehicles 10000 --users 500000 --reservations 5000000
+    python benchmarks/suite.py --database rental_bench run --runs 30 --output bench-$(git rev-parse --short HEAD).json
+    python benchmarks/suite.py compare bench-abc1234.json bench-def5678.json --threshold 10
+
+generate is seeded (--seed), so the same arguments give the same rows on any
+machine. run draws its query parameters from a seeded generator too, and
+writes timings (ms) per path to JSON along with the commit and dataset size.
+compare exits non-zero if any path's p50 got slower by more than --threshold %.
+
+Write paths (book, approve, return) use vehicles that are free in a far-future
+window (--year) and remove everything they created afterwards.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import DB_CONFIG
+
+TYPES = ["All", "Car", "Truck", "SUV", "Van", "Motorcycle"]
+
+
+# --- generate ---
+
+def check_columns(db):
+    """Stop with a clear message when the tables don't have the columns the generator writes"""
+    from src.database.datagen import (USER_COLUMNS, VEHICLE_COLUMNS, EQUIPMENT_COLUMNS, RESERVATION_COLUMNS,
+                                      RESERVATION_EQUIPMENT_COLUMNS)
+    existing = {}
+    for row in db.fetch_all("""
+        SELECT LOWER(table_name) as table_name, LOWER(column_name) as column_name
+        FROM information_schema.columns WHERE table_schema = DATABASE()
+    """):
+        existing.setdefault(row['table_name'], set()).add(row['column_name'])
+    for table, columns in (("Users", USER_COLUMNS), ("Vehicles", VEHICLE_COLUMNS), ("Equipment", EQUIPMENT_COLUMNS),
+                           ("Reservations", RESERVATION_COLUMNS),
+                           ("Reservation_Equipment", RESERVATION_EQUIPMENT_COLUMNS)):
+        missing = [c for c in columns if c not in existing.get(table.lower(), set())]
+        if missing:
+            raise SystemExit(f"{table} in {DB_CONFIG['database']} has no column {', '.join(missing)} - "
+                             "run python -m src.database.seeder to create or migrate the schema first")
+
+
+def generate(args):
+    from src.database.db_manager import DBManager
+    from src.database.seeder import bulk_seed
+    check_columns(DBManager())
+    bulk_seed(args.vehicles, args.users, args.reservations, years=args.years, seed=args.seed,
+              method=args.method, batch_rows=args.batch_size)
+
+
+# --- run ---
+
+def measure(fn, runs, warmup):
+    """Timings in ms of `runs` calls of fn(i), after `warmup` untimed calls; i counts every call"""
+    for i in range(warmup):
+        fn(i)
+    timings = []
+    for i in range(warmup, warmup + runs):
+        started = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    pick = lambda p: timings[min(len(timings) - 1, int(len(timings) * p))]
+    return {
+        'runs': len(timings),
+        'mean_ms': statistics.mean(timings),
+        'p50_ms': statistics.median(timings),
+        'p95_ms': pick(0.95),
+        'p99_ms': pick(0.99),
+        'min_ms': timings[0],
+        'max_ms': timings[-1],
+    }
+
+
+def dataset_size(db):
+    row = db.fetch_one("""
+        SELECT (SELECT COUNT(*) FROM Users) as users, (SELECT COUNT(*) FROM Vehicles) as vehicles,
+               (SELECT COUNT(*) FROM Reservations) as reservations
+    """)
+    return {key: int(value) for key, value in row.items()}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    from src.controllers.rental_controller import RentalController, BookingConflictError
+    from src.controllers.admin_controller import AdminController
+    from src.database.db_manager import DBManager
+    from src.database import earnings_rollup
+
+    db = DBManager()
+    rentals = RentalController()
+    admin = AdminController()
+    rng = random.Random(args.seed)
+    today = date.today()
+
+    user_ids = [r['user_id'] for r in db.fetch_all("SELECT user_id FROM Users WHERE role = 'Member' LIMIT 10000")]
+    if not user_ids:
+        raise SystemExit("No data - run the seeder and `suite.py generate` first")
+    # The user with the longest history, for the history listing
+    busiest = db.fetch_one("""
+        SELECT user_id FROM Reservations GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 1
+    """)['user_id']
+
+    def random_range(i):
+        start = today + timedelta(days=rng.randrange(-365, 60))
+        return start, start + timedelta(days=rng.randint(1, 7))
+
+    results = {}
+
+    def bench(name, fn, runs=None):
+        if runs is not None and runs < 1:
+            print(f"{name:<28} skipped (nothing to run)")
+            return
+        timings = measure(fn, runs or args.runs, args.warmup)
+        results[name] = summarize(timings)
+        r = results[name]
+        print(f"{name:<28} p50 {r['p50_ms']:9.2f} ms   p95 {r['p95_ms']:9.2f} ms   max {r['max_ms']:9.2f} ms")
+
+    # Availability: the first call builds the in-memory index, later calls query it
+    bench("availability.index_load", lambda i: (rentals.availability.invalidate(), rentals._get_availability()),
+          runs=max(3, args.runs // 10))
+    bench("availability.search", lambda i: rentals.get_available_vehicles(rng.choice(TYPES), *random_range(i)))
+    bench("availability.compare", lambda i: rentals.compare_vehicles(rng.choice(TYPES[1:]), *random_range(i)))
+
+    bench("dashboard.stats", lambda i: admin.get_dashboard_stats())
+    bench("dashboard.earnings_monthly", lambda i: admin.get_earnings_series('month'))
+
+    bench("history.first_page", lambda i: admin.get_reservations_page(limit=50))
+    page_cursor = None
+    def deep_page(i):
+        nonlocal page_cursor
+        _, page_cursor = admin.get_reservations_page(limit=50, cursor=page_cursor)
+    bench("history.next_pages", deep_page)
+    bench("history.by_status", lambda i: admin.get_reservations_page(limit=50, status=rng.choice(["Pending", "Active", "Completed"])))
+    bench("history.busiest_user", lambda i: rentals.get_user_reservations(busiest))
+
+    # Write paths, in a window no real booking uses
+    first_day = date(args.year, 1, 1)
+    vehicles = [r['vehicle_id'] for r in db.fetch_all(
+        "SELECT vehicle_id FROM Vehicles WHERE status = 'Available' ORDER BY vehicle_id LIMIT %s",
+        (args.runs + args.warmup,))]
+    if len(vehicles) < args.runs + args.warmup:
+        print("Not enough available vehicles for the write paths - skipped")
+    else:
+        log_mark = db.fetch_one("SELECT COALESCE(MAX(log_id), 0) as log_id FROM Vehicle_Logs")['log_id']
+        created = []
+        def book(i):
+            start = first_day + timedelta(days=rng.randrange(300))
+            try:
+                created.append(rentals.create_reservation(rng.choice(user_ids), vehicles[i], start,
+                                                          start + timedelta(days=3), False, []))
+            except BookingConflictError:
+                pass
+        try:
+            bench("write.book", book, runs=len(vehicles) - args.warmup)
+            bench("write.approve", lambda i: rentals.approve_reservations([created[i]]), runs=len(created) - args.warmup)
+            bench("write.return", lambda i: rentals.return_vehicles([(created[i], "Benchmark return")]),
+                  runs=len(created) - args.warmup)
+        finally:
+            cleanup(db, earnings_rollup, created, log_mark, args.year)
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'database': DB_CONFIG['database'],
+        'dataset': dataset_size(db),
+        'seed': args.seed,
+        'results': results,
+    }
+
+
+def cleanup(db, earnings_rollup, reservation_ids, log_mark, year):
+    """Delete what the write paths created; refuses if any id is a reservation outside the benchmark year"""
+    if not reservation_ids:
+        return
+    assert all(type(r) is int for r in reservation_ids), f"Not reservation ids: {reservation_ids[:5]}"
+    placeholders = ','.join(['%s'] * len(reservation_ids))
+    with db.transaction() as cursor:
+        cursor.execute(f"""
+            SELECT reservation_id FROM Reservations
+            WHERE reservation_id IN ({placeholders}) AND (start_date < %s OR end_date > %s)
+        """, tuple(reservation_ids) + (date(year, 1, 1), date(year, 12, 31)))
+        outside = [row['reservation_id'] for row in cursor.fetchall()]
+        assert not outside, f"Refusing to delete reservations outside {year}: {outside[:10]}"
+        earnings_rollup.apply_reservations(cursor, reservation_ids, -1)
+        for table in ("Reservation_Events", "Reservation_Equipment", "Reservations"):
+            cursor.execute(f"DELETE FROM {table} WHERE reservation_id IN ({placeholders})", tuple(reservation_ids))
+        cursor.execute("DELETE FROM Vehicle_Logs WHERE log_id > %s AND description = 'Benchmark return'", (log_mark,))
+
+
+# --- compare ---
+
+def compare(args):
+    with open(args.baseline) as f:
+        old = json.load(f)
+    with open(args.current) as f:
+        new = json.load(f)
+    print(f"baseline {old.get('commit') or '?'} {old['dataset']}")
+    print(f"current  {new.get('commit') or '?'} {new['dataset']}\n")
+
+    regressions = 0
+    for name, result in new['results'].items():
+        before = old['results'].get(name)
+        if not before:
+            print(f"{name:<28} {result['p50_ms']:9.2f} ms   (new)")
+            continue
+        change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<28} {before['p50_ms']:9.2f} -> {result['p50_ms']:9.2f} ms   {change:+6.1f}%{flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", help="database to use instead of DB_CONFIG['database']")
+    parser.add_argument("--seed", type=int, default=42)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="insert a synthetic dataset")
+    gen.add_argument("--vehicles", type=int, default=10000)
+    gen.add_argument("--users", type=int, default=500000)
+    gen.add_argument("--reservations", type=int, default=5000000)
+    gen.add_argument("--years", type=float, default=6, help="history the reservations are spread over")
+    gen.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT statement")
+    gen.add_argument("--method", choices=("insert", "infile"), default="insert",
+                     help="multi-row INSERTs, or LOAD DATA LOCAL INFILE (needs local_infile=ON)")
+
+    bench = commands.add_parser("run", help="time the controller paths")
+    bench.add_argument("--runs", type=int, default=30)
+    bench.add_argument("--warmup", type=int, default=3)
+    bench.add_argument("--year", type=int, default=2099, help="year used by the write paths")
+    bench.add_argument("--output", help="write results to this JSON file")
+
+    cmp = commands.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=10.0, help="p50 slowdown (%%) reported as a regression")
+
+    args = parser.parse_args()
+    if args.database:
+        DB_CONFIG['database'] = args.database
+
+    if args.command == "generate":
+        generate(args)
+    elif args.command == "run":
+        report = run(args)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"\nResults written to {args.output}")
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Headless HTTP API in front of the controllers, so thin clients and the website
+share this process's connection pool instead of each opening their own.
+
+Usage (from the project root):
+    python -m src.api.server --port 8080
+
+There is no authentication or role check: any caller can book for any user_id
+and approve, reject or return reservations. The server therefore only binds to
+a loopback address (API_CONFIG['host'], 127.0.0.1 by default) and is meant for
+clients on the same machine, e.g. a website backend next to it. Any other
+--host is refused unless --allow-remote is passed, which is only safe behind
+something that authenticates the callers.
+
+Endpoints (JSON in, JSON out; dates are YYYY-MM-DD):
+    GET  /health
+    GET  /vehicles/available?type=SUV&start=2025-01-10&end=2025-01-12
+    GET  /equipment/available?start=2025-01-10&end=2025-01-12
+    POST /reservations                {user_id, vehicle_id, start_date, end_date, insurance, equipment_ids}
+    GET  /reservations/pending
+    POST /reservations/approve        {reservation_ids: [...]}
+    POST /reservations/reject         {reservation_ids: [...]}
+    GET  /rentals/active
+    POST /rentals/return              {returns: [{reservation_id, notes}, ...]}
+    GET  /stats
+
+The event loop only parses requests and writes responses. Controller calls
+block on MySQL, so they run on a thread pool no larger than the connection
+pool - a request never holds a thread while it waits for a connection.
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import mysql.connector
+from src.config import API_CONFIG
+from src.controllers.rental_controller import RentalController, BookingConflictError, ValidationError
+from src.controllers.admin_controller import AdminController
+from src.database.connection_pool import PoolTimeoutError
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def to_json(value):
+    """json.dumps default for what MySQL rows contain"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def parse_date(value, name):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"'{name}' must be a date (YYYY-MM-DD)")
+
+
+def require(body, name):
+    if not isinstance(body, dict):
+        raise HTTPError(400, f"Expected an object with '{name}'")
+    if name not in body:
+        raise HTTPError(400, f"Missing field '{name}'")
+    return body[name]
+
+
+def is_int(value):
+    # JSON true/false arrive as bool, which is an int subclass
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_int(value, name):
+    if not is_int(value):
+        raise HTTPError(400, f"'{name}' must be an integer")
+    return value
+
+
+def parse_bool(value, name):
+    if not isinstance(value, bool):
+        raise HTTPError(400, f"'{name}' must be true or false")
+    return value
+
+
+def parse_ids(value, name):
+    if not isinstance(value, list) or not all(is_int(v) for v in value):
+        raise HTTPError(400, f"'{name}' must be a list of integers")
+    return value
+
+
+class RentalAPI:
+    """Routes requests to controller calls; every handler runs on a worker thread"""
+
+    def __init__(self):
+        self.rentals = RentalController()
+        self.admin = AdminController()
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/vehicles/available'): self.available_vehicles,
+            ('GET', '/equipment/available'): self.available_equipment,
+            ('POST', '/reservations'): self.create_reservation,
+            ('GET', '/reservations/pending'): self.pending_reservations,
+            ('POST', '/reservations/approve'): self.approve_reservations,
+            ('POST', '/reservations/reject'): self.reject_reservations,
+            ('GET', '/rentals/active'): self.active_rentals,
+            ('POST', '/rentals/return'): self.return_vehicles,
+            ('GET', '/stats'): self.stats,
+        }
+
+    def resolve(self, method, path):
+        handler = self.routes.get((method, path))
+        if handler:
+            return handler
+        if any(route_path == path for _, route_path in self.routes):
+            raise HTTPError(405, f"{method} not allowed on {path}")
+        raise HTTPError(404, f"No route for {path}")
+
+    def health(self, query, body):
+        return 200, {'status': 'ok', 'pool': self.rentals.db.get_pool_metrics()}
+
+    def available_vehicles(self, query, body):
+        start = query.get('start')
+        end = query.get('end')
+        if (start is None) != (end is None):
+            raise HTTPError(400, "Pass both 'start' and 'end', or neither")
+        if start is not None:
+            start, end = parse_date(start, 'start'), parse_date(end, 'end')
+        return 200, self.rentals.get_available_vehicles(query.get('type'), start, end)
+
+    def available_equipment(self, query, body):
+        start = parse_date(query.get('start'), 'start')
+        end = parse_date(query.get('end'), 'end')
+        return 200, self.rentals.get_equipment_availability(start, end)
+
+    def create_reservation(self, query, body):
+        reservation_id = self.rentals.create_reservation(
+            parse_int(require(body, 'user_id'), 'user_id'), parse_int(require(body, 'vehicle_id'), 'vehicle_id'),
+            parse_date(require(body, 'start_date'), 'start_date'), parse_date(require(body, 'end_date'), 'end_date'),
+            parse_bool(body.get('insurance', False), 'insurance'), parse_ids(body.get('equipment_ids', []), 'equipment_ids')
+        )
+        return 201, {'reservation_id': reservation_id}
+
+    def pending_reservations(self, query, body):
+        return 200, self.rentals.get_pending_reservations()
+
+    def approve_reservations(self, query, body):
+        ids = parse_ids(require(body, 'reservation_ids'), 'reservation_ids')
+        return 200, {'approved': self.rentals.approve_reservations(ids)}
+
+    def reject_reservations(self, query, body):
+        ids = parse_ids(require(body, 'reservation_ids'), 'reservation_ids')
+        return 200, {'rejected': self.rentals.reject_reservations(ids)}
+
+    def active_rentals(self, query, body):
+        return 200, self.rentals.get_all_active_rentals()
+
+    def return_vehicles(self, query, body):
+        returns = require(body, 'returns')
+        if not isinstance(returns, list):
+            raise HTTPError(400, "'returns' must be a list")
+        batch = [(parse_int(require(r, 'reservation_id'), 'reservation_id'), r.get('notes') or "Standard return") for r in returns]
+        return 200, {'returned': self.rentals.return_vehicles(batch)}
+
+    def stats(self, query, body):
+        return 200, self.admin.get_dashboard_stats()
+
+    def handle(self, method, target, body):
+        """Run one request to completion: (status, payload)"""
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            handler = self.resolve(method, url.path)
+            if method == 'POST':
+                try:
+                    body = json.loads(body or b'{}')
+                except ValueError:
+                    raise HTTPError(400, "Body is not valid JSON")
+                if not isinstance(body, dict):
+                    raise HTTPError(400, "Body must be a JSON object")
+            return handler(query, body)
+        except HTTPError as err:
+            return err.status, {'error': str(err)}
+        except BookingConflictError as err:
+            return 409, {'error': str(err)}
+        except PoolTimeoutError as err:
+            return 503, {'error': str(err)}
+        except ValidationError as err:
+            # Input the controllers reject on purpose ("Vehicle not found", ...)
+            return 400, {'error': str(err)}
+        except mysql.connector.Error as err:
+            print(f"API Database Error: {err}")
+            return 500, {'error': "Database error"}
+        except Exception:
+            # Bugs and outages are logged here, never echoed to the client
+            print(f"API Error on {method} {url.path}:\n{traceback.format_exc()}")
+            return 500, {'error': "Internal server error"}
+
+
+class APIServer:
+    """Minimal HTTP/1.1 server on asyncio streams, with keep-alive"""
+
+    def __init__(self, api, workers=None, max_body=None):
+        self.api = api
+        self.workers = workers or API_CONFIG['workers']
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="api")
+        self.max_body = max_body or API_CONFIG['max_body_bytes']
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"API listening on http://{host}:{port} with {self.workers} workers")
+        async with server:
+            await server.serve_forever()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                # Idle keep-alive connections are closed so they don't pile up
+                request = await asyncio.wait_for(self.read_request(reader), API_CONFIG['idle_timeout'])
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                if isinstance(body, HTTPError):
+                    status, payload = body.status, {'error': str(body)}
+                    keep_alive = False
+                else:
+                    loop = asyncio.get_running_loop()
+                    status, payload = await loop.run_in_executor(self.executor, self.api.handle, method, target, body)
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                writer.write(self.render(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def read_request(self, reader):
+        """(method, target, version, headers, body) or None when the client hung up"""
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3:
+            return 'GET', '/', 'HTTP/1.0', {}, HTTPError(400, "Malformed request line")
+        method, target, version = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            return method, target, version, headers, HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body:
+            return method, target, version, headers, HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return method, target, version, headers, body
+
+    @staticmethod
+    def render(status, payload, keep_alive):
+        body = json.dumps(payload, default=to_json).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode('latin-1') + body
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=API_CONFIG['host'])
+    parser.add_argument("--port", type=int, default=API_CONFIG['port'])
+    parser.add_argument("--workers", type=int, default=API_CONFIG['workers'])
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="bind to a non-loopback host; the API has no authentication of its own")
+    args = parser.parse_args()
+    if not args.allow_remote and not is_loopback(args.host):
+        parser.error(f"refusing to serve the unauthenticated API on {args.host}; pass --allow-remote to override")
+
+    server = APIServer(RentalAPI(), workers=args.workers)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,76 @@
+import os
+
 DB_CONFIG = {
     'host': 'localhost',
     'user': 'root',
     'password': '',  # Default for XAMPP/WAMP often empty, or 'root'
     'database': 'vehicle_rental'
 }
+
+# Shared connection pool used by every DBManager instance
+POOL_CONFIG = {
+    'pool_size': 5,               # Maximum number of open connections
+    'acquire_timeout': 10,        # Seconds to wait for a free connection
+    'max_idle_time': 300,         # Close connections idle longer than this (seconds)
+    'health_check_interval': 30   # Ping connections idle longer than this before reuse
+}
+
+# In-memory availability index (see src/utils/availability_index.py)
+AVAILABILITY_CONFIG = {
+    'refresh_interval': 60  # Seconds before the index is rebuilt to pick up other counters' bookings
+}
+
+# Vehicle thumbnails (see src/utils/image_helper.py)
+IMAGE_CACHE_CONFIG = {
+    'memory_limit_mb': 64,  # Decoded PhotoImages kept in memory
+    'index_check_interval': 5,  # Seconds between checks of src/img/vehicles for new images
+    'disk_cache_dir': os.path.join(os.path.expanduser("~"), ".cache", "vehicle_rental", "thumbnails")
+}
+
+# Background workers that run controller calls off the Tk main thread
+TASK_CONFIG = {
+    'max_workers': 4,
+    'poll_interval': 50  # Milliseconds between checks for finished tasks
+}
+
+# Password hashing (see src/utils/password_hasher.py)
+AUTH_CONFIG = {
+    'bcrypt_rounds': 12,             # Raising this upgrades stored hashes on each user's next login
+    'hash_workers': os.cpu_count() or 2
+}
+
+# Equipment and vehicle rates cached in memory (see src/utils/reference_cache.py)
+REFERENCE_CACHE_CONFIG = {
+    'ttl': 300  # Seconds before cached reference data is reloaded
+}
+
+# Reservation change feed polled by open dashboards (see src/utils/change_feed.py)
+CHANGE_FEED_CONFIG = {
+    'poll_interval': 3000,  # Milliseconds between polls
+    'batch_size': 500,      # Most events read per poll
+    'settle_seconds': 10    # Events younger than this are re-read, in case a lower id commits late
+}
+
+# Headless HTTP API (see src/api/server.py)
+API_CONFIG = {
+    'host': '127.0.0.1',  # Loopback only: the API has no authentication (see src/api/server.py)
+    'port': 8080,
+    'workers': POOL_CONFIG['pool_size'],  # Threads running controller calls - more would only queue on the pool
+    'max_body_bytes': 1024 * 1024,
+    'idle_timeout': 30  # Seconds a keep-alive connection may sit idle
+}
+
+# Streamed queries (DBManager.iter_query)
+STREAM_CONFIG = {
+    'batch_size': 2000,          # Rows fetched from the server per round trip
+    'net_write_timeout': 600     # Seconds the server waits on a slow consumer before aborting
+}
+
+# Query instrumentation (see src/database/query_stats.py)
+QUERY_STATS_CONFIG = {
+    'enabled': True,
+    'slow_query_ms': 200,          # Queries at least this slow go to the slow query log
+    'explain_slow_queries': True,  # Capture EXPLAIN for slow SELECTs (runs one extra query each)
+    'recent_slow_queries': 50,     # Kept in memory for the admin Diagnostics view
+    'slow_log_path': os.path.join(os.path.expanduser("~"), ".cache", "vehicle_rental", "slow_queries.log")
+}
@@ -1,60 +1,165 @@
-from src.database.db_manager import DBManager
-import bcrypt
+import csv
+from src.database.db_manager import DBManager, select_list
+from src.models.user import User, user_from_row
+from src.models.reservation import Reservation
+from src.utils.reference_cache import get_reference_cache
+from src.utils.password_hasher import hash_password_async
 
 class AdminController:
     def __init__(self):
         self.db = DBManager()
 
     def get_dashboard_stats(self):
-        stats = {}
-        
-        # Total Earnings (Completed or Active, excluding Cancelled)
-        query_earnings = "SELECT SUM(total_cost) as total FROM Reservations WHERE status != 'Cancelled'"
-        res_earnings = self.db.fetch_one(query_earnings)
-        stats['total_earnings'] = res_earnings['total'] if res_earnings and res_earnings['total'] else 0.0
-
-        # Active Rentals
-        query_active = "SELECT COUNT(*) as count FROM Reservations WHERE status = 'Active'"
-        res_active = self.db.fetch_one(query_active)
-        stats['active_rentals'] = res_active['count'] if res_active else 0
-
-        # Total Users
-        query_users = "SELECT COUNT(*) as count FROM Users"
-        res_users = self.db.fetch_one(query_users)
-        stats['total_users'] = res_users['count'] if res_users else 0
-
-        # Total Vehicles
-        query_vehicles = "SELECT COUNT(*) as count FROM Vehicles"
-        res_vehicles = self.db.fetch_one(query_vehicles)
-        stats['total_vehicles'] = res_vehicles['count'] if res_vehicles else 0
-
-        return stats
+        # Single round trip - earnings come from the Earnings_Daily rollup, active rentals from idx_reservations_status_cost
+        query = """
+            SELECT
+                (SELECT SUM(earnings) FROM Earnings_Daily) as total_earnings,
+                (SELECT COUNT(*) FROM Reservations WHERE status = 'Active') as active_rentals,
+                (SELECT COUNT(*) FROM Users) as total_users,
+                (SELECT COUNT(*) FROM Vehicles) as total_vehicles
+        """
+        res = self.db.fetch_one(query) or {}
+
+        return {
+            'total_earnings': res.get('total_earnings') or 0.0,
+            'active_rentals': res.get('active_rentals') or 0,
+            'total_users': res.get('total_users') or 0,
+            'total_vehicles': res.get('total_vehicles') or 0
+        }
 
     def get_all_reservations(self):
-        query = """
-            SELECT r.reservation_id, u.username, v.brand, v.model, r.start_date, r.end_date, r.total_cost, r.status
+        """Every reservation, newest first, as Reservation records (for reports - the admin list pages instead)"""
+        query = f"SELECT {select_list(Reservation.COLUMNS)} FROM Reservations ORDER BY created_at DESC"
+        return self.db.fetch_models(query, factory=Reservation.from_row)
+
+    EXPORT_COLUMNS = ('reservation_id', 'created_at', 'username', 'full_name', 'brand', 'model', 'license_plate',
+                      'start_date', 'end_date', 'status', 'insurance_added', 'total_cost')
+
+    def export_reservations(self, file, status=None):
+        """
+        Write reservations as CSV to an open text file, oldest first. Rows are
+        streamed from the server, so years of history never sit in memory at once.
+        Returns the number of rows written.
+        """
+        params = []
+        where = ""
+        if status and status != "All":
+            where = "WHERE r.status = %s"
+            params.append(status)
+        query = f"""
+            SELECT r.reservation_id, r.created_at, u.username,
+                   CONCAT_WS(' ', u.first_name, u.last_name) as full_name, v.brand, v.model, v.license_plate,
+                   r.start_date, r.end_date, r.status, r.insurance_added, r.total_cost
             FROM Reservations r
             JOIN Users u ON r.user_id = u.user_id
             JOIN Vehicles v ON r.vehicle_id = v.vehicle_id
-            ORDER BY r.created_at DESC
+            {where}
+            ORDER BY r.reservation_id
         """
-        return self.db.fetch_all(query)
+        writer = csv.writer(file)
+        writer.writerow(self.EXPORT_COLUMNS)
+        count = 0
+        for row in self.db.iter_query(query, tuple(params), factory=tuple):
+            writer.writerow(row)
+            count += 1
+        return count
 
-    def get_earnings_by_type(self):
-        query = """
-            SELECT v.type, SUM(r.total_cost) as earnings
+    def get_reservations_page(self, limit=50, cursor=None, status=None, start_date=None, end_date=None, user_id=None):
+        """
+        One page of reservations, newest first, using a keyset cursor so deep pages cost
+        the same as the first one. cursor is the (created_at, reservation_id) of the last
+        row of the previous page. Returns (rows, next_cursor); next_cursor is None on the last page.
+        """
+        conditions = []
+        params = []
+        if status and status != "All":
+            conditions.append("r.status = %s")
+            params.append(status)
+        if user_id:
+            conditions.append("r.user_id = %s")
+            params.append(user_id)
+        # Date filters select reservations overlapping the range
+        if start_date:
+            conditions.append("r.end_date >= %s")
+            params.append(start_date)
+        if end_date:
+            conditions.append("r.start_date <= %s")
+            params.append(end_date)
+        if cursor:
+            created_at, reservation_id = cursor
+            conditions.append("(r.created_at < %s OR (r.created_at = %s AND r.reservation_id < %s))")
+            params.extend([created_at, created_at, reservation_id])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+            SELECT r.reservation_id, r.created_at, u.username, v.brand, v.model, r.start_date, r.end_date, r.total_cost, r.status
             FROM Reservations r
+            JOIN Users u ON r.user_id = u.user_id
             JOIN Vehicles v ON r.vehicle_id = v.vehicle_id
-            WHERE r.status != 'Cancelled'
-            GROUP BY v.type
+            {where}
+            ORDER BY r.created_at DESC, r.reservation_id DESC
+            LIMIT %s
+        """
+        # Fetch one extra row to know whether another page exists
+        rows = self.db.fetch_all(query, tuple(params) + (limit + 1,))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]['created_at'], rows[-1]['reservation_id'])
+        return rows, next_cursor
+
+    def get_earnings_by_type(self):
+        # Read from the rollup, so the cost depends on days of history, not on the number of reservations
+        query = """
+            SELECT vehicle_type as type, SUM(earnings) as earnings
+            FROM Earnings_Daily
+            GROUP BY vehicle_type
+            HAVING SUM(reservations) > 0
         """
         return self.db.fetch_all(query)
 
+    # SQL expression giving the first day of the period each rollup day falls in
+    PERIOD_STARTS = {
+        'day': "day",
+        'week': "DATE_SUB(day, INTERVAL WEEKDAY(day) DAY)",        # Monday
+        'month': "DATE_SUB(day, INTERVAL DAYOFMONTH(day) - 1 DAY)"
+    }
+
+    def get_earnings_series(self, period='month', start_date=None, end_date=None):
+        """
+        Earnings per period and vehicle type from the Earnings_Daily rollup,
+        as rows of (period_start, type, earnings, reservations) in date order.
+        """
+        if period not in self.PERIOD_STARTS:
+            raise ValueError(f"Unknown period: {period}")
+
+        conditions = []
+        params = []
+        if start_date:
+            conditions.append("day >= %s")
+            params.append(start_date)
+        if end_date:
+            conditions.append("day <= %s")
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        query = f"""
+            SELECT {self.PERIOD_STARTS[period]} as period_start, vehicle_type as type,
+                   SUM(earnings) as earnings, SUM(reservations) as reservations
+            FROM Earnings_Daily
+            {where}
+            GROUP BY period_start, vehicle_type
+            ORDER BY period_start
+        """
+        return self.db.fetch_all(query, tuple(params))
+
     def get_all_users(self):
-        return self.db.fetch_all("SELECT user_id, username, first_name, last_name, role FROM Users")
+        """Every user as a User subclass instance, picked by role"""
+        return self.db.fetch_models(f"SELECT {select_list(User.COLUMNS)} FROM Users", factory=user_from_row)
 
     def add_user(self, username, password, first_name, last_name, role):
-        hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed = hash_password_async(password).result()
         query = """
             INSERT INTO Users (username, password_hash, first_name, last_name, role)
             VALUES (%s, %s, %s, %s, %s)
@@ -70,3 +175,13 @@ class AdminController:
         query = "DELETE FROM Users WHERE user_id = %s"
         self.db.execute_query(query, (user_id,))
         return True
+
+    def get_diagnostics(self):
+        """Query timings, recent slow queries, pool and cache metrics of this process"""
+        queries, slow_queries = self.db.get_query_stats()
+        return {
+            'queries': queries,
+            'slow_queries': slow_queries,
+            'pool': self.db.get_pool_metrics(),
+            'reference_cache': get_reference_cache().get_stats()
+        }
@@ -1,18 +1,26 @@
-import bcrypt
 from src.database.db_manager import DBManager
-from src.models.user import Receptionist, Worker, Member, Admin
+from src.utils.password_hasher import hash_password_async, check_password_async, needs_rehash
+from src.models.user import USER_ROLES
 
 class AuthController:
     def __init__(self):
         self.db = DBManager()
 
     def login(self, username, password):
+        """
+        Verify credentials (slow by design - call from a worker thread, not the Tk thread).
+        bcrypt itself runs on the hash pool, so AUTH_CONFIG['hash_workers'] caps how many run at once.
+        """
         query = "SELECT * FROM Users WHERE username = %s"
         user_data = self.db.fetch_one(query, (username,))
 
         if user_data:
             # Verify password
-            if bcrypt.checkpw(password.encode('utf-8'), user_data['password_hash'].encode('utf-8')):
+            if check_password_async(password, user_data['password_hash']).result():
+                if needs_rehash(user_data['password_hash']):
+                    # bcrypt cost was changed in AUTH_CONFIG - upgrade the stored hash while we have the password
+                    self.db.execute_query("UPDATE Users SET password_hash = %s WHERE user_id = %s",
+                                          (hash_password_async(password).result(), user_data['user_id']))
                 return self._create_user_object(user_data)
         return None
 
@@ -22,7 +30,7 @@ class AuthController:
             return False, "Username already exists"
 
         # Hash password
-        hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed = hash_password_async(password).result()
 
         # Insert user
         query = """
@@ -34,13 +42,7 @@ class AuthController:
         return False, "Registration failed"
 
     def _create_user_object(self, data):
-        role = data['role']
-        if role == 'Receptionist':
-            return Receptionist(data['user_id'], data['username'], data['first_name'], data['last_name'], role)
-        elif role == 'Worker':
-            return Worker(data['user_id'], data['username'], data['first_name'], data['last_name'], role)
-        elif role == 'Member':
-            return Member(data['user_id'], data['username'], data['first_name'], data['last_name'], role)
-        elif role == 'Admin':
-            return Admin(data['user_id'], data['username'], data['first_name'], data['last_name'], role)
-        return None
+        role_class = USER_ROLES.get(data['role'])
+        if role_class is None:
+            return None
+        return role_class(data['user_id'], data['username'], data['first_name'], data['last_name'], data['role'])
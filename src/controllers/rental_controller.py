@@ -1,51 +1,176 @@
-from src.database.db_manager import DBManager
+import time
+import numpy as np
+from src.config import AVAILABILITY_CONFIG
+from src.database.db_manager import DBManager, select_list
+from src.models.vehicle import Vehicle, vehicle_from_row
+from src.database import earnings_rollup, reservation_events
+from src.config import CHANGE_FEED_CONFIG
+from src.utils.availability_index import get_availability_index, peak_overlap
+from src.utils.reference_cache import get_reference_cache
+from src.utils import pricing
 from datetime import datetime
 
+class BookingConflictError(Exception):
+    pass
+
+class ValidationError(ValueError):
+    """Input a controller rejects on purpose: unknown vehicle, bad dates, wrong status"""
+    pass
+
 class RentalController:
     def __init__(self):
         self.db = DBManager()
+        self.availability = get_availability_index()
+        self.reference = get_reference_cache()
 
-    def get_available_vehicles(self, vehicle_type=None):
-        query = "SELECT * FROM Vehicles WHERE status = 'Available'"
+    def get_available_vehicles(self, vehicle_type=None, start_date=None, end_date=None):
+        """
+        Vehicles that can be rented. Without dates this is every vehicle currently
+        'Available'; with dates it is every vehicle not in maintenance that has no
+        Pending/Active reservation overlapping the range.
+        """
+        if start_date is None or end_date is None:
+            query = "SELECT * FROM Vehicles WHERE status = 'Available'"
+        else:
+            query = "SELECT * FROM Vehicles WHERE status != 'Maintenance'"
         params = []
         if vehicle_type and vehicle_type != "All":
             query += " AND type = %s"
             params.append(vehicle_type)
-        return self.db.fetch_all(query, tuple(params))
+        vehicles = self.db.fetch_all(query, tuple(params))
+
+        if start_date is None or end_date is None:
+            return vehicles
+        free = self._get_availability().available_vehicles(start_date, end_date, vehicle_type)
+        return [v for v in vehicles if v['vehicle_id'] in free]
+
+    def _get_availability(self):
+        """The shared availability index, rebuilt when missing or older than the refresh interval"""
+        index = self.availability
+        if not self._is_stale(index):
+            return index
+        # Single flight: one caller reloads. While it does, others keep using the stale
+        # index if there is one, or wait for the reload when there is nothing loaded yet.
+        if not index.reload_lock.acquire(blocking=not index.is_loaded):
+            return index
+        try:
+            if self._is_stale(index):
+                self._reload_availability(index)
+        finally:
+            index.reload_lock.release()
+        return index
+
+    @staticmethod
+    def _is_stale(index):
+        return not index.is_loaded or time.monotonic() - index.loaded_at > AVAILABILITY_CONFIG['refresh_interval']
+
+    def _reload_availability(self, index):
+        """Rebuild the index from the database; the caller holds index.reload_lock"""
+        vehicles = self.db.fetch_all("SELECT vehicle_id, type, status FROM Vehicles")
+        reservations = self.db.fetch_all(
+            "SELECT reservation_id, vehicle_id, start_date, end_date FROM Reservations WHERE status IN ('Pending', 'Active')"
+        )
+        reservation_equipment = self.db.fetch_all("""
+            SELECT re.reservation_id, re.equipment_id
+            FROM Reservation_Equipment re
+            JOIN Reservations r ON r.reservation_id = re.reservation_id
+            WHERE r.status IN ('Pending', 'Active')
+        """)
+        index.load(vehicles, reservations, self.get_equipment(), reservation_equipment)
 
     def create_reservation(self, user_id, vehicle_id, start_date, end_date, insurance, equipment_ids):
-        # Calculate days
-        delta = (end_date - start_date).days
-        if delta < 1: delta = 1
-        
-        # Get vehicle rate
-        v_query = "SELECT daily_rate FROM Vehicles WHERE vehicle_id = %s"
-        vehicle = self.db.fetch_one(v_query, (vehicle_id,))
-        base_cost = float(vehicle['daily_rate']) * delta
-
-        # Add equipment cost
-        eq_cost = 0
-        if equipment_ids:
-            format_strings = ','.join(['%s'] * len(equipment_ids))
-            e_query = f"SELECT daily_rate FROM Equipment WHERE equipment_id IN ({format_strings})"
-            equipments = self.db.fetch_all(e_query, tuple(equipment_ids))
-            for eq in equipments:
-                eq_cost += float(eq['daily_rate']) * delta
-
-        total_cost = base_cost + eq_cost
-        if insurance:
-            total_cost += (500 * delta) # Flat 500 per day for insurance
-
-        # Insert Reservation with Pending status - awaiting Staff approval
-        ins_query = """
-            INSERT INTO Reservations (user_id, vehicle_id, start_date, end_date, insurance_added, total_cost, status)
-            VALUES (%s, %s, %s, %s, %s, %s, 'Pending')
-        """
-        self.db.execute_query(ins_query, (user_id, vehicle_id, start_date, end_date, insurance, total_cost))
+        if end_date < start_date:
+            raise ValidationError("End date cannot be before the start date")
+        # Rates come from the reference cache, so pricing costs no queries
+        vehicle = self._get_vehicle_pricing(vehicle_id)
+        equipment_rates = self._get_equipment_rates()
+        # Each item once, and only items that exist (Reservation_Equipment has a FK and a composite key)
+        equipment_ids = [e for e in dict.fromkeys(equipment_ids or []) if e in equipment_rates]
+        total_cost = pricing.quote(
+            vehicle['daily_rate'], vehicle['type'], pricing.rental_days(start_date, end_date), insurance,
+            [equipment_rates[e] for e in equipment_ids]
+        )
+
+        # No pre-check against the availability index: it can be refresh_interval stale and would
+        # turn away bookings freed by a cancellation elsewhere. Only the locked checks below reject.
+        def book(cursor):
+            # Lock the vehicle row: concurrent bookings of the same vehicle queue up here,
+            # bookings of other vehicles are not blocked
+            cursor.execute("SELECT vehicle_id FROM Vehicles WHERE vehicle_id = %s FOR UPDATE", (vehicle_id,))
+            if not cursor.fetchone():
+                raise ValidationError("Vehicle not found")
+
+            cursor.execute("""
+                SELECT reservation_id FROM Reservations
+                WHERE vehicle_id = %s AND status IN ('Pending', 'Active')
+                  AND start_date <= %s AND end_date >= %s
+                LIMIT 1
+            """, (vehicle_id, end_date, start_date))
+            if cursor.fetchone():
+                raise BookingConflictError("Vehicle is already booked for the selected dates")
+
+            if equipment_ids:
+                self._check_equipment_stock(cursor, equipment_ids, start_date, end_date)
+
+            # Insert Reservation with Pending status - awaiting Staff approval
+            ins_query = """
+                INSERT INTO Reservations (user_id, vehicle_id, start_date, end_date, insurance_added, total_cost, status)
+                VALUES (%s, %s, %s, %s, %s, %s, 'Pending')
+            """
+            cursor.execute(ins_query, (user_id, vehicle_id, start_date, end_date, insurance, total_cost))
+            reservation_id = cursor.lastrowid
+            earnings_rollup.record(cursor, start_date, vehicle['type'], total_cost)
+            reservation_events.record(cursor, [reservation_id], 'Pending')
+
+            if equipment_ids:
+                cursor.executemany(
+                    "INSERT INTO Reservation_Equipment (reservation_id, equipment_id) VALUES (%s, %s)",
+                    [(reservation_id, equipment_id) for equipment_id in equipment_ids]
+                )
+            return reservation_id
+
+        reservation_id = self.db.run_transaction(book)
+        self.availability.add_reservation(reservation_id, vehicle_id, start_date, end_date, equipment_ids)
         
         # Do NOT change vehicle status yet - it remains 'Available' until approved
         
-        return True
+        return reservation_id
+
+    def _check_equipment_stock(self, cursor, equipment_ids, start_date, end_date):
+        """
+        Lock the Equipment rows (in id order, so two bookings can't deadlock on them)
+        and make sure every item has a unit free on each day of the range.
+        """
+        ids = sorted(equipment_ids)
+        cursor.execute(
+            f"SELECT equipment_id, name, quantity FROM Equipment WHERE equipment_id IN ({self._placeholders(ids)}) "
+            "ORDER BY equipment_id FOR UPDATE",
+            tuple(ids)
+        )
+        stock = {row['equipment_id']: row for row in cursor.fetchall()}
+
+        # A locking read, so it sees the latest committed bookings: a plain SELECT would
+        # read the transaction's snapshot, taken by the overlap check before these locks
+        cursor.execute(f"""
+            SELECT re.equipment_id, r.start_date, r.end_date
+            FROM Reservation_Equipment re
+            JOIN Reservations r ON r.reservation_id = re.reservation_id
+            WHERE re.equipment_id IN ({self._placeholders(ids)}) AND r.status IN ('Pending', 'Active')
+              AND r.start_date <= %s AND r.end_date >= %s
+            LOCK IN SHARE MODE
+        """, tuple(ids) + (end_date, start_date))
+        booked = {}
+        for row in cursor.fetchall():
+            booked.setdefault(row['equipment_id'], []).append((row['start_date'], row['end_date']))
+
+        for equipment_id, row in stock.items():
+            if peak_overlap(booked.get(equipment_id, []), start_date, end_date) >= row['quantity']:
+                raise BookingConflictError(f"{row['name']} is fully booked for the selected dates")
+
+    def get_equipment_availability(self, start_date, end_date):
+        """Equipment catalog with an 'available' count of units free for the whole range"""
+        free = self._get_availability().available_equipment(start_date, end_date)
+        return [dict(eq, available=free.get(eq['equipment_id'], eq['quantity'])) for eq in self.get_equipment()]
 
     def get_user_reservations(self, user_id):
         query = """
@@ -60,7 +185,8 @@ class RentalController:
     def get_pending_reservations(self):
         """Get all reservations with Pending status for Staff approval"""
         query = """
-            SELECT r.*, v.brand, v.model, v.license_plate, u.username, u.full_name 
+            SELECT r.*, v.brand, v.model, v.license_plate, u.username,
+                   CONCAT_WS(' ', u.first_name, u.last_name) as full_name
             FROM Reservations r 
             JOIN Vehicles v ON r.vehicle_id = v.vehicle_id 
             JOIN Users u ON r.user_id = u.user_id
@@ -69,6 +195,56 @@ class RentalController:
         """
         return self.db.fetch_all(query)
 
+    def get_latest_event_id(self):
+        """
+        Position of the change feed now; poll get_reservation_changes from here.
+        Starts at the last settled event, so the newest few may be delivered again.
+        """
+        row = self.db.fetch_one("""
+            SELECT event_id FROM Reservation_Events
+            WHERE created_at < NOW() - INTERVAL %s SECOND
+            ORDER BY event_id DESC LIMIT 1
+        """, (CHANGE_FEED_CONFIG['settle_seconds'],))
+        return (row['event_id'] if row else 0, frozenset())
+
+    def get_reservation_changes(self, since):
+        """
+        Reservations changed after position since, in their current state, with the
+        vehicle and user columns the dashboards show. Returns (position, rows);
+        pass position to the next call. At most CHANGE_FEED_CONFIG['batch_size']
+        events are read per call, so a backlog is drained over several polls.
+
+        AUTO_INCREMENT ids are handed out at insert, not at commit: event N can
+        become visible after N+1. So the position is (settled id, ids seen above
+        it), and every poll re-reads everything above the settled id, skipping
+        events already delivered. An event only becomes settled once it is
+        settle_seconds old, by which time any transaction holding a lower id has
+        committed or rolled back.
+        """
+        settled_id, seen = since
+        events = self.db.fetch_all("""
+            SELECT event_id, reservation_id, created_at < NOW() - INTERVAL %s SECOND as settled
+            FROM Reservation_Events WHERE event_id > %s ORDER BY event_id LIMIT %s
+        """, (CHANGE_FEED_CONFIG['settle_seconds'], settled_id, CHANGE_FEED_CONFIG['batch_size']))
+
+        for event in events:
+            if event['settled']:
+                settled_id = event['event_id']
+        position = (settled_id, frozenset(e['event_id'] for e in events if e['event_id'] > settled_id))
+
+        ids = list({e['reservation_id'] for e in events if e['event_id'] not in seen})
+        if not ids:
+            return position, []
+        rows = self.db.fetch_all(f"""
+            SELECT r.*, v.brand, v.model, v.license_plate, u.username,
+                   CONCAT_WS(' ', u.first_name, u.last_name) as full_name
+            FROM Reservations r
+            JOIN Vehicles v ON r.vehicle_id = v.vehicle_id
+            JOIN Users u ON r.user_id = u.user_id
+            WHERE r.reservation_id IN ({self._placeholders(ids)})
+        """, tuple(ids))
+        return position, rows
+
     def get_all_active_rentals(self):
         query = """
             SELECT r.*, v.brand, v.model, u.username 
@@ -81,55 +257,143 @@ class RentalController:
     
     def approve_reservation(self, reservation_id):
         """Approve a pending reservation - changes status to Active and marks vehicle as Rented"""
-        # Get reservation details
-        res = self.db.fetch_one("SELECT vehicle_id, status FROM Reservations WHERE reservation_id = %s", (reservation_id,))
-        if not res:
-            raise Exception("Reservation not found")
-        if res['status'] != 'Pending':
-            raise Exception("Can only approve Pending reservations")
-        
-        # Update Reservation status to Active
-        self.db.execute_query("UPDATE Reservations SET status = 'Active' WHERE reservation_id = %s", (reservation_id,))
-        
-        # Update Vehicle status to Rented
-        self.db.execute_query("UPDATE Vehicles SET status = 'Rented' WHERE vehicle_id = %s", (res['vehicle_id'],))
-        
+        if not self.approve_reservations([reservation_id]):
+            self._raise_transition_error(reservation_id, "approve", "Pending")
         return True
-    
+
+    def approve_reservations(self, reservation_ids):
+        """Approve many pending reservations in one transaction. Returns the ids that were approved."""
+        if not reservation_ids:
+            return []
+
+        with self.db.transaction() as cursor:
+            # Lock the rows so a concurrent reject/cancel can't slip in between
+            locked = self._lock_reservations(cursor, reservation_ids, 'Pending')
+            if not locked:
+                return []
+
+            ids = [r['reservation_id'] for r in locked]
+            vehicle_ids = list({r['vehicle_id'] for r in locked})
+            cursor.execute(
+                f"UPDATE Reservations SET status = 'Active' WHERE reservation_id IN ({self._placeholders(ids)})",
+                tuple(ids)
+            )
+            cursor.execute(
+                f"UPDATE Vehicles SET status = 'Rented' WHERE vehicle_id IN ({self._placeholders(vehicle_ids)})",
+                tuple(vehicle_ids)
+            )
+            reservation_events.record(cursor, ids, 'Active')
+
+        # Reservations stay in the index - Active blocks the dates just like Pending
+        for vehicle_id in vehicle_ids:
+            self.availability.set_vehicle_status(vehicle_id, 'Rented')
+        return ids
+
     def reject_reservation(self, reservation_id):
         """Reject a pending reservation - changes status to Cancelled"""
-        # Get reservation details
-        res = self.db.fetch_one("SELECT status FROM Reservations WHERE reservation_id = %s", (reservation_id,))
-        if not res:
-            raise Exception("Reservation not found")
-        if res['status'] != 'Pending':
-            raise Exception("Can only reject Pending reservations")
-        
-        # Update Reservation status to Cancelled
-        self.db.execute_query("UPDATE Reservations SET status = 'Cancelled' WHERE reservation_id = %s", (reservation_id,))
-        
+        if not self.reject_reservations([reservation_id]):
+            self._raise_transition_error(reservation_id, "reject", "Pending")
         # Vehicle remains Available since it was never marked as Rented
         return True
 
-    def return_vehicle(self, reservation_id, vehicle_id, condition_notes):
-        # Update Reservation
-        upd_res = "UPDATE Reservations SET status = 'Completed' WHERE reservation_id = %s"
-        self.db.execute_query(upd_res, (reservation_id,))
+    def reject_reservations(self, reservation_ids):
+        """Cancel many pending reservations in one transaction. Returns the ids that were cancelled."""
+        if not reservation_ids:
+            return []
 
-        # Update Vehicle
-        upd_veh = "UPDATE Vehicles SET status = 'Available' WHERE vehicle_id = %s"
-        self.db.execute_query(upd_veh, (vehicle_id,))
+        with self.db.transaction() as cursor:
+            locked = self._lock_reservations(cursor, reservation_ids, 'Pending')
+            if not locked:
+                return []
 
-        # Log Return
-        log_query = """
-            INSERT INTO Vehicle_Logs (vehicle_id, event_type, description)
-            VALUES (%s, 'Return', %s)
-        """
-        self.db.execute_query(log_query, (vehicle_id, condition_notes))
+            ids = [r['reservation_id'] for r in locked]
+            # Cancelled reservations no longer count as earnings
+            earnings_rollup.apply_reservations(cursor, ids, -1)
+            cursor.execute(
+                f"UPDATE Reservations SET status = 'Cancelled' WHERE reservation_id IN ({self._placeholders(ids)})",
+                tuple(ids)
+            )
+            reservation_events.record(cursor, ids, 'Cancelled')
+
+        for reservation_id in ids:
+            self.availability.remove_reservation(reservation_id)
+        return ids
+
+    def return_vehicle(self, reservation_id, vehicle_id, condition_notes):
+        # vehicle_id is taken from the locked reservation row; the argument is kept for existing callers
+        if not self.return_vehicles([(reservation_id, condition_notes)]):
+            self._raise_transition_error(reservation_id, "return", "Active")
         return True
 
+    def return_vehicles(self, batch):
+        """
+        Complete many active rentals in one transaction.
+        batch is a list of (reservation_id, condition_notes). Returns the ids that were completed.
+        """
+        notes_by_id = dict(batch)
+        if not notes_by_id:
+            return []
+
+        with self.db.transaction() as cursor:
+            locked = self._lock_reservations(cursor, list(notes_by_id), 'Active')
+            if not locked:
+                return []
+
+            ids = [r['reservation_id'] for r in locked]
+            vehicle_ids = list({r['vehicle_id'] for r in locked})
+
+            # Update Reservations
+            cursor.execute(
+                f"UPDATE Reservations SET status = 'Completed' WHERE reservation_id IN ({self._placeholders(ids)})",
+                tuple(ids)
+            )
+
+            # Update Vehicles
+            cursor.execute(
+                f"UPDATE Vehicles SET status = 'Available' WHERE vehicle_id IN ({self._placeholders(vehicle_ids)})",
+                tuple(vehicle_ids)
+            )
+
+            # Log Returns
+            log_query = """
+                INSERT INTO Vehicle_Logs (vehicle_id, event_type, description)
+                VALUES (%s, 'Return', %s)
+            """
+            cursor.executemany(log_query, [(r['vehicle_id'], notes_by_id[r['reservation_id']]) for r in locked])
+            reservation_events.record(cursor, ids, 'Completed')
+
+        # An early return frees the rest of the booked range
+        for reservation_id in ids:
+            self.availability.remove_reservation(reservation_id)
+        for vehicle_id in vehicle_ids:
+            self.availability.set_vehicle_status(vehicle_id, 'Available')
+        return ids
+
+    def _lock_reservations(self, cursor, reservation_ids, status):
+        """SELECT ... FOR UPDATE the given reservations that are still in the expected status"""
+        cursor.execute(
+            f"""
+            SELECT reservation_id, vehicle_id FROM Reservations
+            WHERE reservation_id IN ({self._placeholders(reservation_ids)}) AND status = %s
+            FOR UPDATE
+            """,
+            tuple(reservation_ids) + (status,)
+        )
+        return cursor.fetchall()
+
+    def _raise_transition_error(self, reservation_id, action, expected_status):
+        res = self.db.fetch_one("SELECT status FROM Reservations WHERE reservation_id = %s", (reservation_id,))
+        if not res:
+            raise ValidationError("Reservation not found")
+        raise ValidationError(f"Can only {action} {expected_status} reservations")
+
+    @staticmethod
+    def _placeholders(values):
+        return ','.join(['%s'] * len(values))
+
     def get_all_vehicles(self):
-        return self.db.fetch_all("SELECT * FROM Vehicles")
+        """Every vehicle as a Vehicle subclass instance (Car, Truck, ...)"""
+        return self.db.fetch_models(f"SELECT {select_list(Vehicle.COLUMNS)} FROM Vehicles", factory=vehicle_from_row)
 
     def add_vehicle(self, brand, model, year, license_plate, v_type, rate):
         query = """
@@ -137,28 +401,109 @@ class RentalController:
             VALUES (%s, %s, %s, %s, %s, %s, 'Available')
         """
         self.db.execute_query(query, (brand, model, year, license_plate, v_type, rate))
+        self.availability.invalidate()
+        self.reference.invalidate('vehicle_rates')
         return True
 
     def delete_vehicle(self, vehicle_id):
         query = "DELETE FROM Vehicles WHERE vehicle_id = %s"
-        self.db.execute_query(query, (vehicle_id,))
+        if self.db.execute_query(query, (vehicle_id,)) is None:
+            # Most likely reservations still reference it; the index keeps the vehicle
+            raise ValidationError("Vehicle could not be deleted - it may still have reservations")
+        self.availability.remove_vehicle(vehicle_id)
+        self.reference.invalidate('vehicle_rates')
         return True
 
     def get_equipment(self):
-        return self.db.fetch_all("SELECT * FROM Equipment")
+        """Equipment catalog, served from the reference cache"""
+        return self.reference.get('equipment', lambda: self.db.fetch_all("SELECT * FROM Equipment"))
+
+    def _get_equipment_rates(self):
+        return {eq['equipment_id']: float(eq['daily_rate']) for eq in self.get_equipment()}
+
+    def _get_vehicle_pricing(self, vehicle_id):
+        """Daily rate and type of a vehicle from the reference cache; reloads once for vehicles added elsewhere"""
+        def load():
+            rows = self.db.fetch_all("SELECT vehicle_id, type, daily_rate FROM Vehicles")
+            return {row['vehicle_id']: {'type': row['type'], 'daily_rate': float(row['daily_rate'])} for row in rows}
+
+        rates = self.reference.get('vehicle_rates', load)
+        if vehicle_id not in rates:
+            self.reference.invalidate('vehicle_rates')
+            rates = self.reference.get('vehicle_rates', load)
+            if vehicle_id not in rates:
+                raise ValidationError("Vehicle not found")
+        return rates[vehicle_id]
+
+    def compare_vehicles(self, vehicle_type, start_date, end_date, insurance=False, equipment_ids=()):
+        """
+        Every vehicle free for the dates, each with a 'quoted_total' for the whole
+        rental, cheapest first. All quotes are computed in one vectorized call.
+        """
+        vehicles = self.get_available_vehicles(vehicle_type, start_date, end_date)
+        if not vehicles:
+            return []
+        equipment_rates = self._get_equipment_rates()
+        equipment_daily = sum(equipment_rates[e] for e in equipment_ids if e in equipment_rates)
+        totals = pricing.quote_many(
+            [float(v['daily_rate']) for v in vehicles], [v['type'] for v in vehicles],
+            [pricing.rental_days(start_date, end_date)] * len(vehicles), insurance, equipment_daily
+        )
+        for vehicle, total in zip(vehicles, totals.tolist()):
+            vehicle['quoted_total'] = total
+        return sorted(vehicles, key=lambda v: v['quoted_total'])
+
+    def reprice_pending_reservations(self):
+        """
+        Recompute total_cost of every Pending reservation from current rates, e.g.
+        from a nightly job after a rate change. Returns how many rows changed.
+        """
+        rows = self.db.fetch_all("""
+            SELECT r.reservation_id, r.start_date, r.end_date, r.insurance_added, r.total_cost,
+                   v.type, v.daily_rate, COALESCE(SUM(e.daily_rate), 0) AS equipment_daily
+            FROM Reservations r
+            JOIN Vehicles v ON r.vehicle_id = v.vehicle_id
+            LEFT JOIN Reservation_Equipment re ON re.reservation_id = r.reservation_id
+            LEFT JOIN Equipment e ON e.equipment_id = re.equipment_id
+            WHERE r.status = 'Pending'
+            GROUP BY r.reservation_id
+        """)
+        if not rows:
+            return 0
+
+        totals = pricing.quote_many(
+            [float(r['daily_rate']) for r in rows], [r['type'] for r in rows],
+            [pricing.rental_days(r['start_date'], r['end_date']) for r in rows],
+            [bool(r['insurance_added']) for r in rows], [float(r['equipment_daily']) for r in rows]
+        )
+        current = np.array([float(r['total_cost']) for r in rows])
+        changed = np.flatnonzero(np.abs(totals - current) >= 0.005)
+        if len(changed) == 0:
+            return 0
+
+        changed_ids = [rows[i]['reservation_id'] for i in changed]
+        with self.db.transaction() as cursor:
+            # Swap the old totals for the new ones in the earnings rollup
+            earnings_rollup.apply_reservations(cursor, changed_ids, -1)
+            # Only touch rows still Pending - one may have been approved since the read
+            cursor.executemany(
+                "UPDATE Reservations SET total_cost = %s WHERE reservation_id = %s AND status = 'Pending'",
+                [(totals[i].item(), rows[i]['reservation_id']) for i in changed]
+            )
+            earnings_rollup.apply_reservations(cursor, changed_ids, 1)
+            # Same status, new total - still worth a refresh of open cards
+            reservation_events.record(cursor, changed_ids, 'Pending')
+        return len(changed)
+
+    def get_cache_stats(self):
+        """Hit rates of the reference data cache"""
+        return self.reference.get_stats()
 
     def cancel_reservation(self, reservation_id):
         """Cancel a reservation - Members can only cancel Pending reservations"""
-        # Get reservation details
-        res = self.db.fetch_one("SELECT vehicle_id, status FROM Reservations WHERE reservation_id = %s", (reservation_id,))
-        if not res:
-            raise Exception("Reservation not found")
-        if res['status'] != 'Pending':
-            raise Exception("Can only cancel Pending reservations")
-            
-        # Update Reservation status to Cancelled
-        self.db.execute_query("UPDATE Reservations SET status = 'Cancelled' WHERE reservation_id = %s", (reservation_id,))
-        
+        if not self.reject_reservations([reservation_id]):
+            self._raise_transition_error(reservation_id, "cancel", "Pending")
+
         # Vehicle remains Available (it was never marked as Rented for pending reservations)
         return True
 
@@ -168,6 +513,17 @@ class RentalController:
             SET brand=%s, model=%s, year=%s, license_plate=%s, type=%s, daily_rate=%s
             WHERE vehicle_id=%s
         """
-        self.db.execute_query(query, (brand, model, year, license_plate, v_type, rate, vehicle_id))
+        with self.db.transaction() as cursor:
+            # Earnings are rolled up by vehicle type, so move this vehicle's totals if its type changes
+            cursor.execute("SELECT type FROM Vehicles WHERE vehicle_id = %s FOR UPDATE", (vehicle_id,))
+            current = cursor.fetchone()
+            type_changed = current is not None and current['type'] != v_type
+            if type_changed:
+                earnings_rollup.apply_vehicle(cursor, vehicle_id, -1)
+            cursor.execute(query, (brand, model, year, license_plate, v_type, rate, vehicle_id))
+            if type_changed:
+                earnings_rollup.apply_vehicle(cursor, vehicle_id, 1)
+        self.availability.invalidate()
+        self.reference.invalidate('vehicle_rates')
         return True
         return True
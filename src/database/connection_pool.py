@@ -0,0 +1,181 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+from src.config import DB_CONFIG, POOL_CONFIG
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded pool of MySQL connections shared by all controllers.
+    Connections are opened lazily, pinged before reuse when they have been
+    idle for a while, and closed once they stay idle past max_idle_time.
+    """
+
+    def __init__(self, db_config, pool_size=5, acquire_timeout=10, max_idle_time=300, health_check_interval=30):
+        self.db_config = db_config
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.max_idle_time = max_idle_time
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Condition()
+        self._idle = []  # Stack of (connection, last_used) - most recently used last
+        self._open = 0   # Idle + checked out connections
+
+        self._metrics = {
+            'checkouts': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'timeouts': 0,
+            'connections_created': 0,
+            'connections_closed': 0,
+            'evicted_idle': 0,
+            'failed_health_checks': 0
+        }
+
+    def acquire(self):
+        start = time.perf_counter()
+        deadline = start + self.acquire_timeout
+
+        with self._lock:
+            while True:
+                self._evict_idle()
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._open < self.pool_size:
+                    self._open += 1
+                    conn, last_used = None, None
+                    break
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise PoolTimeoutError(f"No database connection available after {self.acquire_timeout}s")
+                self._lock.wait(remaining)
+
+        # Open / health check outside the lock so slow handshakes don't block other threads
+        try:
+            if conn is None:
+                conn = self._create_connection()
+            elif time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(conn):
+                self._close_connection(conn)
+                conn = self._create_connection()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._lock.notify()
+            raise
+
+        wait = time.perf_counter() - start
+        with self._lock:
+            self._metrics['checkouts'] += 1
+            self._metrics['total_wait_time'] += wait
+            self._metrics['max_wait_time'] = max(self._metrics['max_wait_time'], wait)
+        return conn
+
+    def release(self, conn):
+        try:
+            # Never hand out a connection with an open transaction
+            if conn.in_transaction:
+                conn.rollback()
+        except mysql.connector.Error:
+            self.discard(conn)
+            return
+
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+    def discard(self, conn):
+        """Close a checked out connection instead of returning it to the pool"""
+        self._close_connection(conn)
+        with self._lock:
+            self._open -= 1
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except (mysql.connector.OperationalError, mysql.connector.InterfaceError):
+            # Lost or broken connection - don't put it back in the pool
+            self.discard(conn)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._close_connection(conn)
+
+    def get_metrics(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['pool_size'] = self._open
+            metrics['idle'] = len(self._idle)
+            metrics['in_use'] = self._open - len(self._idle)
+            metrics['max_size'] = self.pool_size
+        checkouts = metrics['checkouts']
+        metrics['avg_wait_time'] = metrics['total_wait_time'] / checkouts if checkouts else 0.0
+        return metrics
+
+    def _evict_idle(self):
+        # Called with the lock held. Oldest connections sit at the bottom of the stack.
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.max_idle_time:
+            conn, _ = self._idle.pop(0)
+            self._open -= 1
+            self._metrics['evicted_idle'] += 1
+            self._close_connection(conn)
+
+    def _create_connection(self):
+        conn = mysql.connector.connect(**self.db_config)
+        conn.autocommit = False
+        with self._lock:
+            self._metrics['connections_created'] += 1
+        return conn
+
+    def _is_healthy(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            with self._lock:
+                self._metrics['failed_health_checks'] += 1
+            return False
+
+    def _close_connection(self, conn):
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
+        with self._lock:
+            self._metrics['connections_closed'] += 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+    return _pool
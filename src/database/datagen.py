@@ -0,0 +1,171 @@
+"""
+Synthetic rental data at any scale, for benchmarks and staging databases.
+
+Rows come out as tuples in the column order of the *_COLUMNS constants, with
+explicit ids so reservations can reference users and vehicles without a round
+trip. Everything is drawn from seeded generators: the same arguments always
+produce the same data, so benchmark runs on different commits are comparable.
+
+Reservations are laid out per vehicle and never overlap on the same vehicle.
+Their status follows from their dates relative to as_of:
+    ended before as_of      Completed (90%) or Cancelled
+    running on as_of        Active if the vehicle is out (it is then 'Rented'), else Cancelled
+    starting after as_of    Pending (85%) or Cancelled
+"""
+import random
+from datetime import date, datetime, timedelta
+from src.utils import pricing
+
+USER_COLUMNS = ('user_id', 'username', 'password_hash', 'first_name', 'last_name', 'role')
+VEHICLE_COLUMNS = ('vehicle_id', 'brand', 'model', 'year', 'license_plate', 'type', 'status', 'daily_rate')
+EQUIPMENT_COLUMNS = ('equipment_id', 'name', 'daily_rate', 'quantity')
+RESERVATION_COLUMNS = ('reservation_id', 'user_id', 'vehicle_id', 'start_date', 'end_date', 'status',
+                       'insurance_added', 'total_cost', 'created_at')
+RESERVATION_EQUIPMENT_COLUMNS = ('reservation_id', 'equipment_id')
+
+# (type, share of the fleet, [(brand, model, daily rate)])
+FLEET_MIX = [
+    ("Car", 0.40, [("Toyota", "Vios", 1500), ("Toyota", "Wigo", 1200), ("Honda", "City", 1700), ("Mitsubishi", "Mirage", 1300)]),
+    ("SUV", 0.20, [("Toyota", "Fortuner", 3500), ("Mitsubishi", "Montero", 3400), ("Ford", "Everest", 3600)]),
+    ("Van", 0.15, [("Toyota", "Innova", 2500), ("Nissan", "Urvan", 2800), ("Toyota", "Hiace", 3000)]),
+    ("Truck", 0.10, [("Mitsubishi", "L300", 2000), ("Ford", "Ranger", 3000), ("Isuzu", "D-Max", 2900)]),
+    ("Motorcycle", 0.15, [("Honda", "Click 125i", 500), ("Yamaha", "NMAX", 600), ("Suzuki", "Raider", 450)]),
+]
+EQUIPMENT_CATALOG = [("GPS Navigation", 200), ("Child Safety Seat", 150), ("Ski Rack", 300), ("Dash Cam", 100),
+                     ("Roof Box", 250), ("Phone Mount", 50), ("Cooler Box", 120), ("Bike Rack", 280)]
+FIRST_NAMES = ["Juan", "Maria", "Jose", "Ana", "Mark", "Grace", "Paolo", "Bea", "Carlo", "Liza", "Miguel", "Joy"]
+LAST_NAMES = ["Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Torres", "Flores", "Ramos", "Castillo"]
+STAFF_ROLES = ["Receptionist", "Worker"]
+
+# Rental length in days and how often it occurs: mostly short trips, some long ones
+DURATION_WEIGHTS = [(1, 20), (2, 18), (3, 15), (4, 10), (5, 8), (6, 6), (7, 8), (10, 5), (14, 4), (21, 2), (30, 1)]
+INSURANCE_SHARE = 0.3
+EQUIPMENT_SHARE = 0.15   # Reservations with one or two equipment items
+RENTED_SHARE = 0.25      # Vehicles out on an Active rental on as_of
+MAINTENANCE_SHARE = 0.02
+
+
+class SyntheticData:
+    def __init__(self, vehicles, users, reservations, equipment=len(EQUIPMENT_CATALOG), years=6, future_days=90,
+                 as_of=None, seed=42, first_ids=None, password_hash="!"):
+        """
+        first_ids maps 'user' / 'vehicle' / 'equipment' / 'reservation' to the first
+        id to use (default 1). password_hash is stored for every user - hashing
+        each synthetic password would take longer than loading everything else.
+        """
+        self.vehicle_count = vehicles
+        self.user_count = users
+        self.reservation_count = reservations
+        self.equipment_count = min(equipment, len(EQUIPMENT_CATALOG))
+        self.as_of = as_of or date.today()
+        self.first_day = self.as_of - timedelta(days=int(years * 365))
+        self.last_day = self.as_of + timedelta(days=future_days)
+        self.seed = seed
+        self.password_hash = password_hash
+        first_ids = first_ids or {}
+        self.first_user_id = first_ids.get('user', 1)
+        self.first_vehicle_id = first_ids.get('vehicle', 1)
+        self.first_equipment_id = first_ids.get('equipment', 1)
+        self.first_reservation_id = first_ids.get('reservation', 1)
+
+        durations, weights = zip(*DURATION_WEIGHTS)
+        self._durations = durations
+        self._cum_weights = [sum(weights[:i + 1]) for i in range(len(weights))]
+        self._vehicles = None
+
+    def users(self):
+        rng = random.Random(f"{self.seed}-users")
+        for i in range(self.user_count):
+            user_id = self.first_user_id + i
+            # About one user in 500 is staff
+            role = rng.choice(STAFF_ROLES) if i % 500 == 0 else "Member"
+            yield (user_id, f"user{user_id}", self.password_hash,
+                   rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), role)
+
+    def vehicles(self):
+        """Every vehicle row; small enough to keep as a list"""
+        if self._vehicles is None:
+            rng = random.Random(f"{self.seed}-vehicles")
+            types = [t for t, _, _ in FLEET_MIX]
+            shares = [share for _, share, _ in FLEET_MIX]
+            models = {t: m for t, _, m in FLEET_MIX}
+            rows = []
+            for i in range(self.vehicle_count):
+                vehicle_id = self.first_vehicle_id + i
+                v_type = rng.choices(types, shares)[0]
+                brand, model, rate = rng.choice(models[v_type])
+                roll = rng.random()
+                status = 'Rented' if roll < RENTED_SHARE else 'Maintenance' if roll < RENTED_SHARE + MAINTENANCE_SHARE else 'Available'
+                rows.append((vehicle_id, brand, model, rng.randint(2015, self.as_of.year), f"SYN {vehicle_id:07d}",
+                             v_type, status, rate + rng.choice((0, 100, 200))))
+            self._vehicles = rows
+        return self._vehicles
+
+    def equipment(self):
+        # Stock scales with the fleet so synthetic bookings rarely exhaust it
+        quantity = max(5, self.vehicle_count // 20)
+        return [(self.first_equipment_id + i, name, rate, quantity)
+                for i, (name, rate) in enumerate(EQUIPMENT_CATALOG[:self.equipment_count])]
+
+    def reservations(self):
+        """
+        Yields (reservation row, equipment_ids) in reservation_id order, one vehicle
+        at a time. Rows are generated lazily, so millions never sit in memory.
+        """
+        vehicles = self.vehicles()
+        if not vehicles or not self.user_count:
+            return
+        equipment = self.equipment()
+        span = (self.last_day - self.first_day).days
+        per_vehicle, extra = divmod(self.reservation_count, len(vehicles))
+        if per_vehicle + (1 if extra else 0) > span:
+            raise ValueError(f"{self.reservation_count} reservations don't fit on {len(vehicles)} vehicles "
+                             f"in {span} days without overlapping - add vehicles or years")
+        reservation_id = self.first_reservation_id
+
+        for index, (vehicle_id, _, _, _, _, v_type, v_status, rate) in enumerate(vehicles):
+            count = per_vehicle + (1 if index < extra else 0)
+            if not count:
+                continue
+            rng = random.Random(f"{self.seed}-reservations-{vehicle_id}")
+            # The vehicle's timeline is cut into equal slots, one reservation somewhere in each
+            slot = span / count
+            for i in range(count):
+                slot_start = self.first_day + timedelta(days=int(i * slot))
+                slot_days = max(1, int((i + 1) * slot) - int(i * slot))
+                duration = min(rng.choices(self._durations, cum_weights=self._cum_weights)[0], slot_days)
+                if v_status == 'Rented' and slot_start <= self.as_of < slot_start + timedelta(days=slot_days):
+                    # A vehicle that is out has its rental running on as_of
+                    start = max(slot_start, self.as_of - timedelta(days=duration - 1))
+                else:
+                    start = slot_start + timedelta(days=rng.randrange(slot_days - duration + 1))
+                end = start + timedelta(days=duration - 1)
+
+                status = self._status(rng, start, end, v_status)
+                insurance = rng.random() < INSURANCE_SHARE
+                equipment_ids = ()
+                if equipment and rng.random() < EQUIPMENT_SHARE:
+                    equipment_ids = tuple(sorted({rng.choice(equipment)[0] for _ in range(rng.randint(1, 2))}))
+                rates = [eq[2] for eq in equipment if eq[0] in equipment_ids]
+                total = pricing.quote(rate, v_type, pricing.rental_days(start, end), insurance, rates)
+
+                # Booked 0-30 days ahead, never after as_of
+                created = min(datetime.combine(start, datetime.min.time()) - timedelta(days=rng.randint(0, 30)),
+                              datetime.combine(self.as_of, datetime.min.time()))
+                created += timedelta(seconds=rng.randrange(8 * 3600, 20 * 3600))
+
+                yield ((reservation_id, self._pick_user(rng), vehicle_id, start, end, status, insurance, total, created),
+                       equipment_ids)
+                reservation_id += 1
+
+    def _status(self, rng, start, end, vehicle_status):
+        if end < self.as_of:
+            return 'Completed' if rng.random() < 0.9 else 'Cancelled'
+        if start <= self.as_of:
+            # Only vehicles that are out have a running rental
+            return 'Active' if vehicle_status == 'Rented' else 'Cancelled'
+        return 'Pending' if rng.random() < 0.85 else 'Cancelled'
+
+    def _pick_user(self, rng):
+        # Squaring skews towards low ids: a minority of regulars make most bookings
+        return self.first_user_id + int(self.user_count * rng.random() ** 2)
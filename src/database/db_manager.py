@@ -1,51 +1,270 @@
+import time
+from contextlib import contextmanager
+
 import mysql.connector
-from src.config import DB_CONFIG
+from src.database.connection_pool import get_pool
+from src.config import STREAM_CONFIG, QUERY_STATS_CONFIG
+from src.database import query_stats
 
-class DBManager:
-    def __init__(self):
-        self.conn = None
-        self.cursor = None
+# Deadlock found / lock wait timeout - safe to retry the whole transaction
+RETRYABLE_ERRORS = (1213, 1205)
+
+def select_list(columns, alias=None):
+    """Column list for a SELECT, e.g. select_list(Vehicle.COLUMNS, 'v') -> 'v.vehicle_id, v.brand, ...'"""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + column for column in columns)
+
+class ObservedCursor:
+    """
+    The cursor transaction() hands out: every execute/executemany is reported to
+    the instrumentation hooks like the one-shot helpers' queries are. Everything
+    else (fetchone, rowcount, lastrowid, ...) goes straight to the real cursor.
+    """
+    def __init__(self, db, conn, cursor):
+        self._db = db
+        self._conn = conn
+        self._cursor = cursor
+
+    def execute(self, query, params=None):
+        started = time.perf_counter()
+        try:
+            result = self._cursor.execute(query, params or ())
+        except mysql.connector.Error as err:
+            self._db._observe(None, query, params, started, 0, err)
+            raise
+        self._db._observe(self._conn, query, params, started, max(self._cursor.rowcount, 0))
+        return result
 
-    def connect(self):
+    def executemany(self, query, seq_params):
+        started = time.perf_counter()
         try:
-            self.conn = mysql.connector.connect(**DB_CONFIG)
-            self.cursor = self.conn.cursor(dictionary=True)
-            return True
+            result = self._cursor.executemany(query, seq_params)
         except mysql.connector.Error as err:
-            print(f"Error: {err}")
-            return False
+            self._db._observe(None, query, None, started, 0, err)
+            raise
+        # Parameters of a batch aren't kept; the row count says how big it was
+        self._db._observe(None, query, None, started, max(self._cursor.rowcount, 0))
+        return result
+
+    def __iter__(self):
+        return iter(self._cursor)
 
-    def disconnect(self):
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class DBManager:
+    """
+    Thin query helper on top of the shared connection pool.
+    Each call checks a connection out of the pool and returns it when done,
+    so controllers never hold a connection between actions.
+    """
+
+    def __init__(self):
+        self._pool = None
+
+    @property
+    def pool(self):
+        # Resolved lazily so creating a controller doesn't touch the database
+        if self._pool is None:
+            self._pool = get_pool()
+        return self._pool
 
     def execute_query(self, query, params=None):
+        started = time.perf_counter()
         try:
-            self.connect()
-            self.cursor.execute(query, params or ())
-            self.conn.commit()
-            return self.cursor
+            with self.pool.connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+                try:
+                    cursor.execute(query, params or ())
+                    conn.commit()
+                finally:
+                    cursor.close()
+                self._observe(None, query, params, started, cursor.rowcount)
+                # Closed cursor still exposes rowcount / lastrowid to callers
+                return cursor
         except mysql.connector.Error as err:
+            self._observe(None, query, params, started, 0, err)
             print(f"Query Error: {err}")
             return None
-        finally:
-            # We don't close here to allow fetching results, 
-            # but for simple updates it might be better to close.
-            # For this simple app, we'll manage connection per controller action or keep it open.
-            pass
 
     def fetch_one(self, query, params=None):
-        self.connect()
-        self.cursor.execute(query, params or ())
-        result = self.cursor.fetchone()
-        self.disconnect()
-        return result
+        started = time.perf_counter()
+        with self.pool.connection() as conn:
+            # Buffered so extra rows don't block reuse of the connection
+            cursor = conn.cursor(dictionary=True, buffered=True)
+            try:
+                cursor.execute(query, params or ())
+                result = cursor.fetchone()
+            except mysql.connector.Error as err:
+                self._observe(None, query, params, started, 0, err)
+                raise
+            finally:
+                cursor.close()
+            self._observe(conn, query, params, started, 1 if result else 0)
+            return result
 
     def fetch_all(self, query, params=None):
-        self.connect()
-        self.cursor.execute(query, params or ())
-        result = self.cursor.fetchall()
-        self.disconnect()
-        return result
+        started = time.perf_counter()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute(query, params or ())
+                result = cursor.fetchall()
+            except mysql.connector.Error as err:
+                self._observe(None, query, params, started, 0, err)
+                raise
+            finally:
+                cursor.close()
+            self._observe(conn, query, params, started, len(result))
+            return result
+
+    def fetch_models(self, query, params=None, factory=tuple, batch_size=1000):
+        """
+        Rows mapped to objects: factory(row) gets each row as a plain tuple, in the
+        query's column order (see the COLUMNS of the classes in src/models). No dict
+        is built per row, and rows are mapped in batches so the raw tuples of the
+        whole result are never all held at once.
+        """
+        started = time.perf_counter()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, params or ())
+                result = []
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    result.extend(factory(row) for row in rows)
+            except mysql.connector.Error as err:
+                self._observe(None, query, params, started, 0, err)
+                raise
+            finally:
+                cursor.close()
+            self._observe(conn, query, params, started, len(result))
+            return result
+
+    def iter_query(self, query, params=None, batch_size=None, factory=None):
+        """
+        Stream a large result in constant memory. Rows are read from the server
+        with an unbuffered cursor, batch_size at a time, and yielded one by one:
+        dicts like fetch_all, or factory(row) for each plain tuple row.
+
+        The connection is checked out on the first next() and held until the
+        generator is exhausted or closed. Stopping early (break, an exception, or
+        dropping the generator) leaves unread rows on the connection, so it is
+        closed instead of going back to the pool. Use contextlib.closing() to
+        release it promptly when not reading to the end.
+        """
+        batch_size = batch_size or STREAM_CONFIG['batch_size']
+        conn = self.pool.acquire()
+        finished = False
+        # Instrumented with the time spent in execute/fetchmany only, not in the consumer
+        server_time = 0.0
+        started = None
+        count = 0
+        error = None
+        try:
+            # The server waits on a slow consumer for at most net_write_timeout
+            setup = conn.cursor()
+            setup.execute("SET SESSION net_write_timeout = %s", (STREAM_CONFIG['net_write_timeout'],))
+            setup.close()
+
+            cursor = conn.cursor(dictionary=factory is None)
+            started = time.perf_counter()
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                server_time += time.perf_counter() - started
+                started = None
+                if not rows:
+                    break
+                count += len(rows)
+                if factory is None:
+                    yield from rows
+                else:
+                    for row in rows:
+                        yield factory(row)
+                started = time.perf_counter()
+            cursor.close()
+            finished = True
+        except mysql.connector.Error as err:
+            error = err
+            raise
+        finally:
+            if started is not None:
+                server_time += time.perf_counter() - started
+            self._observe(None, query, params, time.perf_counter() - server_time, count, error)
+            if finished:
+                self.pool.release(conn)
+            else:
+                self.pool.discard(conn)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several statements on one connection and commit them together.
+        Yields a buffered dictionary cursor (instrumented, see ObservedCursor);
+        any exception rolls everything back.
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(dictionary=True, buffered=True)
+            try:
+                conn.start_transaction()
+                yield ObservedCursor(self, conn, cursor)
+                conn.commit()
+            except BaseException:
+                try:
+                    conn.rollback()
+                except mysql.connector.Error:
+                    pass
+                raise
+            finally:
+                cursor.close()
+
+    def run_transaction(self, work, retries=3):
+        """Call work(cursor) inside transaction() and return its result, retrying on deadlocks"""
+        for attempt in range(retries + 1):
+            try:
+                with self.transaction() as cursor:
+                    return work(cursor)
+            except mysql.connector.Error as err:
+                if err.errno not in RETRYABLE_ERRORS or attempt == retries:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+
+    def _observe(self, conn, query, params, started, rows, error=None):
+        """
+        Report a finished query to the instrumentation hooks (see query_stats.py).
+        Slow SELECTs get their EXPLAIN plan captured on conn, still checked out.
+        """
+        if not QUERY_STATS_CONFIG['enabled']:
+            return
+        query_stats.get_query_stats()  # Installs the default hooks on first use
+        event = query_stats.QueryEvent(query, params, (time.perf_counter() - started) * 1000, rows,
+                                       query_stats.find_caller(), error)
+        if (conn is not None and QUERY_STATS_CONFIG['explain_slow_queries']
+                and event.elapsed_ms >= QUERY_STATS_CONFIG['slow_query_ms']
+                and query.lstrip()[:6].upper() == 'SELECT'):
+            event.plan = self._explain(conn, query, params)
+        query_stats.emit(event)
+
+    @staticmethod
+    def _explain(conn, query, params):
+        cursor = conn.cursor(dictionary=True, buffered=True)
+        try:
+            cursor.execute("EXPLAIN " + query, params or ())
+            return cursor.fetchall()
+        except mysql.connector.Error as err:
+            print(f"Explain Error: {err}")
+            return None
+        finally:
+            cursor.close()
+
+    def get_query_stats(self):
+        """(per-fingerprint summary, recent slow queries) recorded in this process"""
+        stats = query_stats.get_query_stats()
+        return stats.summary(), stats.slow_queries()
+
+    def get_pool_metrics(self):
+        return self.pool.get_metrics()
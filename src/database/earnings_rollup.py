@@ -0,0 +1,78 @@
+"""
+Maintains Earnings_Daily, the per-day, per-vehicle-type rollup behind the
+Analytics charts and the dashboard earnings total.
+
+A reservation counts towards the day it starts on and the type of its
+vehicle for as long as it is not Cancelled. The helpers below take an open
+cursor so the rollup changes in the same transaction as the reservation.
+
+Run this module to rebuild the table from Reservations (after upgrading, or
+after rows were changed outside the app):
+    python -m src.database.earnings_rollup
+"""
+import time
+from src.database.db_manager import DBManager
+
+# Adds each row's values to the existing (day, type) totals
+UPSERT = """
+    ON DUPLICATE KEY UPDATE
+        earnings = earnings + VALUES(earnings),
+        reservations = reservations + VALUES(reservations)
+"""
+
+
+def record(cursor, day, vehicle_type, amount, count=1):
+    """Add (or with negative values, remove) earnings for one day and type"""
+    cursor.execute(
+        "INSERT INTO Earnings_Daily (day, vehicle_type, earnings, reservations) VALUES (%s, %s, %s, %s)" + UPSERT,
+        (day, vehicle_type, amount, count)
+    )
+
+
+def apply_reservations(cursor, reservation_ids, sign):
+    """Add (sign=1) or remove (sign=-1) the given non-cancelled reservations from the rollup"""
+    if not reservation_ids:
+        return
+    placeholders = ','.join(['%s'] * len(reservation_ids))
+    _apply(cursor, f"r.reservation_id IN ({placeholders})", tuple(reservation_ids), sign)
+
+
+def apply_vehicle(cursor, vehicle_id, sign):
+    """Add or remove every non-cancelled reservation of a vehicle, e.g. around a change of its type"""
+    _apply(cursor, "r.vehicle_id = %s", (vehicle_id,), sign)
+
+
+def _apply(cursor, condition, params, sign):
+    cursor.execute(f"""
+        INSERT INTO Earnings_Daily (day, vehicle_type, earnings, reservations)
+        SELECT r.start_date, v.type, %s * SUM(r.total_cost), %s * COUNT(*)
+        FROM Reservations r
+        JOIN Vehicles v ON r.vehicle_id = v.vehicle_id
+        WHERE {condition} AND r.status != 'Cancelled'
+        GROUP BY r.start_date, v.type
+    """ + UPSERT, (sign, sign) + params)
+
+
+def rebuild(cursor):
+    """Recompute the whole rollup from Reservations"""
+    cursor.execute("DELETE FROM Earnings_Daily")
+    cursor.execute("""
+        INSERT INTO Earnings_Daily (day, vehicle_type, earnings, reservations)
+        SELECT r.start_date, v.type, COALESCE(SUM(r.total_cost), 0), COUNT(*)
+        FROM Reservations r
+        JOIN Vehicles v ON r.vehicle_id = v.vehicle_id
+        WHERE r.status != 'Cancelled'
+        GROUP BY r.start_date, v.type
+    """)
+    return cursor.rowcount
+
+
+def backfill():
+    started = time.perf_counter()
+    with DBManager().transaction() as cursor:
+        rows = rebuild(cursor)
+    print(f"Earnings_Daily rebuilt: {rows} day/type rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    backfill()
@@ -0,0 +1,199 @@
+import os
+import re
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from src.config import QUERY_STATS_CONFIG
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf'))
+
+CONTROLLERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "controllers")
+
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b\d+(?:\.\d+)?\b|%s")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """
+    SQL with literals and placeholders replaced by ? and whitespace collapsed, so
+    the same statement groups together whatever its parameters or IN-list length
+    """
+    sql = _LITERALS.sub("?", sql)
+    sql = _IN_LISTS.sub("(?+)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def describe_params(params):
+    """Types of the parameters only, e.g. '(str, str)' - values can be usernames or password hashes"""
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in params.items()) + "}"
+    return "(" + ", ".join(type(v).__name__ for v in params) + ")"
+
+
+def find_caller():
+    """'RentalController.get_pending_reservations' for the controller method that ran the query, or None"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if os.path.dirname(os.path.abspath(frame.f_code.co_filename)) == CONTROLLERS_DIR:
+            return getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+        frame = frame.f_back
+    return None
+
+
+class QueryEvent:
+    """One finished query, as passed to instrumentation hooks"""
+    __slots__ = ('sql', 'params', 'fingerprint', 'elapsed_ms', 'rows', 'caller', 'error', 'plan', 'at')
+
+    def __init__(self, sql, params, elapsed_ms, rows, caller, error=None):
+        self.sql = sql
+        self.params = params
+        self.fingerprint = fingerprint(sql)
+        self.elapsed_ms = elapsed_ms
+        self.rows = rows
+        self.caller = caller
+        self.error = error
+        self.plan = None  # EXPLAIN rows, filled in for slow SELECTs
+        self.at = datetime.now()
+
+
+class QueryStats:
+    """
+    In-process latency histograms per SQL fingerprint, plus the most recent slow
+    queries. Fed by the DBManager instrumentation hook; read by the admin
+    Diagnostics view.
+    """
+
+    def __init__(self, recent_slow=50):
+        self._lock = threading.Lock()
+        self._stats = {}  # fingerprint -> dict of counters
+        self._slow = deque(maxlen=recent_slow)
+
+    def record(self, event):
+        with self._lock:
+            stats = self._stats.get(event.fingerprint)
+            if stats is None:
+                stats = self._stats[event.fingerprint] = {
+                    'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0,
+                    'buckets': [0] * len(BUCKETS_MS), 'callers': {}
+                }
+            stats['calls'] += 1
+            stats['errors'] += event.error is not None
+            stats['total_ms'] += event.elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], event.elapsed_ms)
+            stats['rows'] += event.rows or 0
+            stats['buckets'][next(i for i, bound in enumerate(BUCKETS_MS) if event.elapsed_ms <= bound)] += 1
+            caller = event.caller or "(other)"
+            stats['callers'][caller] = stats['callers'].get(caller, 0) + 1
+            if event.elapsed_ms >= QUERY_STATS_CONFIG['slow_query_ms']:
+                self._slow.append(event)
+
+    @staticmethod
+    def _percentile(buckets, calls, p):
+        # Upper bound of the bucket holding the p-th call; the open bucket reports the lower bound
+        target = p * calls
+        seen = 0
+        for i, count in enumerate(buckets):
+            seen += count
+            if seen >= target:
+                return BUCKETS_MS[i] if BUCKETS_MS[i] != float('inf') else BUCKETS_MS[i - 1]
+        return 0
+
+    def summary(self):
+        """One dict per fingerprint, slowest total time first"""
+        with self._lock:
+            rows = []
+            for fp, stats in self._stats.items():
+                calls = stats['calls']
+                rows.append({
+                    'fingerprint': fp,
+                    'calls': calls,
+                    'errors': stats['errors'],
+                    'total_ms': stats['total_ms'],
+                    'avg_ms': stats['total_ms'] / calls,
+                    'p50_ms': self._percentile(stats['buckets'], calls, 0.5),
+                    'p95_ms': self._percentile(stats['buckets'], calls, 0.95),
+                    'max_ms': stats['max_ms'],
+                    'avg_rows': stats['rows'] / calls,
+                    'top_caller': max(stats['callers'].items(), key=lambda c: c[1])[0]
+                })
+        return sorted(rows, key=lambda r: r['total_ms'], reverse=True)
+
+    def slow_queries(self):
+        """Most recent slow queries, newest first"""
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+
+
+class SlowQueryLog:
+    """Appends queries slower than the threshold, with their EXPLAIN plan when captured, to a text file"""
+
+    def __init__(self, path, threshold_ms):
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event.elapsed_ms < self.threshold_ms:
+            return
+        lines = [f"# {event.at:%Y-%m-%d %H:%M:%S} {event.elapsed_ms:.1f} ms, {event.rows} rows, "
+                 f"caller {event.caller or '(other)'}{', error: ' + str(event.error) if event.error else ''}",
+                 _SPACES.sub(" ", event.sql).strip() + ";"]
+        if event.params:
+            lines.append(f"# params: {describe_params(event.params)}")
+        for step in event.plan or ():
+            lines.append("# plan: " + ", ".join(f"{k}={v}" for k, v in step.items() if v is not None))
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n\n")
+        except OSError as e:
+            print(f"Could not write slow query log {self.path}: {e}")
+
+
+_hooks = []
+_stats = None
+_setup_lock = threading.Lock()
+
+
+def add_hook(hook):
+    """Call hook(event) with a QueryEvent after every instrumented query"""
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def get_query_stats():
+    """Process-wide QueryStats; installs it and the slow query log as hooks on first use"""
+    global _stats
+    if _stats is None:
+        with _setup_lock:
+            if _stats is None:
+                stats = QueryStats(QUERY_STATS_CONFIG['recent_slow_queries'])
+                add_hook(stats.record)
+                if QUERY_STATS_CONFIG['slow_log_path']:
+                    add_hook(SlowQueryLog(QUERY_STATS_CONFIG['slow_log_path'], QUERY_STATS_CONFIG['slow_query_ms']))
+                _stats = stats
+    return _stats
+
+
+def emit(event):
+    for hook in list(_hooks):
+        try:
+            hook(event)
+        except Exception as e:
+            # Instrumentation must never break the query it observes
+            print(f"Query Hook Error: {e}")
@@ -0,0 +1,17 @@
+"""
+Writes to Reservation_Events, the change feed dashboards poll to refresh
+incrementally. Events are recorded with the caller's cursor, inside the
+transaction that changes the reservation, so an event is visible exactly
+when the change is.
+"""
+
+
+def record(cursor, reservation_ids, status):
+    """One event per reservation, carrying its new status"""
+    if not reservation_ids:
+        return
+    cursor.executemany(
+        "INSERT INTO Reservation_Events (reservation_id, status) VALUES (%s, %s)",
+        [(reservation_id, status) for reservation_id in reservation_ids]
+    )
+
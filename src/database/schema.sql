@@ -5,14 +5,14 @@ CREATE TABLE IF NOT EXISTS Users (
     password_hash VARCHAR(255) NOT NULL,
     first_name VARCHAR(50),
     last_name VARCHAR(50),
-    role ENUM('Receptionist', 'Member', 'Worker') NOT NULL,
+    role ENUM('Receptionist', 'Member', 'Worker', 'Admin') NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Vehicles Table
 CREATE TABLE IF NOT EXISTS Vehicles (
     vehicle_id INT AUTO_INCREMENT PRIMARY KEY,
-    make VARCHAR(50) NOT NULL,
+    brand VARCHAR(50) NOT NULL,
     model VARCHAR(50) NOT NULL,
     year INT NOT NULL,
     license_plate VARCHAR(20) NOT NULL UNIQUE,
@@ -26,7 +26,8 @@ CREATE TABLE IF NOT EXISTS Vehicles (
 CREATE TABLE IF NOT EXISTS Equipment (
     equipment_id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(100) NOT NULL,
-    daily_rate DECIMAL(10, 2) NOT NULL
+    daily_rate DECIMAL(10, 2) NOT NULL,
+    quantity INT NOT NULL DEFAULT 1 -- Units in stock
 );
 
 -- Reservations Table
@@ -64,3 +65,23 @@ CREATE TABLE IF NOT EXISTS Vehicle_Logs (
     FOREIGN KEY (vehicle_id) REFERENCES Vehicles(vehicle_id),
     FOREIGN KEY (user_id) REFERENCES Users(user_id)
 );
+
+-- Earnings rollup: non-cancelled reservation totals per start day and vehicle type,
+-- kept up to date by src/database/earnings_rollup.py
+CREATE TABLE IF NOT EXISTS Earnings_Daily (
+    day DATE NOT NULL,
+    vehicle_type VARCHAR(50) NOT NULL,
+    earnings DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    reservations INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, vehicle_type)
+);
+
+-- Change feed: one row per reservation state change. event_id follows insert order, not
+-- commit order, so dashboards re-read recent events instead of trusting the last id they
+-- saw (see RentalController.get_reservation_changes)
+CREATE TABLE IF NOT EXISTS Reservation_Events (
+    event_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    reservation_id INT NOT NULL,
+    status VARCHAR(20) NOT NULL, -- Status after the change
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
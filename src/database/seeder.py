@@ -1,15 +1,156 @@
+"""
+Creates the database and schema, then seeds it.
+
+    python -m src.database.seeder                 # schema + demo users, vehicles and equipment
+    python -m src.database.seeder --bulk --vehicles 10000 --users 500000 --reservations 5000000
+    python -m src.database.seeder --bulk --method infile ...     # LOAD DATA LOCAL INFILE instead of INSERTs
+    python -m src.database.seeder --csv-dir staging/             # Users.csv, Vehicles.csv, ... (header row first)
+
+Bulk mode streams synthetic rows (src/database/datagen.py) or CSV files into the
+tables with multi-row INSERTs or LOAD DATA LOCAL INFILE, with foreign key and
+unique checks off and the secondary indexes in INDEXES dropped until the load
+is done, and reports rows/sec per table.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
 import mysql.connector
-import bcrypt
 from src.config import DB_CONFIG
+from src.utils.password_hasher import hash_password
+from src.database import earnings_rollup
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+# Secondary indexes, kept here (rather than in schema.sql) so they can be
+# added to databases that were created before the index existed.
+# (table, index name, columns)
+INDEXES = [
+    ("Reservations", "idx_reservations_status_cost", "status, total_cost"),
+    ("Reservations", "idx_reservations_vehicle_dates", "vehicle_id, start_date, end_date"),
+    # Keyset pagination of the reservation history, optionally filtered by status or user
+    ("Reservations", "idx_reservations_created", "created_at, reservation_id"),
+    ("Reservations", "idx_reservations_status_created", "status, created_at, reservation_id"),
+    ("Reservations", "idx_reservations_user_created", "user_id, created_at, reservation_id"),
+]
+
+# Columns added after the first release, for the same reason (table, column, definition)
+COLUMNS = [
+    ("Equipment", "quantity", "INT NOT NULL DEFAULT 1"),
+]
+
+# Columns renamed since (table, old name, new name, definition)
+RENAMED_COLUMNS = [
+    ("Vehicles", "make", "brand", "VARCHAR(50) NOT NULL"),
+]
+
+# Columns whose type changed since (table, column, column_type as information_schema shows it, definition)
+CHANGED_COLUMNS = [
+    ("Users", "role", "enum('receptionist','member','worker','admin')",
+     "ENUM('Receptionist', 'Member', 'Worker', 'Admin') NOT NULL"),
+]
+
+def ensure_columns(cursor):
+    """Rename, retype and add columns so an older database matches RENAMED_COLUMNS, CHANGED_COLUMNS and COLUMNS"""
+    cursor.execute("""
+        SELECT LOWER(table_name), LOWER(column_name), LOWER(column_type)
+        FROM information_schema.columns WHERE table_schema = DATABASE()
+    """)
+    types = {(table, column): column_type for table, column, column_type in cursor.fetchall()}
+    existing = set(types)
+    for table, old, new, definition in RENAMED_COLUMNS:
+        if (table.lower(), old.lower()) in existing and (table.lower(), new.lower()) not in existing:
+            cursor.execute(f"ALTER TABLE {table} CHANGE COLUMN {old} {new} {definition}")
+            existing.add((table.lower(), new.lower()))
+            print(f"Renamed column {old} to {new} in {table}.")
+    for table, name, column_type, definition in CHANGED_COLUMNS:
+        current = types.get((table.lower(), name.lower()))
+        if current is not None and current != column_type:
+            cursor.execute(f"ALTER TABLE {table} MODIFY COLUMN {name} {definition}")
+            print(f"Changed column {name} of {table} to {definition}.")
+    for table, name, definition in COLUMNS:
+        if (table.lower(), name.lower()) not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+            print(f"Added column {name} to {table}.")
+
+def ensure_indexes(cursor):
+    """Create any index from INDEXES that the current database is missing"""
+    cursor.execute(
+        "SELECT LOWER(table_name), LOWER(index_name) FROM information_schema.statistics WHERE table_schema = DATABASE()"
+    )
+    existing = set(cursor.fetchall())
+    for table, name, columns in INDEXES:
+        if (table.lower(), name.lower()) not in existing:
+            cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+            print(f"Created index {name} on {table}.")
+
+def split_statements(script):
+    """Statements of a SQL script. A ';' inside quotes or a -- comment doesn't end a statement."""
+    statements = []
+    current = []
+    quote = None
+    i = 0
+    while i < len(script):
+        ch = script[i]
+        if quote:
+            current.append(ch)
+            if ch == '\\' and i + 1 < len(script):
+                current.append(script[i + 1])
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in ("'", '"', '`'):
+            quote = ch
+            current.append(ch)
+        elif script.startswith('--', i):
+            # Comment runs to the end of the line
+            end = script.find('\n', i)
+            i = len(script) if end == -1 else end
+            continue
+        elif ch == ';':
+            statements.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+        i += 1
+    statements.append(''.join(current).strip())
+    return [statement for statement in statements if statement]
+
+def apply_schema(cursor):
+    with open(SCHEMA_PATH, 'r') as f:
+        for statement in split_statements(f.read()):
+            cursor.execute(statement)
+
+def drop_indexes(cursor, tables):
+    """Drop the INDEXES on these tables so a bulk load doesn't maintain them row by row"""
+    cursor.execute(
+        "SELECT LOWER(table_name), LOWER(index_name) FROM information_schema.statistics WHERE table_schema = DATABASE()"
+    )
+    existing = set(cursor.fetchall())
+    wanted = {table.lower() for table in tables}
+    for table, name, _ in INDEXES:
+        if table.lower() in wanted and (table.lower(), name.lower()) in existing:
+            try:
+                cursor.execute(f"DROP INDEX {name} ON {table}")
+            except mysql.connector.Error as err:
+                # InnoDB refuses when the index also backs a foreign key - it stays
+                print(f"Kept index {name}: {err}")
+
+def connect(database=True):
+    """Direct connection for seeding (not the app's pool), allowed to send local files"""
+    config = dict(DB_CONFIG, allow_local_infile=True)
+    if not database:
+        config.pop('database')
+    return mysql.connector.connect(**config)
 
 def seed_database():
     # Connect to MySQL Server (without database first to create it)
     try:
-        conn = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
-        )
+        conn = connect(database=False)
         cursor = conn.cursor()
         
         # Create Database
@@ -19,18 +160,11 @@ def seed_database():
         print("Database created/selected.")
 
         # Read and execute schema
-        with open('src/database/schema.sql', 'r') as f:
-            schema = f.read()
-            statements = schema.split(';')
-            for statement in statements:
-                if statement.strip():
-                    cursor.execute(statement)
-        
+        apply_schema(cursor)
         print("Schema applied.")
 
-        # Helper to hash passwords
-        def hash_password(password):
-            return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        ensure_columns(cursor)
+        ensure_indexes(cursor)
 
         password_hash = hash_password("password")
 
@@ -60,32 +194,255 @@ def seed_database():
         ]
 
         cursor.executemany(
-            "INSERT IGNORE INTO Vehicles (make, model, year, license_plate, type, daily_rate) VALUES (%s, %s, %s, %s, %s, %s)",
+            "INSERT IGNORE INTO Vehicles (brand, model, year, license_plate, type, daily_rate) VALUES (%s, %s, %s, %s, %s, %s)",
             vehicles
         )
         print("Vehicles seeded.")
 
         # Seed Equipment
         equipment = [
-            ("GPS Navigation", 200.00),
-            ("Child Safety Seat", 150.00),
-            ("Ski Rack", 300.00), # Maybe less common in PH but requested
-            ("Dash Cam", 100.00)
+            ("GPS Navigation", 200.00, 5),
+            ("Child Safety Seat", 150.00, 3),
+            ("Ski Rack", 300.00, 2), # Maybe less common in PH but requested
+            ("Dash Cam", 100.00, 5)
         ]
 
         cursor.executemany(
-            "INSERT IGNORE INTO Equipment (name, daily_rate) VALUES (%s, %s)",
+            "INSERT IGNORE INTO Equipment (name, daily_rate, quantity) VALUES (%s, %s, %s)",
             equipment
         )
         print("Equipment seeded.")
 
+        # Bring the analytics rollup in line with whatever reservations already exist
+        earnings_rollup.rebuild(cursor)
+        print("Earnings rollup rebuilt.")
+
         conn.commit()
         cursor.close()
         conn.close()
         print("Database seeding completed successfully.")
 
+        return True
+
+    except mysql.connector.Error as err:
+        print(f"Error: {err}")
+        return False
+
+class BulkLoader:
+    """
+    Streams rows into a table in chunks, either as multi-row INSERT statements
+    ('insert', batch_rows rows per statement) or through a temporary CSV file per
+    chunk and LOAD DATA LOCAL INFILE ('infile', needs local_infile=ON on the
+    server). Each chunk is committed on its own, so memory and undo log stay
+    bounded however many rows there are. Timings are kept per table for report();
+    they cover the database work only, not producing the rows.
+    """
+    def __init__(self, conn, method='insert', batch_rows=5000, chunk_rows=200000):
+        self.conn = conn
+        self.method = method
+        self.batch_rows = batch_rows
+        self.chunk_rows = chunk_rows
+        self.cursor = conn.cursor()
+        self.totals = {}  # table -> [rows, seconds]
+
+    @contextmanager
+    def deferred_checks(self, tables):
+        """Foreign key and unique checks off and INDEXES dropped for the load; indexes are rebuilt after"""
+        self.cursor.execute("SET SESSION foreign_key_checks = 0")
+        self.cursor.execute("SET SESSION unique_checks = 0")
+        drop_indexes(self.cursor, tables)
+        try:
+            yield self
+        finally:
+            self.cursor.execute("SET SESSION unique_checks = 1")
+            self.cursor.execute("SET SESSION foreign_key_checks = 1")
+            started = time.perf_counter()
+            ensure_indexes(self.cursor)
+            print(f"Indexes rebuilt in {time.perf_counter() - started:.1f}s")
+
+    def load(self, table, columns, rows):
+        """Load an iterable of row tuples in column order; returns the row count"""
+        load_chunk = self._load_infile if self.method == 'infile' else self._load_inserts
+        count = 0
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_rows:
+                count += self._timed(table, load_chunk, columns, chunk)
+                chunk = []
+        if chunk:
+            count += self._timed(table, load_chunk, columns, chunk)
+        return count
+
+    def _timed(self, table, load_chunk, columns, chunk):
+        # Only the load itself is timed: rows generated meanwhile (or other tables
+        # loaded from inside the generator) don't count against this table
+        started = time.perf_counter()
+        count = load_chunk(table, columns, chunk)
+        self._track(table, count, time.perf_counter() - started)
+        return count
+
+    def load_csv(self, table, path):
+        """Load a CSV file whose header row names the columns, by the loader's method; returns the row count"""
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            columns = next(reader)
+            if self.method != 'infile':
+                return self.load(table, columns, ([None if v == 'NULL' else v for v in row] for row in reader))
+        started = time.perf_counter()
+        count = self._load_data(table, columns, path, skip_header=True)
+        self._track(table, count, time.perf_counter() - started)
+        return count
+
+    def _load_inserts(self, table, columns, rows):
+        row_placeholder = f"({', '.join(['%s'] * len(columns))})"
+        prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        for i in range(0, len(rows), self.batch_rows):
+            batch = rows[i:i + self.batch_rows]
+            self.cursor.execute(prefix + ", ".join([row_placeholder] * len(batch)),
+                                [value for row in batch for value in row])
+        self.conn.commit()
+        return len(rows)
+
+    def _load_infile(self, table, columns, rows):
+        fd, path = tempfile.mkstemp(suffix=".csv", prefix=f"{table}_")
+        try:
+            with os.fdopen(fd, "w", newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                for row in rows:
+                    writer.writerow([self._csv_value(value) for value in row])
+            return self._load_data(table, columns, path)
+        finally:
+            os.remove(path)
+
+    def _load_data(self, table, columns, path, skip_header=False):
+        # Plain RFC 4180 CSV: "" escapes a quote, and an unquoted NULL is NULL
+        self.cursor.execute(
+            f"""
+            LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+            LINES TERMINATED BY '\\n'
+            {'IGNORE 1 LINES' if skip_header else ''}
+            ({', '.join(columns)})
+            """,
+            (os.path.abspath(path),)
+        )
+        count = self.cursor.rowcount
+        self.conn.commit()
+        return count
+
+    @staticmethod
+    def _csv_value(value):
+        if value is None:
+            return 'NULL'
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    def _track(self, table, rows, seconds):
+        total = self.totals.setdefault(table, [0, 0.0])
+        total[0] += rows
+        total[1] += seconds
+
+    def report(self):
+        rows = sum(r for r, _ in self.totals.values())
+        seconds = sum(t for _, t in self.totals.values())
+        for table, (count, elapsed) in self.totals.items():
+            print(f"  {table:<24} {count:>10} rows in {elapsed:7.1f}s  {count / elapsed if elapsed else 0:>10.0f} rows/sec")
+        print(f"  {'total':<24} {rows:>10} rows in {seconds:7.1f}s  {rows / seconds if seconds else 0:>10.0f} rows/sec")
+
+def next_ids(cursor):
+    """First free id per table, so a dataset can be loaded next to existing rows"""
+    cursor.execute("""
+        SELECT (SELECT COALESCE(MAX(user_id), 0) FROM Users) + 1,
+               (SELECT COALESCE(MAX(vehicle_id), 0) FROM Vehicles) + 1,
+               (SELECT COALESCE(MAX(equipment_id), 0) FROM Equipment) + 1,
+               (SELECT COALESCE(MAX(reservation_id), 0) FROM Reservations) + 1
+    """)
+    return dict(zip(('user', 'vehicle', 'equipment', 'reservation'), (int(v) for v in cursor.fetchone())))
+
+BULK_TABLES = ("Users", "Vehicles", "Equipment", "Reservations", "Reservation_Equipment")
+
+def bulk_seed(vehicles, users, reservations, years=6, seed=42, method='insert', batch_rows=5000, chunk_rows=200000):
+    """Load a synthetic dataset (see datagen.py) next to whatever the tables already hold"""
+    from src.database.datagen import (SyntheticData, USER_COLUMNS, VEHICLE_COLUMNS, EQUIPMENT_COLUMNS,
+                                      RESERVATION_COLUMNS, RESERVATION_EQUIPMENT_COLUMNS)
+    conn = connect()
+    loader = BulkLoader(conn, method, batch_rows, chunk_rows)
+    data = SyntheticData(vehicles, users, reservations, years=years, seed=seed,
+                         first_ids=next_ids(loader.cursor), password_hash=hash_password("password"))
+
+    started = time.perf_counter()
+    with loader.deferred_checks(BULK_TABLES):
+        loader.load("Users", USER_COLUMNS, data.users())
+        loader.load("Vehicles", VEHICLE_COLUMNS, data.vehicles())
+        loader.load("Equipment", EQUIPMENT_COLUMNS, data.equipment())
+
+        # One pass over the generator feeds both tables; links are loaded after each chunk of reservations
+        links = []
+        def reservation_rows():
+            for row, equipment_ids in data.reservations():
+                links.extend((row[0], equipment_id) for equipment_id in equipment_ids)
+                yield row
+                if len(links) >= chunk_rows:
+                    loader.load("Reservation_Equipment", RESERVATION_EQUIPMENT_COLUMNS, links)
+                    links.clear()
+        loader.load("Reservations", RESERVATION_COLUMNS, reservation_rows())
+        loader.load("Reservation_Equipment", RESERVATION_EQUIPMENT_COLUMNS, links)
+
+    rollup_started = time.perf_counter()
+    earnings_rollup.rebuild(loader.cursor)
+    conn.commit()
+    print(f"Earnings rollup rebuilt in {time.perf_counter() - rollup_started:.1f}s")
+    loader.report()
+    print(f"Bulk load finished in {time.perf_counter() - started:.1f}s")
+    loader.cursor.close()
+    conn.close()
+
+def load_csv_dir(directory, method='insert'):
+    """Load every <Table>.csv found in directory, parents before children"""
+    conn = connect()
+    loader = BulkLoader(conn, method)
+    paths = [(table, os.path.join(directory, f"{table}.csv")) for table in BULK_TABLES]
+    paths = [(table, path) for table, path in paths if os.path.exists(path)]
+    if not paths:
+        print(f"No {', '.join(t + '.csv' for t in BULK_TABLES)} in {directory}")
+        return
+    with loader.deferred_checks([table for table, _ in paths]):
+        for table, path in paths:
+            loader.load_csv(table, path)
+    earnings_rollup.rebuild(loader.cursor)
+    conn.commit()
+    loader.report()
+    loader.cursor.close()
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bulk", action="store_true", help="load a synthetic dataset after seeding")
+    parser.add_argument("--csv-dir", help="load <Table>.csv files from this directory after seeding")
+    parser.add_argument("--method", choices=("insert", "infile"), default="insert")
+    parser.add_argument("--vehicles", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=500000)
+    parser.add_argument("--reservations", type=int, default=5000000)
+    parser.add_argument("--years", type=float, default=6)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-rows", type=int, default=5000, help="rows per INSERT statement")
+    parser.add_argument("--chunk-rows", type=int, default=200000, help="rows per commit / per LOAD DATA file")
+    args = parser.parse_args()
+
+    if not seed_database():
+        sys.exit(1)
+    try:
+        if args.bulk:
+            bulk_seed(args.vehicles, args.users, args.reservations, args.years, args.seed,
+                      args.method, args.batch_rows, args.chunk_rows)
+        if args.csv_dir:
+            load_csv_dir(args.csv_dir, method=args.method)
     except mysql.connector.Error as err:
         print(f"Error: {err}")
+        sys.exit(1)
 
 if __name__ == "__main__":
-    seed_database()
+    main()
@@ -4,12 +4,19 @@ import os
 # Add project root to path so 'src' module can be found
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import importlib
 import tkinter as tk
-from src.controllers.auth_controller import AuthController
 from src.views.login_view import LoginView
-from src.views.member_dashboard import MemberDashboard
-from src.views.staff_dashboard import StaffDashboard
-from src.views.admin_dashboard import AdminDashboard
+from src.utils.task_runner import TaskRunner, get_executor
+
+# Only the login window is imported up front. Dashboards pull in tkcalendar, PIL,
+# NumPy and the MySQL connector, so each is imported when its role first logs in.
+# role -> (module, class); any other role gets the staff dashboard
+DASHBOARDS = {
+    "Member": ("src.views.member_dashboard", "MemberDashboard"),
+    "Admin": ("src.views.admin_dashboard", "AdminDashboard"),
+}
+STAFF_DASHBOARD = ("src.views.staff_dashboard", "StaffDashboard")
 
 class MainApp(tk.Tk):
     def __init__(self):
@@ -17,31 +24,49 @@ class MainApp(tk.Tk):
         self.title("Vehicle Rental System")
         self.geometry("1000x700")
         
-        self.auth_controller = AuthController()
+        self._auth_controller = None
+        self.tasks = TaskRunner(self)
         self.current_user = None
         
         self.show_login()
+        # Once the login window is up, import the auth stack (MySQL connector, bcrypt)
+        # in the background so the first Login click doesn't pay for it
+        self.after_idle(lambda: get_executor().submit(lambda: self.auth_controller))
+
+    @property
+    def auth_controller(self):
+        """Created on first use; importing it loads the MySQL connector and bcrypt"""
+        if self._auth_controller is None:
+            from src.controllers.auth_controller import AuthController
+            self._auth_controller = AuthController()
+        return self._auth_controller
 
     def show_login(self):
         self.clear_window()
         LoginView(self, self)
 
-    def authenticate(self, username, password):
-        user = self.auth_controller.login(username, password)
-        if user:
-            self.current_user = user
-            self.show_dashboard()
-            return True
-        return False
+    def authenticate(self, username, password, on_failure=None):
+        """Check credentials on a worker thread (bcrypt is slow), then open the user's dashboard"""
+        def on_done(user):
+            if user:
+                self.current_user = user
+                self.show_dashboard()
+            elif on_failure:
+                on_failure("Invalid credentials")
+
+        def on_error(error):
+            if on_failure:
+                on_failure(f"Login failed: {error}")
+
+        # auth_controller is resolved on the worker too, in case the warm-up hasn't finished
+        self.tasks.submit(lambda: self.auth_controller.login(username, password),
+                          on_success=on_done, on_error=on_error, key="auth")
 
     def show_dashboard(self):
         self.clear_window()
-        if self.current_user.role == "Member":
-            MemberDashboard(self, self.current_user, self.logout)
-        elif self.current_user.role == "Admin":
-            AdminDashboard(self, self.current_user, self.logout)
-        else:
-            StaffDashboard(self, self.current_user, self.logout)
+        module_name, class_name = DASHBOARDS.get(self.current_user.role, STAFF_DASHBOARD)
+        dashboard = getattr(importlib.import_module(module_name), class_name)
+        dashboard(self, self.current_user, self.logout)
 
     def logout(self):
         self.current_user = None
@@ -0,0 +1,79 @@
+from src.utils import pricing
+
+class Reservation:
+    # Slotted like the other models, so long reservation histories stay small in memory
+    __slots__ = ('_reservation_id', '_user_id', '_vehicle_id', '_start_date', '_end_date',
+                 '_status', '_insurance_added', '_total_cost')
+    # Columns from_row expects, in this order - select these rather than SELECT *
+    COLUMNS = ('reservation_id', 'user_id', 'vehicle_id', 'start_date', 'end_date',
+               'status', 'insurance_added', 'total_cost')
+    BLOCKING_STATUSES = ('Pending', 'Active')
+
+    def __init__(self, reservation_id, user_id, vehicle_id, start_date, end_date, status, insurance_added, total_cost):
+        self._reservation_id = reservation_id
+        self._user_id = user_id
+        self._vehicle_id = vehicle_id
+        self._start_date = start_date
+        self._end_date = end_date
+        self._status = status
+        self._insurance_added = bool(insurance_added)
+        self._total_cost = total_cost
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    @property
+    def reservation_id(self):
+        return self._reservation_id
+
+    @property
+    def user_id(self):
+        return self._user_id
+
+    @property
+    def vehicle_id(self):
+        return self._vehicle_id
+
+    @property
+    def start_date(self):
+        return self._start_date
+
+    @property
+    def end_date(self):
+        return self._end_date
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def insurance_added(self):
+        return self._insurance_added
+
+    @property
+    def total_cost(self):
+        return self._total_cost
+
+    @property
+    def days(self):
+        return pricing.rental_days(self._start_date, self._end_date)
+
+    @property
+    def is_blocking(self):
+        """Pending and Active reservations hold the vehicle for their dates"""
+        return self._status in self.BLOCKING_STATUSES
+
+    def _values(self):
+        return (self._reservation_id, self._user_id, self._vehicle_id, self._start_date, self._end_date,
+                self._status, self._insurance_added, self._total_cost)
+
+    def __eq__(self, other):
+        if not isinstance(other, Reservation):
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Reservation({self._reservation_id}, {self._status}, {self._start_date} to {self._end_date})"
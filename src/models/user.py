@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
 
 class User(ABC):
+    __slots__ = ('_user_id', '_username', '_first_name', '_last_name', '_role')
+    # Columns user_from_row expects, in this order - never the password hash
+    COLUMNS = ('user_id', 'username', 'first_name', 'last_name', 'role')
+
     def __init__(self, user_id, username, first_name, last_name, role):
         self._user_id = user_id
         self._username = username
@@ -16,6 +20,14 @@ class User(ABC):
     def username(self):
         return self._username
 
+    @property
+    def first_name(self):
+        return self._first_name
+
+    @property
+    def last_name(self):
+        return self._last_name
+
     @property
     def full_name(self):
         return f"{self._first_name} {self._last_name}"
@@ -28,18 +40,46 @@ class User(ABC):
     def get_permissions(self):
         pass
 
+    def _values(self):
+        return (self._user_id, self._username, self._first_name, self._last_name, self._role)
+
+    def __eq__(self, other):
+        if not isinstance(other, User):
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._user_id}, {self._username!r})"
+
 class Receptionist(User):
+    __slots__ = ()
+
     def get_permissions(self):
         return ["manage_vehicles", "manage_users", "view_all_reservations"]
 
 class Worker(User):
+    __slots__ = ()
+
     def get_permissions(self):
         return ["update_logs", "view_returns"]
 
 class Member(User):
+    __slots__ = ()
+
     def get_permissions(self):
         return ["search_vehicles", "reserve_vehicle", "view_my_reservations"]
 
 class Admin(User):
+    __slots__ = ()
+
     def get_permissions(self):
         return ["all_access"]
+
+USER_ROLES = {'Receptionist': Receptionist, 'Worker': Worker, 'Member': Member, 'Admin': Admin}
+
+def user_from_row(row):
+    """User subclass instance, picked by the role column, from a row of User.COLUMNS"""
+    user_id, username, first_name, last_name, role = row
+    return USER_ROLES[role](user_id, username, first_name, last_name, role)
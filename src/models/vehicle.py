@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
+from src.utils import pricing
 
 class Vehicle(ABC):
+    # No per-instance __dict__: a list of 100k vehicles costs a fraction of the same rows as dicts
+    __slots__ = ('_vehicle_id', '_brand', '_model', '_year', '_license_plate', '_status', '_daily_rate')
+    # Columns vehicle_from_row expects, in this order - select these rather than SELECT *
+    COLUMNS = ('vehicle_id', 'brand', 'model', 'year', 'license_plate', 'type', 'status', 'daily_rate')
+
     def __init__(self, vehicle_id, brand, model, year, license_plate, status, daily_rate):
         self._vehicle_id = vehicle_id
         self._brand = brand
@@ -14,6 +20,22 @@ class Vehicle(ABC):
     def vehicle_id(self):
         return self._vehicle_id
 
+    @property
+    def brand(self):
+        return self._brand
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def year(self):
+        return self._year
+
+    @property
+    def license_plate(self):
+        return self._license_plate
+
     @property
     def description(self):
         return f"{self._year} {self._brand} {self._model}"
@@ -26,27 +48,53 @@ class Vehicle(ABC):
     def daily_rate(self):
         return self._daily_rate
 
+    @property
     @abstractmethod
-    def calculate_rental_cost(self, days):
+    def vehicle_type(self):
         pass
 
+    def calculate_rental_cost(self, days, insurance=False, equipment_rates=()):
+        return pricing.quote(self._daily_rate, self.vehicle_type, days, insurance, equipment_rates)
+
+    def _values(self):
+        return (self._vehicle_id, self._brand, self._model, self._year, self._license_plate,
+                self.vehicle_type, self._status, self._daily_rate)
+
+    def __eq__(self, other):
+        # Lets grids tell a changed vehicle from an unchanged one when a list is reloaded
+        if not isinstance(other, Vehicle):
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._vehicle_id}, {self.description!r})"
+
 class Car(Vehicle):
-    def calculate_rental_cost(self, days):
-        return self._daily_rate * days
+    __slots__ = ()
+    vehicle_type = 'Car'
 
 class Truck(Vehicle):
-    def calculate_rental_cost(self, days):
-        # Trucks might have a base fee + daily rate
-        return (self._daily_rate * days) + 500 
+    __slots__ = ()
+    # Trucks have a base fee + daily rate (see TYPE_BASE_FEES)
+    vehicle_type = 'Truck'
 
 class SUV(Vehicle):
-    def calculate_rental_cost(self, days):
-        return self._daily_rate * days
+    __slots__ = ()
+    vehicle_type = 'SUV'
 
 class Van(Vehicle):
-    def calculate_rental_cost(self, days):
-        return self._daily_rate * days
+    __slots__ = ()
+    vehicle_type = 'Van'
 
 class Motorcycle(Vehicle):
-    def calculate_rental_cost(self, days):
-        return self._daily_rate * days
+    __slots__ = ()
+    vehicle_type = 'Motorcycle'
+
+VEHICLE_TYPES = {cls.vehicle_type: cls for cls in (Car, Truck, SUV, Van, Motorcycle)}
+
+def vehicle_from_row(row):
+    """Vehicle subclass instance, picked by the type column, from a row of Vehicle.COLUMNS"""
+    vehicle_id, brand, model, year, license_plate, v_type, status, daily_rate = row
+    return VEHICLE_TYPES[v_type](vehicle_id, brand, model, year, license_plate, status, daily_rate)
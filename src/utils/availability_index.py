@@ -0,0 +1,230 @@
+import bisect
+import threading
+import time
+from datetime import date, timedelta
+
+
+class AvailabilityIndex:
+    """
+    In-memory index of the date ranges that block each vehicle.
+
+    Only Pending and Active reservations block a vehicle, so the index holds
+    just those. Each vehicle keeps a sorted list of (start, end, reservation_id)
+    for single-vehicle checks, and a global list sorted by start date answers
+    "which vehicles are busy between D1 and D2" with one bisect plus a scan
+    bounded by the longest booking seen. Date ranges are inclusive on both ends.
+
+    Equipment is tracked the same way, per equipment_id, but an item only runs
+    out when the number of bookings holding it on the same day reaches its
+    quantity in stock.
+    """
+
+    BLOCKING_STATUSES = ('Pending', 'Active')
+    UNRENTABLE_STATUSES = ('Maintenance',)
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # Held by whoever is rebuilding from the database (see RentalController._get_availability),
+        # so concurrent callers don't all run the reload queries
+        self.reload_lock = threading.Lock()
+        self._reset()
+        self.loaded_at = None
+
+    def _reset(self):
+        self._vehicles = {}       # vehicle_id -> (type, status)
+        self._by_type = {}        # type -> set of rentable vehicle_ids
+        self._rentable = set()
+        self._intervals = {}      # vehicle_id -> sorted [(start, end, reservation_id)]
+        self._starts = []         # sorted [(start, end, vehicle_id, reservation_id)]
+        self._reservations = {}   # reservation_id -> (start, end, vehicle_id)
+        self._max_span = timedelta(0)
+        self._stock = {}          # equipment_id -> quantity
+        self._equipment = {}      # equipment_id -> sorted [(start, end, reservation_id)]
+        self._reserved_equipment = {}  # reservation_id -> tuple of equipment_ids
+
+    def load(self, vehicles, reservations, equipment=(), reservation_equipment=()):
+        """
+        Rebuild from Vehicles rows (vehicle_id, type, status), blocking Reservations
+        rows, Equipment rows (equipment_id, quantity) and the Reservation_Equipment
+        rows of those reservations
+        """
+        with self._lock:
+            self._reset()
+            for v in vehicles:
+                self.set_vehicle(v['vehicle_id'], v['type'], v['status'])
+            for eq in equipment:
+                self._stock[eq['equipment_id']] = eq['quantity']
+
+            entries = []
+            for r in reservations:
+                start, end, vehicle_id = r['start_date'], r['end_date'], r['vehicle_id']
+                self._reservations[r['reservation_id']] = (start, end, vehicle_id)
+                self._intervals.setdefault(vehicle_id, []).append((start, end, r['reservation_id']))
+                entries.append((start, end, vehicle_id, r['reservation_id']))
+                self._max_span = max(self._max_span, end - start)
+
+            # Sorting once is much cheaper than inserting a million rows one by one
+            for row in reservation_equipment:
+                entry = self._reservations.get(row['reservation_id'])
+                if entry:
+                    self._reserved_equipment.setdefault(row['reservation_id'], ())
+                    self._reserved_equipment[row['reservation_id']] += (row['equipment_id'],)
+                    self._equipment.setdefault(row['equipment_id'], []).append((entry[0], entry[1], row['reservation_id']))
+
+            for intervals in self._intervals.values():
+                intervals.sort()
+            for intervals in self._equipment.values():
+                intervals.sort()
+            entries.sort()
+            self._starts = entries
+            self.loaded_at = time.monotonic()
+
+    @property
+    def is_loaded(self):
+        return self.loaded_at is not None
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded_at = None
+
+    # --- Vehicles ---
+    def set_vehicle(self, vehicle_id, v_type, status):
+        with self._lock:
+            old = self._vehicles.get(vehicle_id)
+            if old:
+                self._by_type.get(old[0], set()).discard(vehicle_id)
+                self._rentable.discard(vehicle_id)
+            self._vehicles[vehicle_id] = (v_type, status)
+            if status not in self.UNRENTABLE_STATUSES:
+                self._by_type.setdefault(v_type, set()).add(vehicle_id)
+                self._rentable.add(vehicle_id)
+
+    def set_vehicle_status(self, vehicle_id, status):
+        with self._lock:
+            if vehicle_id in self._vehicles:
+                self.set_vehicle(vehicle_id, self._vehicles[vehicle_id][0], status)
+
+    def remove_vehicle(self, vehicle_id):
+        with self._lock:
+            old = self._vehicles.pop(vehicle_id, None)
+            if old:
+                self._by_type.get(old[0], set()).discard(vehicle_id)
+                self._rentable.discard(vehicle_id)
+
+    # --- Equipment ---
+    def set_equipment_stock(self, equipment_id, quantity):
+        with self._lock:
+            self._stock[equipment_id] = quantity
+
+    # --- Reservations ---
+    def add_reservation(self, reservation_id, vehicle_id, start, end, equipment_ids=()):
+        with self._lock:
+            if reservation_id in self._reservations:
+                self.remove_reservation(reservation_id)
+            self._reservations[reservation_id] = (start, end, vehicle_id)
+            bisect.insort(self._intervals.setdefault(vehicle_id, []), (start, end, reservation_id))
+            bisect.insort(self._starts, (start, end, vehicle_id, reservation_id))
+            self._max_span = max(self._max_span, end - start)
+            if equipment_ids:
+                self._reserved_equipment[reservation_id] = tuple(equipment_ids)
+                for equipment_id in equipment_ids:
+                    bisect.insort(self._equipment.setdefault(equipment_id, []), (start, end, reservation_id))
+
+    def remove_reservation(self, reservation_id):
+        with self._lock:
+            entry = self._reservations.pop(reservation_id, None)
+            if not entry:
+                return
+            start, end, vehicle_id = entry
+            self._remove_sorted(self._intervals.get(vehicle_id, []), (start, end, reservation_id))
+            self._remove_sorted(self._starts, (start, end, vehicle_id, reservation_id))
+            for equipment_id in self._reserved_equipment.pop(reservation_id, ()):
+                self._remove_sorted(self._equipment.get(equipment_id, []), (start, end, reservation_id))
+            # _max_span is left as is - a larger bound only widens the scan, never misses an overlap
+
+    @staticmethod
+    def _remove_sorted(items, item):
+        i = bisect.bisect_left(items, item)
+        if i < len(items) and items[i] == item:
+            del items[i]
+
+    # --- Queries ---
+    def is_available(self, vehicle_id, start, end, ignore_reservation_id=None):
+        """True if no blocking reservation of this vehicle overlaps [start, end]"""
+        with self._lock:
+            intervals = self._intervals.get(vehicle_id, [])
+            # Intervals starting after `end` can't overlap; everything before is checked against its end date
+            hi = bisect.bisect_right(intervals, (end, date.max))
+            lo = bisect.bisect_left(intervals, (start - self._max_span,))
+            for s, e, rid in intervals[lo:hi]:
+                if e >= start and rid != ignore_reservation_id:
+                    return False
+            return True
+
+    def busy_vehicles(self, start, end):
+        """Set of vehicle_ids with a blocking reservation overlapping [start, end]"""
+        with self._lock:
+            lo = bisect.bisect_left(self._starts, (start - self._max_span,))
+            hi = bisect.bisect_right(self._starts, (end, date.max))
+            return {vehicle_id for s, e, vehicle_id, rid in self._starts[lo:hi] if e >= start}
+
+    def available_vehicles(self, start, end, vehicle_type=None):
+        """Set of rentable vehicle_ids that are free for the whole of [start, end]"""
+        with self._lock:
+            if vehicle_type and vehicle_type != "All":
+                candidates = self._by_type.get(vehicle_type, set())
+            else:
+                candidates = self._rentable
+            return candidates - self.busy_vehicles(start, end)
+
+    def equipment_in_use(self, equipment_id, start, end):
+        """Most units of this equipment booked on any single day of [start, end]"""
+        with self._lock:
+            intervals = self._equipment.get(equipment_id, [])
+            hi = bisect.bisect_right(intervals, (end, date.max))
+            lo = bisect.bisect_left(intervals, (start - self._max_span,))
+            return peak_overlap([(s, e) for s, e, rid in intervals[lo:hi] if e >= start], start, end)
+
+    def available_equipment(self, start, end):
+        """equipment_id -> units still free for the whole of [start, end]"""
+        with self._lock:
+            return {
+                equipment_id: max(quantity - self.equipment_in_use(equipment_id, start, end), 0)
+                for equipment_id, quantity in self._stock.items()
+            }
+
+
+def peak_overlap(intervals, start, end):
+    """
+    Largest number of (start, end) intervals covering the same day within
+    [start, end]. A sweep over start/end events, so it is O(n log n) in the
+    number of intervals rather than in the number of days.
+    """
+    events = []
+    for s, e in intervals:
+        s, e = max(s, start), min(e, end)
+        if s <= e:
+            events.append((s, 1))
+            # Ranges are inclusive, so the unit is free again the day after `e`
+            events.append((e + timedelta(days=1), -1))
+    events.sort()  # On the same day, releases (-1) sort before new bookings (+1)
+
+    peak = current = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_availability_index():
+    """Return the process-wide availability index (loaded by RentalController on first use)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = AvailabilityIndex()
+    return _index
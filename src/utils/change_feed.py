@@ -0,0 +1,69 @@
+from src.config import CHANGE_FEED_CONFIG
+
+
+class ChangePoller:
+    """
+    Polls a change feed from a dashboard and hands new changes to the Tk thread.
+
+    fetch_changes(since) runs on a TaskRunner worker and returns (position, changes);
+    on_changes(changes) is called on the Tk thread only when changes is non-empty.
+    Each poll is scheduled after the previous one finished, so a slow database
+    never piles up requests. reset(position) moves the cursor, e.g. after a
+    full reload that already shows everything up to position.
+    """
+    def __init__(self, runner, widget, fetch_changes, on_changes, interval=None):
+        self.runner = runner
+        self.widget = widget
+        self.fetch_changes = fetch_changes
+        self.on_changes = on_changes
+        self.interval = interval or CHANGE_FEED_CONFIG['poll_interval']
+        self.position = None
+        self._after_id = None
+        self._running = False
+        widget.bind("<Destroy>", lambda e: self.stop() if e.widget is widget else None, add="+")
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self._schedule()
+
+    def stop(self):
+        self._running = False
+        self.runner.cancel("events")
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def reset(self, position):
+        # Drop an in-flight poll - its changes are older than the reload that set position
+        self.runner.cancel("events")
+        self.position = position
+        if self._running and self._after_id is None:
+            self._schedule()
+
+    def _schedule(self):
+        if self._running:
+            self._after_id = self.widget.after(self.interval, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        if self.position is None:
+            # Nothing loaded yet; reset() is called once the first full load lands
+            self._schedule()
+            return
+        self.runner.submit(self.fetch_changes, self.position,
+                           on_success=self._on_result, on_error=self._on_error, key="events")
+
+    def _on_result(self, result):
+        position, changes = result
+        self.position = position
+        self._schedule()
+        if changes:
+            self.on_changes(changes)
+
+    def _on_error(self, err):
+        print(f"Change Feed Error: {err}")
+        self._schedule()
@@ -1,66 +1,6 @@
-from PIL import Image, ImageTk
-import os
+import math
 import tkinter as tk
 
-class ImageHelper:
-    _cache = {}
-
-    @staticmethod
-    def load_image(path, size=None):
-        """
-        Load an image from path, resize it if size is provided (width, height),
-        and return a ImageTk.PhotoImage. Caches the result.
-        """
-        cache_key = (path, size)
-        if cache_key in ImageHelper._cache:
-            return ImageHelper._cache[cache_key]
-
-        if not os.path.exists(path):
-            # Return a placeholder
-            img = Image.new('RGB', size if size else (100, 100), color='#bdc3c7')
-        else:
-            try:
-                img = Image.open(path)
-                if size:
-                    img = img.resize(size, Image.Resampling.LANCZOS)
-            except Exception as e:
-                print(f"Error loading image {path}: {e}")
-                img = Image.new('RGB', size if size else (100, 100), color='#e74c3c')
-
-        photo = ImageTk.PhotoImage(img)
-        ImageHelper._cache[cache_key] = photo
-        return photo
-
-    @staticmethod
-    def get_vehicle_image(model, size=(150, 100)):
-        """
-        Smart lookup for vehicle images based on model name.
-        """
-        base_path = os.path.join(os.path.dirname(__file__), "..", "img", "vehicles")
-        
-        # Clean model name for filename matching
-        clean_model = model.replace(" ", "")
-        
-        candidates = [
-            f"{model}.jpg", f"{model}.png",
-            f"{model.lower()}.jpg", f"{model.lower()}.png",
-            f"{clean_model}.jpg", f"{clean_model}.png",
-            f"{clean_model.lower()}.jpg", f"{clean_model.lower()}.png"
-        ]
-        
-        image_path = None
-        for c in candidates:
-            p = os.path.join(base_path, c)
-            if os.path.exists(p):
-                image_path = p
-                break
-        
-        if not image_path:
-            # Fallback to a default image if available, or just use the first candidate path (which will trigger placeholder)
-            image_path = os.path.join(base_path, "default.png")
-
-        return ImageHelper.load_image(image_path, size)
-
 class ScrollableFrame(tk.Frame):
     def __init__(self, parent, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
@@ -82,8 +22,10 @@ class ScrollableFrame(tk.Frame):
         
         self.canvas.bind("<Configure>", self._on_canvas_configure)
         
-        # Mousewheel scrolling
+        # Mousewheel scrolling - claimed again whenever the pointer enters, since views
+        # are kept alive and several scrollable frames can exist at once
         self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Enter>", lambda e: self.canvas.bind_all("<MouseWheel>", self._on_mousewheel))
 
     def _on_canvas_configure(self, event):
         self.canvas.itemconfig(self.canvas_window, width=event.width)
@@ -91,73 +33,487 @@ class ScrollableFrame(tk.Frame):
     def _on_mousewheel(self, event):
         self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
 
-class RoundedFrame(tk.Canvas):
+class ListDataSource:
+    """Data source for VirtualGrid over rows that are already in memory"""
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.on_change = None  # Set by VirtualGrid; called when rows arrive asynchronously
+
+    def count(self):
+        return len(self.rows)
+
+    def get(self, index):
+        return self.rows[index]
+
+    def has_more(self):
+        return False
+
+    def load_more(self):
+        pass
+
+    def patch(self, key, upserts=(), removed_keys=(), order=None):
+        """
+        Apply rows changed elsewhere in place: rows in upserts replace the loaded row
+        with the same key(row), rows with a key in removed_keys go. Rows not loaded
+        yet are inserted where order(row) puts them, rows being sorted by it
+        descending (appended without order); one that sorts past the last loaded
+        row is left for the page that will bring it.
+        """
+        changed = {key(row): row for row in upserts}
+        gone = set(removed_keys) - set(changed)
+        rows = []
+        for row in self.rows:
+            k = key(row)
+            if k in gone:
+                continue
+            rows.append(changed.pop(k, row))
+        for row in changed.values():
+            if order is None:
+                rows.append(row)
+                continue
+            position = next((i for i, other in enumerate(rows) if order(other) < order(row)), None)
+            if position is not None:
+                rows.insert(position, row)
+            elif not self.has_more():
+                rows.append(row)
+        self.rows = rows
+
+class PagedDataSource(ListDataSource):
+    """
+    Data source for VirtualGrid that pulls pages lazily from a controller.
+    fetch_page(cursor, limit) must return (rows, next_cursor) with next_cursor None
+    on the last page, like AdminController.get_reservations_page.
+
+    With a TaskRunner, pages are fetched on a worker thread and the grid is
+    refreshed when they arrive; without one they are fetched inline. Pass
+    first_page (an already fetched (rows, next_cursor)) to start from it.
+    """
+    def __init__(self, fetch_page, page_size=50, runner=None, runner_key=None, first_page=None):
+        super().__init__([])
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.runner = runner
+        self.runner_key = runner_key
+        self.loading = False
+        self._cursor = None
+        self._exhausted = False
+        if first_page is not None:
+            self._add_page(first_page)
+        else:
+            self.load_more()
+
+    def has_more(self):
+        return not self._exhausted
+
+    def load_more(self):
+        if self._exhausted or self.loading:
+            return
+        if self.runner is None:
+            self._add_page(self.fetch_page(self._cursor, self.page_size))
+            return
+
+        self.loading = True
+        self.runner.submit(self.fetch_page, self._cursor, self.page_size,
+                           on_success=self._on_page, on_error=self._on_error, key=self.runner_key)
+
+    def _on_page(self, page):
+        self.loading = False
+        self._add_page(page)
+        if self.on_change:
+            self.on_change()
+
+    def _on_error(self, error):
+        self.loading = False
+        self._exhausted = True
+        print(f"Failed to load page: {error}")
+        if self.on_change:
+            self.on_change()
+
+    def _add_page(self, page):
+        rows, self._cursor = page
+        self.rows.extend(rows)
+        if self._cursor is None:
+            self._exhausted = True
+
+class VirtualGrid(tk.Frame):
+    """
+    Scrollable card grid that only creates widgets for the rows in view (plus a small
+    buffer) and recycles them while scrolling, so thousands of rows cost the same as a screenful.
+
+    create_cell(parent) builds an empty card - a widget, or a CanvasCard drawn on
+    parent (the grid's canvas) - and bind_cell(cell, row) fills it with one row
+    from the data source. Cells are reused for different rows, so bind_cell must
+    overwrite everything it shows.
+    """
+    def __init__(self, parent, create_cell, bind_cell, cell_width, cell_height, columns=3, padding=10, buffer_rows=2, *args, **kwargs):
+        super().__init__(parent, *args, **kwargs)
+        self.create_cell = create_cell
+        self.bind_cell = bind_cell
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.columns = columns
+        self.padding = padding
+        self.buffer_rows = buffer_rows
+
+        self.data_source = ListDataSource([])
+        self._cells = {}   # item index -> (cell, canvas window id)
+        self._spare = []   # recycled (cell, canvas window id) parked off screen
+
+        self.canvas = tk.Canvas(self, bg=kwargs.get("bg", "white"), highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+
+        self.loading_label = tk.Label(self, text="Loading...", font=("Segoe UI", 12), bg=kwargs.get("bg", "white"), fg="#7f8c8d")
+
+        # Mousewheel scrolling - claimed whenever the pointer enters the grid
+        self.canvas.bind("<Enter>", lambda e: self.canvas.bind_all("<MouseWheel>", self._on_mousewheel))
+
+    @property
+    def row_height(self):
+        return self.cell_height + 2 * self.padding
+
+    def set_loading(self, loading=True):
+        """Show or hide a loading message over the grid"""
+        if loading:
+            self.loading_label.place(relx=0.5, rely=0.3, anchor="center")
+            self.loading_label.lift()
+        else:
+            self.loading_label.place_forget()
+
+    def set_data_source(self, data_source, keep_position=False):
+        """
+        Show rows from a new data source. With keep_position the scroll position is
+        kept and only cells whose row differs from the old source are rebound, so
+        refreshing a list that barely changed touches almost no widgets.
+        """
+        old = self.data_source
+        old.on_change = None
+        self.data_source = data_source
+        data_source.on_change = self.refresh
+
+        if keep_position:
+            for index, (cell, window) in list(self._cells.items()):
+                if index >= data_source.count():
+                    self._recycle(index)
+                elif index >= old.count() or old.get(index) != data_source.get(index):
+                    self.bind_cell(cell, data_source.get(index))
+        else:
+            # Every visible cell may now show a different row
+            for index in list(self._cells):
+                self._recycle(index)
+            self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def is_empty(self):
+        return self.data_source.count() == 0
+
+    def patch(self, key, upserts=(), removed_keys=(), order=None):
+        """
+        Apply a change set to the current data source (see ListDataSource.patch),
+        keeping loaded pages and the scroll position; only cells whose row changed
+        are rebound.
+        """
+        shown = {index: self.data_source.get(index) for index in self._cells}
+        self.data_source.patch(key, upserts, removed_keys, order)
+        for index, (cell, window) in list(self._cells.items()):
+            if index >= self.data_source.count():
+                self._recycle(index)
+            elif self.data_source.get(index) is not shown[index]:
+                self.bind_cell(cell, self.data_source.get(index))
+        self.refresh()
+
+    def refresh(self):
+        """Bind cells to whatever rows are currently in the viewport"""
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // self.row_height) - self.buffer_rows)
+        last_row = int(bottom // self.row_height) + self.buffer_rows
+
+        # Pull the next page once the viewport gets near the end of what is loaded
+        if self.data_source.has_more() and last_row * self.columns >= self.data_source.count():
+            self.data_source.load_more()
+
+        count = self.data_source.count()
+        if isinstance(self.data_source, PagedDataSource):
+            self.set_loading(self.data_source.loading and count == 0)
+        total_rows = -(-count // self.columns)
+        height = total_rows * self.row_height
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), height))
+
+        visible = range(first_row * self.columns, min(count, (last_row + 1) * self.columns))
+        for index in list(self._cells):
+            if index not in visible:
+                self._recycle(index)
+
+        for index in visible:
+            if index not in self._cells:
+                self._place(index)
+
+    def _place(self, index):
+        if self._spare:
+            cell, window = self._spare.pop()
+        else:
+            cell = self.create_cell(self.canvas)
+            # CanvasCards are already items on the canvas; widgets need a window item
+            window = None if isinstance(cell, CanvasCard) else self.canvas.create_window(0, 0, window=cell, anchor="nw")
+
+        row, col = divmod(index, self.columns)
+        x = self.padding + col * (self.cell_width + 2 * self.padding)
+        y = self.padding + row * self.row_height
+        self._move(cell, window, x, y)
+        self.bind_cell(cell, self.data_source.get(index))
+        self._cells[index] = (cell, window)
+
+    def _recycle(self, index):
+        cell, window = self._cells.pop(index)
+        self._move(cell, window, -10000, -10000)
+        self._spare.append((cell, window))
+
+    def _move(self, cell, window, x, y):
+        if window is None:
+            cell.move_to(x, y)
+        else:
+            self.canvas.coords(window, x, y)
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _on_mousewheel(self, event):
+        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        self.refresh()
+
+class KeyedCardGrid:
+    """
+    Cards laid out in a grid inside parent, one per row, updated by diffing rows
+    on key(row). Cards of unchanged rows are kept (and only re-gridded if they
+    moved), changed rows get a fresh card from create_card(parent, row) and cards
+    of rows that are gone are destroyed. For short lists; long ones use VirtualGrid.
+    """
+    def __init__(self, parent, create_card, key, columns=3, empty_text=None, padx=10, pady=10):
+        self.parent = parent
+        self.create_card = create_card
+        self.key = key
+        self.columns = columns
+        self.padx = padx
+        self.pady = pady
+        self._cards = {}  # key -> (card, row, grid position)
+        self.message_label = tk.Label(parent, font=("Segoe UI", 14), bg="white", fg="#7f8c8d")
+        self.empty_text = empty_text
+        self.rows = []
+
+    def set_loading(self):
+        """Show a loading message - only before the first rows arrive, later refreshes keep the old cards up"""
+        if not self._cards:
+            self.message_label.configure(text="Loading...", font=("Segoe UI", 12))
+            self.message_label.grid(row=0, column=0, columnspan=self.columns, pady=50)
+
+    def update(self, rows):
+        self.rows = list(rows)
+        cards = {}
+        for index, row in enumerate(self.rows):
+            k = self.key(row)
+            card, old_row, position = self._cards.pop(k, (None, None, None))
+            if card is not None and old_row != row:
+                card.destroy()
+                card = None
+            if card is None:
+                card, position = self.create_card(self.parent, row), None
+
+            new_position = divmod(index, self.columns)
+            if new_position != position:
+                card.grid(row=new_position[0], column=new_position[1], padx=self.padx, pady=self.pady)
+            cards[k] = (card, row, new_position)
+
+        # Whatever is left belongs to rows that are gone
+        for card, _, _ in self._cards.values():
+            card.destroy()
+        self._cards = cards
+
+        if not self.rows and self.empty_text:
+            self.message_label.configure(text=self.empty_text, font=("Segoe UI", 14))
+            self.message_label.grid(row=0, column=0, columnspan=self.columns, pady=50)
+        else:
+            self.message_label.grid_remove()
+
+    def patch(self, upserts=(), removed_keys=()):
+        """
+        Apply a change set instead of a full row list: rows in upserts replace the
+        row with the same key (or are appended), rows with a key in removed_keys go
+        """
+        changed = {self.key(row): row for row in upserts}
+        gone = set(removed_keys) - set(changed)
+        rows = []
+        for row in self.rows:
+            k = self.key(row)
+            if k in gone:
+                continue
+            rows.append(changed.pop(k, row))
+        rows.extend(changed.values())
+        self.update(rows)
+
+class ViewStack:
+    """
+    Keeps every content view of a dashboard alive after its first visit.
+    show() hides the current view with pack_forget and either builds the
+    requested one into a new frame or, if it was built before, packs it again
+    and calls its refresh function - no widgets are recreated on navigation.
+    """
+    def __init__(self, parent, bg="white"):
+        self.parent = parent
+        self.bg = bg
+        self.views = {}  # name -> frame
+        self.current = None
+
+    def show(self, name, build, refresh=None):
+        if self.current is not None and self.current != name:
+            self.views[self.current].pack_forget()
+
+        frame = self.views.get(name)
+        if frame is None:
+            frame = self.views[name] = tk.Frame(self.parent, bg=self.bg)
+            frame.pack(fill="both", expand=True)
+            build(frame)
+        else:
+            frame.pack(fill="both", expand=True)
+            if refresh:
+                refresh()
+        self.current = name
+        return frame
+
+_rounded_images = {}  # (width, height, radius, color, background) -> PhotoImage
+
+def rounded_rect_image(widget, width, height, radius, color, background):
+    """
+    Anti-aliased rounded rectangle as a PhotoImage, rendered once per
+    (size, radius, color, background) and shared by every widget that uses it.
+    Pure Tk, so the login window doesn't need PIL.
+    """
+    key = (width, height, radius, color, background)
+    image = _rounded_images.get(key)
+    if image is not None:
+        return image
+
+    image = tk.PhotoImage(master=widget, width=width, height=height)
+    image.put(color, to=(0, 0, width, height))
+
+    radius = max(0, min(radius, width // 2, height // 2))
+    fg = [c >> 8 for c in widget.winfo_rgb(color)]
+    bg = [c >> 8 for c in widget.winfo_rgb(background)]
+    for dy in range(radius):
+        row = []
+        for dx in range(radius):
+            # Share of the pixel inside the corner circle, estimated from its centre's distance
+            distance = math.hypot(radius - dx - 0.5, radius - dy - 0.5)
+            coverage = min(max(radius - distance + 0.5, 0.0), 1.0)
+            row.append('#%02x%02x%02x' % tuple(round(b + (f - b) * coverage) for f, b in zip(fg, bg)))
+        left = "{" + " ".join(row) + "}"
+        right = "{" + " ".join(reversed(row)) + "}"
+        image.put(left, to=(0, dy))
+        image.put(right, to=(width - radius, dy))
+        image.put(left, to=(0, height - 1 - dy))
+        image.put(right, to=(width - radius, height - 1 - dy))
+
+    _rounded_images[key] = image
+    return image
+
+def adjust_color(widget, color, amount):
+    """Lighten (positive amount) or darken a color"""
+    rgb = [c >> 8 for c in widget.winfo_rgb(color)]
+    return '#{:02x}{:02x}{:02x}'.format(*(min(255, max(0, c + amount)) for c in rgb))
+
+class CanvasCard:
+    """
+    A card drawn straight onto a shared canvas - a pre-rendered rounded background
+    plus text, image and button items - instead of a tree of widgets. VirtualGrid
+    moves and recycles these like widget cells, so a whole grid costs one canvas.
+
+    add_* return canvas item ids; change them with canvas.itemconfigure.
+    """
+    def __init__(self, canvas, width, height, corner_radius, bg_color):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.bg_color = bg_color
+        self.tag = f"card-{id(self)}"
+        self.x = self.y = 0
+        self.images = {}  # item id -> PhotoImage shown there, kept alive while shown
+        background = rounded_rect_image(canvas, width, height, corner_radius, bg_color, canvas.cget("bg"))
+        canvas.create_image(0, 0, image=background, anchor="nw", tags=self.tag)
+
+    def add_text(self, x, y, anchor="n", **options):
+        return self.canvas.create_text(self.x + x, self.y + y, anchor=anchor, tags=self.tag, **options)
+
+    def add_image(self, x, y, anchor="n"):
+        return self.canvas.create_image(self.x + x, self.y + y, anchor=anchor, tags=self.tag)
+
+    def set_image(self, item, image):
+        self.canvas.itemconfigure(item, image=image or "")
+        self.images[item] = image
+
+    def add_button(self, x, y, width, height, corner_radius, bg_color, fg_color, text, anchor="n", font=("Segoe UI", 10, "bold")):
+        """Rounded button drawn as two items; set the returned button's .command to handle clicks"""
+        return CanvasButton(self, x, y, width, height, corner_radius, bg_color, fg_color, text, anchor, font)
+
+    def move_to(self, x, y):
+        self.canvas.move(self.tag, x - self.x, y - self.y)
+        self.x, self.y = x, y
+
+class CanvasButton:
+    def __init__(self, card, x, y, width, height, corner_radius, bg_color, fg_color, text, anchor, font):
+        canvas = card.canvas
+        self.command = None
+        self.tag = f"button-{id(self)}"
+        self.image = rounded_rect_image(canvas, width, height, corner_radius, bg_color, card.bg_color)
+        self.hover_image = rounded_rect_image(canvas, width, height, corner_radius, adjust_color(canvas, bg_color, 20), card.bg_color)
+
+        self.background = canvas.create_image(card.x + x, card.y + y, image=self.image, anchor=anchor, tags=(card.tag, self.tag))
+        x0, y0, x1, y1 = canvas.bbox(self.background)
+        canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2, text=text, fill=fg_color, font=font, tags=(card.tag, self.tag))
+
+        canvas.tag_bind(self.tag, "<Button-1>", lambda e: self.command and self.command())
+        canvas.tag_bind(self.tag, "<Enter>", lambda e: canvas.itemconfigure(self.background, image=self.hover_image))
+        canvas.tag_bind(self.tag, "<Leave>", lambda e: canvas.itemconfigure(self.background, image=self.image))
+
+class RoundedFrame(tk.Label):
+    """
+    Rounded card: a Label showing a cached rounded-rectangle image, with
+    inner_frame centred on top for the content. One light widget instead of
+    a canvas holding a smoothed polygon.
+    """
     def __init__(self, parent, width, height, corner_radius, bg_color, **kwargs):
-        super().__init__(parent, width=width, height=height, highlightthickness=0, bg=parent.cget("bg"), **kwargs)
+        background = parent.cget("bg")
+        self.background_image = rounded_rect_image(parent, width, height, corner_radius, bg_color, background)
+        super().__init__(parent, image=self.background_image, bg=background, bd=0, highlightthickness=0, padx=0, pady=0, **kwargs)
         self.corner_radius = corner_radius
         self.bg_color = bg_color
         self.width = width
         self.height = height
-        
-        # Draw the rounded background
-        self.round_rect = self._draw_rounded_rect(0, 0, width, height, corner_radius, bg_color)
-        
+
         # Container for widgets
         self.inner_frame = tk.Frame(self, bg=bg_color)
-        self.create_window((width/2, height/2), window=self.inner_frame, anchor="center")
-
-    def _draw_rounded_rect(self, x, y, w, h, r, color):
-        points = [
-            x+r, y,
-            x+w-r, y,
-            x+w, y,
-            x+w, y+r,
-            x+w, y+h-r,
-            x+w, y+h,
-            x+w-r, y+h,
-            x+r, y+h,
-            x, y+h,
-            x, y+h-r,
-            x, y+r,
-            x, y
-        ]
-        return self.create_polygon(points, smooth=True, fill=color)
-
-class RoundedButton(tk.Canvas):
+        self.inner_frame.place(relx=0.5, rely=0.5, anchor="center")
+
+class RoundedButton(tk.Label):
+    """Rounded button: the text drawn over a cached rounded-rectangle image on a single Label"""
     def __init__(self, parent, width, height, corner_radius, bg_color, fg_color, text, command=None, font=("Segoe UI", 10, "bold"), **kwargs):
-        super().__init__(parent, width=width, height=height, highlightthickness=0, bg=parent.cget("bg"), **kwargs)
+        background = parent.cget("bg")
+        self.image = rounded_rect_image(parent, width, height, corner_radius, bg_color, background)
+        self.hover_image = rounded_rect_image(parent, width, height, corner_radius, adjust_color(parent, bg_color, 20), background)
+        super().__init__(parent, image=self.image, text=text, compound="center", fg=fg_color, font=font,
+                         bg=background, bd=0, highlightthickness=0, padx=0, pady=0, cursor="hand2", **kwargs)
         self.command = command
         self.bg_color = bg_color
         self.fg_color = fg_color
         
-        self.rect = self._draw_rounded_rect(0, 0, width, height, corner_radius, bg_color)
-        self.text = self.create_text(width/2, height/2, text=text, fill=fg_color, font=font)
-        
         self.bind("<Button-1>", self._on_click)
         self.bind("<Enter>", self._on_enter)
         self.bind("<Leave>", self._on_leave)
-        
-        # Bind click on text as well
-        self.tag_bind(self.text, "<Button-1>", self._on_click)
-        self.tag_bind(self.text, "<Enter>", self._on_enter)
-        self.tag_bind(self.text, "<Leave>", self._on_leave)
-
-    def _draw_rounded_rect(self, x, y, w, h, r, color):
-        points = [
-            x+r, y,
-            x+w-r, y,
-            x+w, y,
-            x+w, y+r,
-            x+w, y+h-r,
-            x+w, y+h,
-            x+w-r, y+h,
-            x+r, y+h,
-            x, y+h,
-            x, y+h-r,
-            x, y+r,
-            x, y
-        ]
-        return self.create_polygon(points, smooth=True, fill=color)
 
     def _on_click(self, event):
         if self.command:
@@ -165,17 +521,7 @@ class RoundedButton(tk.Canvas):
 
     def _on_enter(self, event):
         # Lighten the color slightly
-        self.itemconfig(self.rect, fill=self._adjust_color(self.bg_color, 20))
+        self.configure(image=self.hover_image)
 
     def _on_leave(self, event):
-        self.itemconfig(self.rect, fill=self.bg_color)
-
-    def _adjust_color(self, hex_color, amount):
-        # Simple color adjustment
-        try:
-            hex_color = hex_color.lstrip('#')
-            rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            new_rgb = tuple(min(255, max(0, c + amount)) for c in rgb)
-            return '#{:02x}{:02x}{:02x}'.format(*new_rgb)
-        except:
-            return hex_color
+        self.configure(image=self.image)
@@ -1,24 +1,183 @@
 from PIL import Image, ImageTk
+from collections import OrderedDict
+import hashlib
 import os
+import threading
+import time
+from src.config import IMAGE_CACHE_CONFIG
+
+VEHICLE_IMAGE_DIR = os.path.join(os.path.dirname(__file__), "..", "img", "vehicles")
+
+class VehicleImageResolver:
+    """
+    Maps vehicle model names to image files.
+    The folder is scanned once into an index of normalized name -> path, and only
+    rescanned when its mtime changes. The mtime itself is checked at most once per
+    check_interval, so resolving images for a whole grid costs no filesystem calls.
+    """
+    EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+    def __init__(self, directory, check_interval=5.0):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._index = {}
+        self._dir_mtime = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(name):
+        """'Click 125i', 'click-125i' and 'Click125i' all become 'click125i'"""
+        return ''.join(ch for ch in name.lower() if ch.isalnum())
+
+    def resolve(self, model):
+        """Path of the image for this model, or "" if there is none"""
+        if self._checked_at is None or time.monotonic() - self._checked_at > self.check_interval:
+            self._refresh()
+        return self._index.get(self.normalize(model or ""), "")
+
+    def _refresh(self):
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.directory).st_mtime_ns
+            except OSError:
+                self._index, self._dir_mtime = {}, None
+                return
+            if mtime == self._dir_mtime:
+                return
+
+            index = {}
+            # Sorted so .jpg wins over .png for the same model, as the old lookup did
+            for filename in sorted(os.listdir(self.directory), key=lambda f: (f.lower().endswith('.png'), f)):
+                stem, ext = os.path.splitext(filename)
+                if ext.lower() in self.EXTENSIONS:
+                    index.setdefault(self.normalize(stem), os.path.join(self.directory, filename))
+            self._index = index
+            self._dir_mtime = mtime
 
 class ImageHelper:
+    """
+    The one image service used by every dashboard.
+
+    Resized PhotoImages are kept in an LRU bounded by decoded size, and every
+    resized thumbnail is also written to an on-disk cache keyed by source path,
+    mtime and target size, so each source JPEG is decoded and resized once
+    rather than once per card.
+    """
+    _memory_cache = OrderedDict()  # (path, size) -> (PhotoImage, bytes)
+    _memory_bytes = 0
+    _stats = {'memory_hits': 0, 'memory_misses': 0, 'disk_hits': 0, 'disk_misses': 0, 'evictions': 0}
+    _resolver = VehicleImageResolver(VEHICLE_IMAGE_DIR, IMAGE_CACHE_CONFIG['index_check_interval'])
+
+    @staticmethod
+    def get_image_path(model):
+        """Image file for a vehicle model, or "" if there is none"""
+        return ImageHelper._resolver.resolve(model)
+
     @staticmethod
     def load_resized_image(path, size=(150, 100)):
         """
-        Loads an image from the path, resizes it to the specified size,
-        and returns a ImageTk.PhotoImage object.
-        If the image is not found, returns None or a placeholder if you have one.
+        Loads an image from the path, resized to the specified size, and returns
+        a ImageTk.PhotoImage object. If the image is not found, returns None so
+        the UI can handle it (e.g. show text).
         """
-        if not os.path.exists(path):
-            # You might want to return a default placeholder image here
-            # For now, we'll just return None so the UI can handle it (e.g. show text)
+        key = (path, tuple(size))
+        cached = ImageHelper._memory_cache.get(key)
+        if cached:
+            ImageHelper._memory_cache.move_to_end(key)
+            ImageHelper._stats['memory_hits'] += 1
+            return cached[0]
+        ImageHelper._stats['memory_misses'] += 1
+
+        if not path or not os.path.exists(path):
             return None
-            
+
         try:
-            img = Image.open(path)
-            # Resize using LANCZOS for high quality downsampling
-            img = img.resize(size, Image.Resampling.LANCZOS)
-            return ImageTk.PhotoImage(img)
+            img = ImageHelper._load_thumbnail(path, tuple(size))
+            photo = ImageTk.PhotoImage(img)
         except Exception as e:
             print(f"Error loading image {path}: {e}")
             return None
+
+        ImageHelper._remember(key, photo, size[0] * size[1] * 4)
+        return photo
+
+    @staticmethod
+    def load_image(path, size=(100, 100)):
+        """Like load_resized_image, but returns a grey placeholder instead of None"""
+        photo = ImageHelper.load_resized_image(path, size)
+        if photo is None:
+            key = ('<placeholder>', tuple(size))
+            cached = ImageHelper._memory_cache.get(key)
+            if cached:
+                return cached[0]
+            photo = ImageTk.PhotoImage(Image.new('RGB', size, color='#bdc3c7'))
+            ImageHelper._remember(key, photo, size[0] * size[1] * 4)
+        return photo
+
+    @staticmethod
+    def get_vehicle_image(model, size=(150, 100)):
+        """
+        Smart lookup for vehicle images based on model name.
+        """
+        return ImageHelper.load_image(ImageHelper.get_image_path(model), size)
+
+    @staticmethod
+    def get_cache_stats():
+        stats = dict(ImageHelper._stats)
+        stats['memory_items'] = len(ImageHelper._memory_cache)
+        stats['memory_bytes'] = ImageHelper._memory_bytes
+        lookups = stats['memory_hits'] + stats['memory_misses']
+        stats['memory_hit_rate'] = stats['memory_hits'] / lookups if lookups else 0.0
+        return stats
+
+    @staticmethod
+    def clear_memory_cache():
+        ImageHelper._memory_cache.clear()
+        ImageHelper._memory_bytes = 0
+
+    @staticmethod
+    def _remember(key, photo, nbytes):
+        cache = ImageHelper._memory_cache
+        cache[key] = (photo, nbytes)
+        ImageHelper._memory_bytes += nbytes
+
+        # Evict least recently used images; labels still showing them keep their own reference
+        limit = IMAGE_CACHE_CONFIG['memory_limit_mb'] * 1024 * 1024
+        while ImageHelper._memory_bytes > limit and len(cache) > 1:
+            _, (_, evicted_bytes) = cache.popitem(last=False)
+            ImageHelper._memory_bytes -= evicted_bytes
+            ImageHelper._stats['evictions'] += 1
+
+    @staticmethod
+    def _load_thumbnail(path, size):
+        """Resized PIL image, read from the disk cache when a thumbnail for this path+mtime+size exists"""
+        cache_dir = IMAGE_CACHE_CONFIG['disk_cache_dir']
+        stat = os.stat(path)
+        digest = hashlib.sha1(f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{size[0]}x{size[1]}".encode('utf-8')).hexdigest()
+        thumb_path = os.path.join(cache_dir, f"{digest}.png")
+
+        if os.path.exists(thumb_path):
+            try:
+                img = Image.open(thumb_path)
+                img.load()
+                ImageHelper._stats['disk_hits'] += 1
+                return img
+            except Exception:
+                pass  # Corrupt thumbnail - regenerate below
+        ImageHelper._stats['disk_misses'] += 1
+
+        img = Image.open(path)
+        # Resize using LANCZOS for high quality downsampling
+        img = img.resize(size, Image.Resampling.LANCZOS)
+
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temp file first so a crash never leaves a half-written thumbnail
+            tmp_path = f"{thumb_path}.{os.getpid()}.tmp"
+            img.save(tmp_path, "PNG")
+            os.replace(tmp_path, thumb_path)
+        except OSError as e:
+            print(f"Could not write thumbnail cache {thumb_path}: {e}")
+        return img
@@ -0,0 +1,49 @@
+import bcrypt
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.config import AUTH_CONFIG
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_hash_executor():
+    """
+    Worker pool every bcrypt call in the app goes through (see AuthController).
+    bcrypt releases the GIL while hashing, so this scales with cores; hash_workers
+    caps how many hashes run at once however many callers are waiting.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=AUTH_CONFIG['hash_workers'], thread_name_prefix="bcrypt")
+    return _executor
+
+def hash_password(password, rounds=None):
+    salt = bcrypt.gensalt(rounds=rounds or AUTH_CONFIG['bcrypt_rounds'])
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+def check_password(password, password_hash):
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    except ValueError:
+        # Malformed hash in the database
+        return False
+
+def get_rounds(password_hash):
+    """Cost factor stored in a bcrypt hash like $2b$12$..."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+def needs_rehash(password_hash):
+    return get_rounds(password_hash) != AUTH_CONFIG['bcrypt_rounds']
+
+def hash_password_async(password):
+    """Hash on the bcrypt pool; returns a Future whose result() is the hash or raises the hashing error"""
+    return get_hash_executor().submit(hash_password, password)
+
+def check_password_async(password, password_hash):
+    """Verify on the bcrypt pool; returns a Future whose result() is whether it matched"""
+    return get_hash_executor().submit(check_password, password, password_hash)
@@ -0,0 +1,64 @@
+"""
+The one place rental prices are computed.
+
+    total = days * (daily_rate + equipment per day + insurance per day) + type base fee
+
+quote() prices a single booking; quote_many() prices whole columns of bookings
+at once with NumPy for comparison screens and re-pricing jobs. Both use the
+same formula, so a booking always costs what it was quoted.
+"""
+import numpy as np
+
+INSURANCE_DAILY_FEE = 500
+# One-off fee added per rental, by vehicle type
+TYPE_BASE_FEES = {'Truck': 500}
+
+
+def rental_days(start_date, end_date):
+    """Billable days between two dates - same-day rentals count as one day"""
+    return max((end_date - start_date).days, 1)
+
+
+def quote(daily_rate, vehicle_type, days, insurance=False, equipment_rates=()):
+    """Total cost of one rental"""
+    per_day = float(daily_rate) + sum(float(rate) for rate in equipment_rates)
+    if insurance:
+        per_day += INSURANCE_DAILY_FEE
+    return round(days * per_day + TYPE_BASE_FEES.get(vehicle_type, 0), 2)
+
+
+def base_fees(vehicle_types):
+    """Array of the base fee for each vehicle type"""
+    return np.array([TYPE_BASE_FEES.get(t, 0) for t in vehicle_types], dtype=np.float64)
+
+
+def equipment_daily_totals(equipment_sets, equipment_rates):
+    """
+    Per-day equipment cost of each booking.
+    equipment_sets is a list of equipment_id collections, equipment_rates maps
+    equipment_id -> daily rate. Built as a 0/1 selection matrix times the rate
+    vector, so it is one matrix product however many bookings there are.
+    """
+    ids = list(equipment_rates)
+    if not ids:
+        return np.zeros(len(equipment_sets))
+    column = {equipment_id: i for i, equipment_id in enumerate(ids)}
+    selected = np.zeros((len(equipment_sets), len(ids)))
+    for row, equipment_ids in enumerate(equipment_sets):
+        for equipment_id in equipment_ids:
+            if equipment_id in column:
+                selected[row, column[equipment_id]] = 1
+    return selected @ np.array([float(equipment_rates[i]) for i in ids])
+
+
+def quote_many(daily_rates, vehicle_types, days, insurance=False, equipment_daily=0):
+    """
+    Vectorized quote(). daily_rates, vehicle_types and days are sequences of the
+    same length; insurance and equipment_daily may be sequences or scalars that
+    apply to every row. Returns a float64 array of totals.
+    """
+    per_day = (np.asarray(daily_rates, dtype=np.float64)
+               + np.asarray(equipment_daily, dtype=np.float64)
+               + np.asarray(insurance, dtype=bool) * INSURANCE_DAILY_FEE)
+    totals = np.asarray(days, dtype=np.float64) * per_day + base_fees(vehicle_types)
+    return np.round(totals, 2)
@@ -0,0 +1,63 @@
+import threading
+import time
+from src.config import REFERENCE_CACHE_CONFIG
+
+
+class ReferenceCache:
+    """
+    Read-through cache for reference data that rarely changes (equipment list,
+    vehicle daily rates). Each entry is loaded on first use, kept for `ttl`
+    seconds so changes made from other counters are picked up eventually, and
+    can be dropped early with invalidate() when this process changes the data.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}  # key -> (value, loaded_at)
+        self._lock = threading.Lock()
+        self._stats = {}    # key -> {'hits': n, 'misses': n}
+
+    def get(self, key, loader):
+        """Cached value for key, calling loader() to (re)load it when missing or expired"""
+        with self._lock:
+            stats = self._stats.setdefault(key, {'hits': 0, 'misses': 0})
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[1] < self.ttl:
+                stats['hits'] += 1
+                return entry[0]
+            stats['misses'] += 1
+            # Loading under the lock means concurrent misses trigger one query, not one each
+            value = loader()
+            self._entries[key] = (value, time.monotonic())
+            return value
+
+    def invalidate(self, key=None):
+        """Drop one entry, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_stats(self):
+        """Per-key hits, misses and hit rate"""
+        with self._lock:
+            stats = {}
+            for key, counts in self._stats.items():
+                lookups = counts['hits'] + counts['misses']
+                stats[key] = dict(counts, hit_rate=counts['hits'] / lookups if lookups else 0.0)
+            return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_reference_cache():
+    """Return the process-wide reference data cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReferenceCache(REFERENCE_CACHE_CONFIG['ttl'])
+    return _cache
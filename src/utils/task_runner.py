@@ -0,0 +1,108 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.config import TASK_CONFIG
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Worker pool shared by every TaskRunner"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=TASK_CONFIG['max_workers'], thread_name_prefix="ui-task")
+    return _executor
+
+class TaskRunner:
+    """
+    Runs slow calls (controllers, database) on worker threads and delivers the
+    results back on the Tk main thread by polling a queue with after().
+
+    Tasks can be grouped under a key, e.g. "content" for whatever fills a
+    dashboard's content area. Submitting a new task for a key, or calling
+    cancel(key), makes the previous task for that key stale: it is cancelled if
+    it hasn't started yet and its result is dropped if it has.
+    """
+    def __init__(self, widget):
+        self.widget = widget
+        self.poll_interval = TASK_CONFIG['poll_interval']
+        self._results = queue.Queue()
+        self._generations = {}  # key -> generation of the latest task
+        self._futures = {}      # key -> future of the latest task
+        self._pending = 0
+        self._after_id = None
+        self._closed = False
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def submit(self, fn, *args, on_success=None, on_error=None, key=None, **kwargs):
+        """Run fn(*args, **kwargs) in the background, then on_success(result) or on_error(exc) on the Tk thread"""
+        if self._closed:
+            return None
+        generation = self._bump(key)
+        future = get_executor().submit(fn, *args, **kwargs)
+        if key is not None:
+            self._futures[key] = future
+        self._pending += 1
+        future.add_done_callback(lambda f: self._results.put((key, generation, f, on_success, on_error)))
+        self._schedule_poll()
+        return future
+
+    def cancel(self, key):
+        """Drop the result of the latest task submitted under key"""
+        self._bump(key)
+
+    def _bump(self, key):
+        if key is None:
+            return None
+        old = self._futures.pop(key, None)
+        if old:
+            old.cancel()  # Only succeeds if the task hasn't started yet
+        self._generations[key] = self._generations.get(key, 0) + 1
+        return self._generations[key]
+
+    def _schedule_poll(self):
+        if self._after_id is None and not self._closed:
+            self._after_id = self.widget.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        while not self._closed:
+            try:
+                key, generation, future, on_success, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+
+            # Stale: a newer task was submitted for the same key or it was cancelled
+            if future.cancelled() or (key is not None and self._generations.get(key) != generation):
+                continue
+            if key is not None and self._futures.get(key) is future:
+                del self._futures[key]
+
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                else:
+                    print(f"Background task failed: {error}")
+            elif on_success:
+                on_success(future.result())
+
+        if self._pending > 0:
+            self._schedule_poll()
+
+    def _on_destroy(self, event):
+        if event.widget is not self.widget:
+            return
+        self._closed = True
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
@@ -1,22 +1,34 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+from datetime import date, timedelta
 from src.controllers.admin_controller import AdminController
 from src.controllers.rental_controller import RentalController
-from src.utils.gui_helpers import RoundedFrame, RoundedButton, ScrollableFrame
+from src.database import query_stats
+from src.utils.gui_helpers import RoundedFrame, RoundedButton, VirtualGrid, ListDataSource, PagedDataSource, ViewStack, CanvasCard
 from src.utils.image_helper import ImageHelper
-import os
+from src.utils.task_runner import TaskRunner
+from src.utils.change_feed import ChangePoller
 
 class AdminDashboard(tk.Frame):
+    RESERVATIONS_PAGE_SIZE = 60
+
     def __init__(self, parent, user, logout_callback):
         super().__init__(parent)
         self.user = user
         self.logout_callback = logout_callback
         self.controller = AdminController()
         self.rental_controller = RentalController()
+        self.tasks = TaskRunner(self)
+        # Bookings, approvals and returns made elsewhere refresh the view on screen
+        self.changes = ChangePoller(self.tasks, self, self.rental_controller.get_reservation_changes,
+                                    self.on_reservation_changes)
         self.pack(fill="both", expand=True)
         
         self.create_layout()
         self.show_overview_view()
+        self.tasks.submit(self.rental_controller.get_latest_event_id, on_success=self.changes.reset,
+                          on_error=lambda e: print(f"Change Feed Error: {e}"))
+        self.changes.start()
 
     def create_layout(self):
         # Top Bar
@@ -46,107 +58,139 @@ class AdminDashboard(tk.Frame):
         self.create_sidebar_button("Reservations", self.show_reservations_view)
         self.create_sidebar_button("Analytics", self.show_analytics_view)
         self.create_sidebar_button("User Management", self.show_users_view)
+        self.create_sidebar_button("Diagnostics", self.show_diagnostics_view)
 
         # Content Area
         self.content_area = tk.Frame(self.main_container, bg="white")
         self.content_area.pack(side="left", fill="both", expand=True, padx=20, pady=20)
+        self.views = ViewStack(self.content_area)
 
     def create_sidebar_button(self, text, command):
         btn = RoundedButton(self.side_bar, width=180, height=40, corner_radius=10, bg_color="#34495e", fg_color="white", text=text, command=command)
         btn.pack(pady=5)
 
-    def clear_content(self):
-        for widget in self.content_area.winfo_children():
-            widget.destroy()
+    def show_view(self, title, setup, refresh):
+        """Switch the content area to a view: built by setup(frame) on the first visit, refreshed afterwards"""
+        # Results still in flight for the old view are no longer wanted
+        self.tasks.cancel("content")
+
+        def build(frame):
+            tk.Label(frame, text=title, font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
+            setup(frame)
+
+        self.views.show(title, build, refresh)
+
+    def show_load_error(self, error):
+        messagebox.showerror("Error", f"Could not load data: {error}")
+
+    def show_action_error(self, error):
+        messagebox.showerror("Error", str(error))
+
+    def on_reservation_changes(self, rows):
+        # Only the view on screen is refreshed; the others refresh when they are shown again
+        if self.views.current == "Overview":
+            self.load_stats()
+        elif self.views.current == "Reservations":
+            # Patched into the pages already loaded, so paging and scroll position survive
+            status = self.res_loaded_status
+            matching = [row for row in rows if status == "All" or row['status'] == status]
+            self.res_grid.patch(lambda r: r['reservation_id'], upserts=matching,
+                                removed_keys=[row['reservation_id'] for row in rows if row not in matching],
+                                order=lambda r: (r['created_at'], r['reservation_id']))
 
     # --- Overview View ---
     def show_overview_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="Overview", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.overview_frame = tk.Frame(self.content_area, bg="white")
-        self.overview_frame.pack(fill="both", expand=True)
-        self.setup_overview_view()
+        self.show_view("Overview", self.setup_overview_view, self.load_stats)
 
-    def setup_overview_view(self):
-        stats = self.controller.get_dashboard_stats()
-        
+    def setup_overview_view(self, frame):
+        self.overview_frame = frame
         container = tk.Frame(self.overview_frame, bg="white")
         container.pack(fill="both", expand=True, padx=20, pady=20)
 
-        # Stat Cards
-        self.create_stat_card(container, "Total Earnings", f"₱{stats['total_earnings']:,.2f}", "#27ae60", 0, 0)
-        self.create_stat_card(container, "Active Rentals", str(stats['active_rentals']), "#3498db", 0, 1)
-        self.create_stat_card(container, "Total Users", str(stats['total_users']), "#f39c12", 0, 2)
-        self.create_stat_card(container, "Total Vehicles", str(stats['total_vehicles']), "#8e44ad", 0, 3)
+        # Stat Cards - built once, the values are filled in by load_stats
+        self.stat_labels = {
+            'total_earnings': self.create_stat_card(container, "Total Earnings", "#27ae60", 0, 0),
+            'active_rentals': self.create_stat_card(container, "Active Rentals", "#3498db", 0, 1),
+            'total_users': self.create_stat_card(container, "Total Users", "#f39c12", 0, 2),
+            'total_vehicles': self.create_stat_card(container, "Total Vehicles", "#8e44ad", 0, 3)
+        }
 
-        tk.Button(self.overview_frame, text="Refresh Data", command=self.show_overview_view, bg="#34495e", fg="white", relief="flat", pady=10).pack(pady=20)
+        tk.Button(self.overview_frame, text="Refresh Data", command=self.load_stats, bg="#34495e", fg="white", relief="flat", pady=10).pack(pady=20)
+        self.load_stats()
 
-    def create_stat_card(self, parent, title, value, color, row, col):
+    def load_stats(self):
+        self.tasks.submit(self.controller.get_dashboard_stats, on_success=self.show_stats, on_error=self.show_load_error, key="content")
+
+    def show_stats(self, stats):
+        self.stat_labels['total_earnings'].configure(text=f"₱{stats['total_earnings']:,.2f}")
+        for key in ('active_rentals', 'total_users', 'total_vehicles'):
+            self.stat_labels[key].configure(text=str(stats[key]))
+
+    def create_stat_card(self, parent, title, color, row, col):
+        """Stat card showing '...' until loaded; returns the value label"""
         card = RoundedFrame(parent, width=250, height=150, corner_radius=20, bg_color=color)
         card.grid(row=row, column=col, padx=15, pady=15)
         
         tk.Label(card.inner_frame, text=title, bg=color, fg="white", font=("Segoe UI", 14)).pack(pady=(20, 10))
-        tk.Label(card.inner_frame, text=value, bg=color, fg="white", font=("Segoe UI", 24, "bold")).pack()
+        value_label = tk.Label(card.inner_frame, text="...", bg=color, fg="white", font=("Segoe UI", 24, "bold"))
+        value_label.pack()
+        return value_label
 
     # --- Fleet Management View ---
     def show_fleet_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="Fleet Management", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.fleet_frame = tk.Frame(self.content_area, bg="white")
-        self.fleet_frame.pack(fill="both", expand=True)
-        self.setup_fleet_view()
+        self.show_view("Fleet Management", self.setup_fleet_view, self.load_fleet)
 
-    def setup_fleet_view(self):
+    def setup_fleet_view(self, frame):
+        self.fleet_frame = frame
         # Add Vehicle Button
         RoundedButton(self.fleet_frame, width=200, height=40, corner_radius=10, bg_color="#27ae60", fg_color="white", 
                       text="+ Add New Vehicle", command=self.show_add_vehicle_popup).pack(fill="x", padx=20, pady=10)
 
-        self.fleet_scroll = ScrollableFrame(self.fleet_frame)
-        self.fleet_scroll.pack(fill="both", expand=True, padx=10)
+        self.fleet_grid = VirtualGrid(self.fleet_frame, self.create_fleet_card, self.bind_fleet_card,
+                                      cell_width=280, cell_height=240, columns=3, bg="white")
+        self.fleet_grid.pack(fill="both", expand=True, padx=10)
         self.load_fleet()
 
     def load_fleet(self):
-        for widget in self.fleet_scroll.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        vehicles = self.rental_controller.get_all_vehicles()
-        
-        columns = 3
-        row = 0
-        col = 0
+        if self.fleet_grid.is_empty():
+            self.fleet_grid.set_loading()
 
-        for v in vehicles:
-            self.create_fleet_card(v, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+        def on_loaded(vehicles):
+            self.fleet_grid.set_loading(False)
+            # Only cards whose vehicle changed are rebound
+            self.fleet_grid.set_data_source(ListDataSource(vehicles), keep_position=True)
 
-    def create_fleet_card(self, vehicle, row, col):
-        card = RoundedFrame(self.fleet_scroll.scrollable_frame, width=280, height=240, corner_radius=15, bg_color="#f8f9fa")
-        card.grid(row=row, column=col, padx=10, pady=10)
+        self.tasks.submit(self.rental_controller.get_all_vehicles, on_success=on_loaded, on_error=self.show_load_error, key="content")
 
-        # Image
-        img_path = self.get_image_path(vehicle['model'])
-        img = ImageHelper.load_resized_image(img_path, size=(150, 100))
-        if img:
-            lbl = tk.Label(card.inner_frame, image=img, bg="#f8f9fa")
-            lbl.image = img
-            lbl.pack(pady=5)
-
-        tk.Label(card.inner_frame, text=f"{vehicle['brand']} {vehicle['model']}", font=("Segoe UI", 11, "bold"), bg="#f8f9fa").pack()
-        tk.Label(card.inner_frame, text=f"Plate: {vehicle['license_plate']}", font=("Segoe UI", 9), bg="#f8f9fa", fg="#7f8c8d").pack()
-        tk.Label(card.inner_frame, text=f"Rate: ₱{vehicle['daily_rate']}/day", font=("Segoe UI", 9, "bold"), fg="#27ae60", bg="#f8f9fa").pack()
-        
-        status_color = "green" if vehicle['status']=='Available' else "red"
-        tk.Label(card.inner_frame, text=f"Status: {vehicle['status']}", font=("Segoe UI", 9, "bold"), 
-                 fg=status_color, bg="#f8f9fa").pack(pady=5)
+    # Grid cards are drawn on the grid's canvas (CanvasCard), so a card adds no widgets
+    def create_fleet_card(self, parent):
+        card = CanvasCard(parent, width=280, height=240, corner_radius=15, bg_color="#f8f9fa")
+
+        card.image_item = card.add_image(140, 8)
+        card.name_text = card.add_text(140, 114, font=("Segoe UI", 11, "bold"), width=260)
+        card.plate_text = card.add_text(140, 138, font=("Segoe UI", 9), fill="#7f8c8d")
+        card.rate_text = card.add_text(140, 156, font=("Segoe UI", 9, "bold"), fill="#27ae60")
+        card.status_text = card.add_text(140, 176, font=("Segoe UI", 9, "bold"))
 
         # Edit button
-        RoundedButton(card.inner_frame, width=100, height=30, corner_radius=8, bg_color="#3498db", 
-                     fg_color="white", text="Edit", command=lambda v=vehicle: self.show_edit_vehicle_popup(v)).pack(pady=5)
+        card.edit_button = card.add_button(140, 200, width=100, height=30, corner_radius=8, bg_color="#3498db",
+                                           fg_color="white", text="Edit")
+        return card
+
+    def bind_fleet_card(self, card, vehicle):
+        # Image
+        img_path = ImageHelper.get_image_path(vehicle.model)
+        card.set_image(card.image_item, ImageHelper.load_resized_image(img_path, size=(150, 100)))
+
+        canvas = card.canvas
+        canvas.itemconfigure(card.name_text, text=f"{vehicle.brand} {vehicle.model}")
+        canvas.itemconfigure(card.plate_text, text=f"Plate: {vehicle.license_plate}")
+        canvas.itemconfigure(card.rate_text, text=f"Rate: ₱{vehicle.daily_rate}/day")
+
+        status_color = "green" if vehicle.status == 'Available' else "red"
+        canvas.itemconfigure(card.status_text, text=f"Status: {vehicle.status}", fill=status_color)
+
+        card.edit_button.command = lambda v=vehicle: self.show_edit_vehicle_popup(v)
 
     def show_add_vehicle_popup(self):
         popup = tk.Toplevel(self)
@@ -159,7 +203,7 @@ class AdminDashboard(tk.Frame):
 
     def show_edit_vehicle_popup(self, vehicle):
         popup = tk.Toplevel(self)
-        popup.title(f"Edit {vehicle['brand']} {vehicle['model']}")
+        popup.title(f"Edit {vehicle.brand} {vehicle.model}")
         popup.geometry("400x500")
         popup.configure(bg="white")
         popup.grab_set()
@@ -175,6 +219,9 @@ class AdminDashboard(tk.Frame):
         entries = {}
         fields = ["Brand", "Model", "Year", "License Plate", "Type", "Daily Rate"]
         keys = ["brand", "model", "year", "license_plate", "type", "daily_rate"]
+        if is_edit and vehicle:
+            current = dict(zip(keys, (vehicle.brand, vehicle.model, vehicle.year, vehicle.license_plate,
+                                      vehicle.vehicle_type, vehicle.daily_rate)))
 
         for i, field in enumerate(fields):
             tk.Label(form, text=f"{field}:", bg="white").grid(row=i, column=0, sticky="e", pady=5)
@@ -188,9 +235,9 @@ class AdminDashboard(tk.Frame):
             
             if is_edit and vehicle:
                 if field == "Type":
-                    entry.set(vehicle[keys[i]])
+                    entry.set(current[keys[i]])
                 else:
-                    entry.insert(0, str(vehicle[keys[i]]))
+                    entry.insert(0, str(current[keys[i]]))
 
         def save():
             data = {k: entries[k].get() for k in keys}
@@ -198,110 +245,147 @@ class AdminDashboard(tk.Frame):
                 messagebox.showerror("Error", "All fields are required")
                 return
 
-            try:
-                if is_edit:
-                    self.rental_controller.update_vehicle(vehicle['vehicle_id'], data['brand'], data['model'], 
-                                                        data['year'], data['license_plate'], data['type'], data['daily_rate'])
-                    messagebox.showinfo("Success", "Vehicle updated successfully!")
-                else:
-                    self.rental_controller.add_vehicle(data['brand'], data['model'], data['year'], 
-                                                     data['license_plate'], data['type'], data['daily_rate'])
-                    messagebox.showinfo("Success", "Vehicle added successfully!")
-                popup.destroy()
+            def on_done(result):
+                messagebox.showinfo("Success", "Vehicle updated successfully!" if is_edit else "Vehicle added successfully!")
+                if popup.winfo_exists():
+                    popup.destroy()
                 self.load_fleet()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+
+            # Writes go through the task runner like the loads, so a lock wait can't freeze the window
+            if is_edit:
+                self.tasks.submit(self.rental_controller.update_vehicle, vehicle.vehicle_id, data['brand'], data['model'],
+                                  data['year'], data['license_plate'], data['type'], data['daily_rate'],
+                                  on_success=on_done, on_error=self.show_action_error)
+            else:
+                self.tasks.submit(self.rental_controller.add_vehicle, data['brand'], data['model'], data['year'],
+                                  data['license_plate'], data['type'], data['daily_rate'],
+                                  on_success=on_done, on_error=self.show_action_error)
 
         tk.Button(popup, text="Save Vehicle", command=save, bg="#27ae60", fg="white", font=("Segoe UI", 10, "bold"), relief="flat", pady=5).pack(fill="x", padx=20, pady=10)
 
         if is_edit:
             def delete():
                 if messagebox.askyesno("Confirm", "Delete this vehicle?"):
-                    try:
-                        self.rental_controller.delete_vehicle(vehicle['vehicle_id'])
+                    def on_done(result):
                         messagebox.showinfo("Success", "Vehicle deleted successfully!")
-                        popup.destroy()
+                        if popup.winfo_exists():
+                            popup.destroy()
                         self.load_fleet()
-                    except Exception as e:
-                        messagebox.showerror("Error", str(e))
+                    self.tasks.submit(self.rental_controller.delete_vehicle, vehicle.vehicle_id,
+                                      on_success=on_done, on_error=self.show_action_error)
             
             tk.Button(popup, text="Delete Vehicle", command=delete, bg="#e74c3c", fg="white", font=("Segoe UI", 10, "bold"), relief="flat", pady=5).pack(fill="x", padx=20, pady=(0, 20))
 
-    def get_image_path(self, model):
-        base_path = os.path.join(os.path.dirname(__file__), "..", "img", "vehicles")
-        clean_model = model.replace(" ", "")
-        candidates = [
-            f"{model}.jpg", f"{model}.png",
-            f"{model.lower()}.jpg", f"{model.lower()}.png",
-            f"{clean_model}.jpg", f"{clean_model}.png",
-            f"{clean_model.lower()}.jpg", f"{clean_model.lower()}.png"
-        ]
-        for c in candidates:
-            p = os.path.join(base_path, c)
-            if os.path.exists(p):
-                return p
-        return ""
-
     # --- Reservations View ---
     def show_reservations_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="Reservations", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.reservations_frame = tk.Frame(self.content_area, bg="white")
-        self.reservations_frame.pack(fill="both", expand=True)
-        self.setup_reservations_view()
-
-    def setup_reservations_view(self):
-        self.res_scroll = ScrollableFrame(self.reservations_frame)
-        self.res_scroll.pack(fill="both", expand=True, padx=10, pady=10)
+        self.show_view("Reservations", self.setup_reservations_view, lambda: self.load_reservations(keep_position=True))
+
+    def setup_reservations_view(self, frame):
+        self.reservations_frame = frame
+        # Filters
+        filter_frame = tk.Frame(self.reservations_frame, bg="white")
+        filter_frame.pack(fill="x", padx=10)
+
+        tk.Label(filter_frame, text="Status:", bg="white", font=("Segoe UI", 10)).pack(side="left", padx=5)
+        self.res_status_var = tk.StringVar(value="All")
+        ttk.Combobox(filter_frame, textvariable=self.res_status_var, state="readonly",
+                     values=["All", "Pending", "Active", "Completed", "Cancelled"]).pack(side="left", padx=5)
+        RoundedButton(filter_frame, width=80, height=30, corner_radius=10, bg_color="#3498db", fg_color="white",
+                      text="Filter", command=self.load_reservations).pack(side="left", padx=10)
+        RoundedButton(filter_frame, width=110, height=30, corner_radius=10, bg_color="#27ae60", fg_color="white",
+                      text="Export CSV", command=self.export_reservations).pack(side="right", padx=10)
+
+        self.res_grid = VirtualGrid(self.reservations_frame, self.create_reservation_card, self.bind_reservation_card,
+                                    cell_width=300, cell_height=180, columns=3, bg="white")
+        self.res_grid.pack(fill="both", expand=True, padx=10, pady=10)
         self.load_reservations()
 
-    def load_reservations(self):
-        for widget in self.res_scroll.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        reservations = self.controller.get_all_reservations()
+    def load_reservations(self, keep_position=False):
+        """(Re)load from the first page; keep_position refreshes in place instead of jumping to the top"""
+        status = self.res_status_var.get()
+        self.res_loaded_status = status
+        # Pages are fetched from the controller as the grid scrolls towards the end
+        fetch_page = lambda cursor, limit: self.controller.get_reservations_page(limit=limit, cursor=cursor, status=status)
+        if self.res_grid.is_empty():
+            self.res_grid.set_loading()
+
+        def on_first_page(page):
+            self.res_grid.set_loading(False)
+            self.res_grid.set_data_source(PagedDataSource(fetch_page, page_size=self.RESERVATIONS_PAGE_SIZE, runner=self.tasks,
+                                                          runner_key="content", first_page=page), keep_position=keep_position)
+
+        self.tasks.submit(fetch_page, None, self.RESERVATIONS_PAGE_SIZE, on_success=on_first_page, on_error=self.show_load_error, key="content")
+
+    def export_reservations(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Export Reservations", defaultextension=".csv",
+                                            filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        status = self.res_status_var.get()
+
+        def export():
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                return self.controller.export_reservations(f, status)
+
+        # Streams the whole history; runs under its own key so browsing the views doesn't cancel it
+        self.tasks.submit(export, key="export",
+                          on_success=lambda count: messagebox.showinfo("Export", f"Exported {count} reservations to {path}"),
+                          on_error=lambda e: messagebox.showerror("Error", f"Export failed: {e}"))
+
+    def create_reservation_card(self, parent):
+        card = CanvasCard(parent, width=300, height=180, corner_radius=15, bg_color="#ecf0f1")
         
-        row, col = 0, 0
-        columns = 3
+        # Content
+        card.id_text = card.add_text(20, 14, anchor="nw", font=("Segoe UI", 10, "bold"))
+        card.user_text = card.add_text(20, 36, anchor="nw", font=("Segoe UI", 11))
+        card.vehicle_text = card.add_text(20, 62, anchor="nw", font=("Segoe UI", 12, "bold"), width=260)
+        card.dates_text = card.add_text(20, 94, anchor="nw", font=("Segoe UI", 10))
+        card.total_text = card.add_text(20, 116, anchor="nw", font=("Segoe UI", 11, "bold"), fill="#27ae60")
+        card.status_text = card.add_text(280, 150, anchor="ne", font=("Segoe UI", 10, "bold"))
+        return card
+
+    def bind_reservation_card(self, card, r):
+        canvas = card.canvas
+        canvas.itemconfigure(card.id_text, text=f"Res ID: {r['reservation_id']}")
+        canvas.itemconfigure(card.user_text, text=f"User: {r['username']}")
+        canvas.itemconfigure(card.vehicle_text, text=f"{r['brand']} {r['model']}")
+        canvas.itemconfigure(card.dates_text, text=f"{r['start_date']} to {r['end_date']}")
+        canvas.itemconfigure(card.total_text, text=f"Total: ₱{r['total_cost']:,.2f}")
         
-        for r in reservations:
-            card = RoundedFrame(self.res_scroll.scrollable_frame, width=300, height=180, corner_radius=15, bg_color="#ecf0f1")
-            card.grid(row=row, column=col, padx=10, pady=10)
-            
-            # Content
-            tk.Label(card.inner_frame, text=f"Res ID: {r['reservation_id']}", bg="#ecf0f1", font=("Segoe UI", 10, "bold")).pack(anchor="w")
-            tk.Label(card.inner_frame, text=f"User: {r['username']}", bg="#ecf0f1", font=("Segoe UI", 11)).pack(anchor="w")
-            tk.Label(card.inner_frame, text=f"{r['brand']} {r['model']}", bg="#ecf0f1", font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=5)
-            tk.Label(card.inner_frame, text=f"{r['start_date']} to {r['end_date']}", bg="#ecf0f1", font=("Segoe UI", 10)).pack(anchor="w")
-            tk.Label(card.inner_frame, text=f"Total: ₱{r['total_cost']:,.2f}", bg="#ecf0f1", font=("Segoe UI", 11, "bold"), fg="#27ae60").pack(anchor="w")
-            
-            # Status with color coding
-            status_colors = {
-                'Pending': '#f39c12',    # Orange
-                'Active': '#27ae60',     # Green
-                'Completed': '#7f8c8d',  # Gray
-                'Cancelled': '#e74c3c'   # Red
-            }
-            status_color = status_colors.get(r['status'], '#7f8c8d')
-            tk.Label(card.inner_frame, text=r['status'], bg="#ecf0f1", fg=status_color, font=("Segoe UI", 10, "bold")).pack(anchor="e")
-
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+        # Status with color coding
+        status_colors = {
+            'Pending': '#f39c12',    # Orange
+            'Active': '#27ae60',     # Green
+            'Completed': '#7f8c8d',  # Gray
+            'Cancelled': '#e74c3c'   # Red
+        }
+        status_color = status_colors.get(r['status'], '#7f8c8d')
+        canvas.itemconfigure(card.status_text, text=r['status'], fill=status_color)
 
     # --- Analytics View ---
     def show_analytics_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="Analytics", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.analytics_frame = tk.Frame(self.content_area, bg="white")
-        self.analytics_frame.pack(fill="both", expand=True)
-        self.setup_analytics_view()
-
-    def setup_analytics_view(self):
-        tk.Label(self.analytics_frame, text="Earnings by Vehicle Type", font=("Segoe UI", 16, "bold"), bg="white").pack(pady=20)
+        self.show_view("Analytics", self.setup_analytics_view, self.draw_chart)
+
+    # Chart choice -> rollup period (None is the per-type bar chart) and how far back to plot
+    CHART_MODES = {
+        "By Vehicle Type": (None, None),
+        "Daily": ('day', timedelta(days=90)),
+        "Weekly": ('week', timedelta(weeks=104)),
+        "Monthly": ('month', None)  # Whole history
+    }
+    TYPE_COLORS = {"Car": "#3498db", "Truck": "#e67e22", "SUV": "#27ae60", "Van": "#9b59b6", "Motorcycle": "#e74c3c"}
+
+    def setup_analytics_view(self, frame):
+        self.analytics_frame = frame
+        header = tk.Frame(self.analytics_frame, bg="white")
+        header.pack(fill="x", pady=20)
+        self.chart_title = tk.Label(header, text="Earnings by Vehicle Type", font=("Segoe UI", 16, "bold"), bg="white")
+        self.chart_title.pack(side="left", padx=20)
+
+        self.chart_mode = tk.StringVar(value="By Vehicle Type")
+        mode_box = ttk.Combobox(header, textvariable=self.chart_mode, state="readonly", values=list(self.CHART_MODES))
+        mode_box.pack(side="right", padx=20)
+        mode_box.bind("<<ComboboxSelected>>", lambda e: self.draw_chart())
         
         self.chart_canvas = tk.Canvas(self.analytics_frame, bg="white", height=400)
         self.chart_canvas.pack(fill="x", padx=20)
@@ -310,8 +394,21 @@ class AdminDashboard(tk.Frame):
 
     def draw_chart(self):
         self.chart_canvas.delete("all")
-        data = self.controller.get_earnings_by_type()
-        
+        self.chart_canvas.create_text(400, 200, text="Loading...", font=("Segoe UI", 14), fill="#7f8c8d")
+
+        mode = self.chart_mode.get()
+        period, window = self.CHART_MODES[mode]
+        if period is None:
+            self.chart_title.configure(text="Earnings by Vehicle Type")
+            self.tasks.submit(self.controller.get_earnings_by_type, on_success=self.render_chart, on_error=self.show_load_error, key="content")
+        else:
+            self.chart_title.configure(text=f"{mode} Earnings")
+            start = date.today() - window if window else None
+            self.tasks.submit(self.controller.get_earnings_series, period, start,
+                              on_success=self.render_series, on_error=self.show_load_error, key="content")
+
+    def render_chart(self, data):
+        self.chart_canvas.delete("all")
         if not data:
             self.chart_canvas.create_text(400, 200, text="No data available", font=("Segoe UI", 14))
             return
@@ -338,16 +435,56 @@ class AdminDashboard(tk.Frame):
             self.chart_canvas.create_text(x0 + bar_width/2, y1 + 15, text=item['type'])
             self.chart_canvas.create_text(x0 + bar_width/2, y0 - 10, text=f"₱{val:,.0f}")
 
+    def render_series(self, data):
+        """Line chart, one line per vehicle type, from get_earnings_series rows"""
+        self.chart_canvas.delete("all")
+        if not data:
+            self.chart_canvas.create_text(400, 200, text="No data available", font=("Segoe UI", 14))
+            return
+
+        periods = sorted({row['period_start'] for row in data})
+        series = {}
+        for row in data:
+            series.setdefault(row['type'], {})[row['period_start']] = float(row['earnings'])
+        max_val = max(max(values.values()) for values in series.values()) or 1.0
+
+        left, right, top, base_y = 70, 760, 30, 330
+        step = (right - left) / max(len(periods) - 1, 1)
+        x_of = {p: left + i * step for i, p in enumerate(periods)}
+
+        # Axes and scale
+        self.chart_canvas.create_line(left, base_y, right, base_y, fill="#bdc3c7")
+        self.chart_canvas.create_line(left, top, left, base_y, fill="#bdc3c7")
+        self.chart_canvas.create_text(left - 5, top, text=f"₱{max_val:,.0f}", anchor="e", font=("Segoe UI", 8))
+        self.chart_canvas.create_text(left - 5, base_y, text="₱0", anchor="e", font=("Segoe UI", 8))
+
+        # About eight date labels whatever the number of periods
+        label_every = max(len(periods) // 8, 1)
+        for i, p in enumerate(periods):
+            if i % label_every == 0:
+                self.chart_canvas.create_text(x_of[p], base_y + 15, text=p.strftime("%b %Y" if self.chart_mode.get() == "Monthly" else "%b %d"),
+                                              font=("Segoe UI", 8))
+
+        for i, (v_type, values) in enumerate(sorted(series.items())):
+            color = self.TYPE_COLORS.get(v_type, "#7f8c8d")
+            points = []
+            for p in periods:
+                points.extend([x_of[p], base_y - values.get(p, 0.0) / max_val * (base_y - top)])
+            if len(points) >= 4:
+                self.chart_canvas.create_line(*points, fill=color, width=2)
+            else:
+                self.chart_canvas.create_oval(points[0] - 3, points[1] - 3, points[0] + 3, points[1] + 3, fill=color, outline="")
+
+            # Legend
+            self.chart_canvas.create_rectangle(left + i * 110, 370, left + i * 110 + 12, 382, fill=color, outline="")
+            self.chart_canvas.create_text(left + i * 110 + 18, 376, text=v_type, anchor="w", font=("Segoe UI", 9))
+
     # --- User Management View ---
     def show_users_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="User Management", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.users_frame = tk.Frame(self.content_area, bg="white")
-        self.users_frame.pack(fill="both", expand=True)
-        self.setup_users_view()
+        self.show_view("User Management", self.setup_users_view, self.load_users)
 
-    def setup_users_view(self):
+    def setup_users_view(self, frame):
+        self.users_frame = frame
         # Add User Form
         form_frame = tk.LabelFrame(self.users_frame, text="Add New User", bg="white")
         form_frame.pack(fill="x", padx=10, pady=10)
@@ -375,43 +512,45 @@ class AdminDashboard(tk.Frame):
         RoundedButton(form_frame, width=100, height=30, corner_radius=10, bg_color="#27ae60", fg_color="white", text="Add User", command=self.add_user).grid(row=1, column=4, padx=10, pady=5)
 
         # User List
-        self.user_scroll = ScrollableFrame(self.users_frame)
-        self.user_scroll.pack(fill="both", expand=True, padx=10, pady=10)
+        self.user_grid = VirtualGrid(self.users_frame, self.create_user_card, self.bind_user_card,
+                                     cell_width=280, cell_height=160, columns=3, bg="white")
+        self.user_grid.pack(fill="both", expand=True, padx=10, pady=10)
 
         self.load_users()
 
     def load_users(self):
-        for widget in self.user_scroll.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        users = self.controller.get_all_users()
+        if self.user_grid.is_empty():
+            self.user_grid.set_loading()
+
+        def on_loaded(users):
+            self.user_grid.set_loading(False)
+            self.user_grid.set_data_source(ListDataSource(users), keep_position=True)
+
+        self.tasks.submit(self.controller.get_all_users, on_success=on_loaded, on_error=self.show_load_error, key="content")
+
+    def create_user_card(self, parent):
+        card = CanvasCard(parent, width=280, height=160, corner_radius=15, bg_color="#ecf0f1")
         
-        row, col = 0, 0
-        columns = 3
+        card.id_text = card.add_text(20, 12, anchor="nw", font=("Segoe UI", 9))
+        card.username_text = card.add_text(20, 30, anchor="nw", font=("Segoe UI", 12, "bold"))
+        card.name_text = card.add_text(20, 56, anchor="nw", font=("Segoe UI", 11))
+        card.role_text = card.add_text(20, 82, anchor="nw", font=("Segoe UI", 10), fill="#2980b9")
         
-        for u in users:
-            card = RoundedFrame(self.user_scroll.scrollable_frame, width=280, height=160, corner_radius=15, bg_color="#ecf0f1")
-            card.grid(row=row, column=col, padx=10, pady=10)
-            
-            tk.Label(card.inner_frame, text=f"ID: {u['user_id']}", bg="#ecf0f1", font=("Segoe UI", 9)).pack(anchor="w")
-            tk.Label(card.inner_frame, text=u['username'], bg="#ecf0f1", font=("Segoe UI", 12, "bold")).pack(anchor="w")
-            tk.Label(card.inner_frame, text=f"{u['first_name']} {u['last_name']}", bg="#ecf0f1", font=("Segoe UI", 11)).pack(anchor="w")
-            tk.Label(card.inner_frame, text=f"Role: {u['role']}", bg="#ecf0f1", fg="#2980b9", font=("Segoe UI", 10)).pack(anchor="w", pady=5)
-            
-            RoundedButton(card.inner_frame, width=80, height=30, corner_radius=10, bg_color="#e74c3c", fg_color="white", 
-                          text="Delete", command=lambda uid=u['user_id']: self.delete_user(uid)).pack(anchor="e", pady=5)
-
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+        card.delete_button = card.add_button(260, 115, width=80, height=30, corner_radius=10, bg_color="#e74c3c",
+                                             fg_color="white", text="Delete", anchor="ne")
+        return card
+
+    def bind_user_card(self, card, u):
+        canvas = card.canvas
+        canvas.itemconfigure(card.id_text, text=f"ID: {u.user_id}")
+        canvas.itemconfigure(card.username_text, text=u.username)
+        canvas.itemconfigure(card.name_text, text=u.full_name)
+        canvas.itemconfigure(card.role_text, text=f"Role: {u.role}")
+        card.delete_button.command = lambda uid=u.user_id: self.delete_user(uid)
 
     def add_user(self):
-        try:
-            if self.controller.add_user(
-                self.u_username.get(), self.u_password.get(), 
-                self.u_fname.get(), self.u_lname.get(), self.u_role.get()
-            ):
+        def on_done(added):
+            if added:
                 messagebox.showinfo("Success", "User added")
                 self.load_users()
                 # Clear
@@ -419,13 +558,104 @@ class AdminDashboard(tk.Frame):
                     e.delete(0, tk.END)
             else:
                 messagebox.showerror("Error", "Failed to add user")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+
+        # Hashing the password takes a moment, so it runs off the UI thread
+        self.tasks.submit(
+            self.controller.add_user,
+            self.u_username.get(), self.u_password.get(),
+            self.u_fname.get(), self.u_lname.get(), self.u_role.get(),
+            on_success=on_done, on_error=lambda e: messagebox.showerror("Error", str(e))
+        )
 
     def delete_user(self, user_id):
         if not messagebox.askyesno("Confirm", "Delete this user?"):
             return
 
-        if self.controller.delete_user(user_id):
-            messagebox.showinfo("Success", "User deleted")
-            self.load_users()
+        def on_done(deleted):
+            if deleted:
+                messagebox.showinfo("Success", "User deleted")
+                self.load_users()
+
+        self.tasks.submit(self.controller.delete_user, user_id, on_success=on_done, on_error=self.show_action_error)
+
+    # --- Diagnostics View ---
+    def show_diagnostics_view(self):
+        self.show_view("Diagnostics", self.setup_diagnostics_view, self.load_diagnostics)
+
+    QUERY_COLUMNS = (("calls", "Calls", 60), ("avg_ms", "Avg ms", 70), ("p50_ms", "p50 ms", 70), ("p95_ms", "p95 ms", 70),
+                     ("max_ms", "Max ms", 70), ("avg_rows", "Rows", 60), ("top_caller", "Caller", 220))
+
+    def setup_diagnostics_view(self, frame):
+        self.diagnostics_frame = frame
+        header = tk.Frame(frame, bg="white")
+        header.pack(fill="x", padx=10)
+        self.pool_label = tk.Label(header, text="", bg="white", font=("Segoe UI", 10), justify="left")
+        self.pool_label.pack(side="left")
+        tk.Button(header, text="Refresh", command=self.load_diagnostics, bg="#34495e", fg="white", relief="flat",
+                  padx=10).pack(side="right")
+
+        tk.Label(frame, text="Queries (slowest total time first)", bg="white", font=("Segoe UI", 11, "bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        self.query_tree = ttk.Treeview(frame, columns=[c[0] for c in self.QUERY_COLUMNS], height=10)
+        self.query_tree.heading("#0", text="Query")
+        self.query_tree.column("#0", width=420)
+        for key, title, width in self.QUERY_COLUMNS:
+            self.query_tree.heading(key, text=title)
+            self.query_tree.column(key, width=width, anchor="e" if key != "top_caller" else "w")
+        self.query_tree.pack(fill="x", padx=10, pady=5)
+
+        tk.Label(frame, text="Recent slow queries (select one for its plan)", bg="white", font=("Segoe UI", 11, "bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        self.slow_tree = ttk.Treeview(frame, columns=("at", "ms", "rows", "caller"), height=6)
+        self.slow_tree.heading("#0", text="Query")
+        self.slow_tree.column("#0", width=420)
+        for key, title, width in (("at", "When", 140), ("ms", "ms", 70), ("rows", "Rows", 60), ("caller", "Caller", 220)):
+            self.slow_tree.heading(key, text=title)
+            self.slow_tree.column(key, width=width)
+        self.slow_tree.pack(fill="x", padx=10, pady=5)
+        self.slow_tree.bind("<<TreeviewSelect>>", lambda e: self.show_slow_query_plan())
+
+        self.plan_text = tk.Text(frame, height=8, font=("Consolas", 9), relief="flat", bg="#f8f9fa")
+        self.plan_text.pack(fill="both", expand=True, padx=10, pady=5)
+        self.slow_events = []
+        self.load_diagnostics()
+
+    def load_diagnostics(self):
+        self.tasks.submit(self.controller.get_diagnostics, on_success=self.show_diagnostics, on_error=self.show_load_error, key="content")
+
+    def show_diagnostics(self, diag):
+        pool = diag['pool']
+        caches = ", ".join(f"{key} {stats['hit_rate']:.0%}" for key, stats in diag['reference_cache'].items()) or "-"
+        images = ImageHelper.get_cache_stats()
+        self.pool_label.configure(text=(
+            f"Pool: {pool['in_use']} in use, {pool['idle']} idle of {pool['max_size']}   "
+            f"avg wait {pool['avg_wait_time'] * 1000:.1f} ms, max {pool['max_wait_time'] * 1000:.1f} ms, {pool['timeouts']} timeouts\n"
+            f"Reference cache hit rate: {caches}   Image cache hit rate: {images['memory_hit_rate']:.0%} "
+            f"({images['memory_items']} images)"
+        ))
+
+        self.query_tree.delete(*self.query_tree.get_children())
+        for q in diag['queries']:
+            self.query_tree.insert("", "end", text=q['fingerprint'], values=(
+                q['calls'], f"{q['avg_ms']:.1f}", q['p50_ms'], q['p95_ms'], f"{q['max_ms']:.1f}",
+                f"{q['avg_rows']:.0f}", q['top_caller']))
+
+        self.slow_events = diag['slow_queries']
+        self.slow_tree.delete(*self.slow_tree.get_children())
+        for i, event in enumerate(self.slow_events):
+            self.slow_tree.insert("", "end", iid=str(i), text=event.fingerprint, values=(
+                f"{event.at:%Y-%m-%d %H:%M:%S}", f"{event.elapsed_ms:.1f}", event.rows, event.caller or "(other)"))
+        self.plan_text.delete("1.0", tk.END)
+
+    def show_slow_query_plan(self):
+        selected = self.slow_tree.selection()
+        if not selected:
+            return
+        event = self.slow_events[int(selected[0])]
+        lines = [event.sql.strip(), "", f"params: {query_stats.describe_params(event.params)}"]
+        if event.error:
+            lines.append(f"error: {event.error}")
+        for step in event.plan or ():
+            lines.append(", ".join(f"{k}={v}" for k, v in step.items() if v is not None))
+        if not event.plan:
+            lines.append("(no plan captured)")
+        self.plan_text.delete("1.0", tk.END)
+        self.plan_text.insert("1.0", "\n".join(lines))
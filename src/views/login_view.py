@@ -1,11 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox
 from src.utils.gui_helpers import RoundedFrame, RoundedButton
+from src.utils.task_runner import TaskRunner
 
 class LoginView(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        self.tasks = TaskRunner(self)
+        self.busy = False
         self.configure(bg="#ecf0f1")
         self.pack(fill="both", expand=True)
         
@@ -45,6 +48,9 @@ class LoginView(tk.Frame):
         RoundedButton(self.center_frame, width=280, height=40, corner_radius=20, bg_color="#3498db", fg_color="white", 
                       text="LOGIN", command=self.login).pack(pady=10)
         
+        self.status_label = tk.Label(self.center_frame, text="", font=("Segoe UI", 9), bg="white", fg="#7f8c8d")
+        self.status_label.pack()
+
         # Register Link
         tk.Button(self.center_frame, text="Create New Account", command=self.show_register_form, 
                  bg="white", fg="#3498db", font=("Segoe UI", 10), relief="flat", cursor="hand2").pack(pady=5)
@@ -83,13 +89,20 @@ class LoginView(tk.Frame):
                  bg="white", fg="#7f8c8d", font=("Segoe UI", 10), relief="flat", cursor="hand2").pack(pady=5)
 
     def login(self):
+        if self.busy:
+            return
         username = self.username_entry.get()
         password = self.password_entry.get()
-        
-        if self.controller.authenticate(username, password):
-            pass # Controller handles switch
-        else:
-            messagebox.showerror("Error", "Invalid credentials")
+
+        def failed(message):
+            self.busy = False
+            self.status_label.configure(text="")
+            messagebox.showerror("Error", message)
+
+        # Controller handles switch on success
+        self.busy = True
+        self.status_label.configure(text="Signing in...")
+        self.controller.authenticate(username, password, on_failure=failed)
 
     def register(self):
         fname = self.reg_fname.get()
@@ -101,9 +114,22 @@ class LoginView(tk.Frame):
             messagebox.showerror("Error", "All fields are required")
             return
 
-        success, msg = self.controller.auth_controller.register(user, pwd, fname, lname)
-        if success:
-            messagebox.showinfo("Success", msg)
-            self.show_login_form()
-        else:
-            messagebox.showerror("Error", msg)
+        if self.busy:
+            return
+
+        def on_done(result):
+            self.busy = False
+            success, msg = result
+            if success:
+                messagebox.showinfo("Success", msg)
+                self.show_login_form()
+            else:
+                messagebox.showerror("Error", msg)
+
+        def on_error(error):
+            self.busy = False
+            messagebox.showerror("Error", f"Registration failed: {error}")
+
+        # Password hashing takes a noticeable moment - keep the window responsive
+        self.busy = True
+        self.tasks.submit(self.controller.auth_controller.register, user, pwd, fname, lname, on_success=on_done, on_error=on_error)
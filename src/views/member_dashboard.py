@@ -2,10 +2,10 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 from src.controllers.rental_controller import RentalController
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from src.utils.image_helper import ImageHelper
-from src.utils.gui_helpers import RoundedFrame, RoundedButton, ScrollableFrame
-import os
+from src.utils.gui_helpers import RoundedFrame, RoundedButton, ScrollableFrame, KeyedCardGrid, ViewStack
+from src.utils.task_runner import TaskRunner
 
 class MemberDashboard(tk.Frame):
     def __init__(self, parent, user, logout_callback):
@@ -13,6 +13,7 @@ class MemberDashboard(tk.Frame):
         self.user = user
         self.logout_callback = logout_callback
         self.rental_controller = RentalController()
+        self.tasks = TaskRunner(self)
         self.pack(fill="both", expand=True)
         
         self.create_layout()
@@ -47,32 +48,37 @@ class MemberDashboard(tk.Frame):
         # Content Area
         self.content_area = tk.Frame(self.main_container, bg="white")
         self.content_area.pack(side="left", fill="both", expand=True, padx=20, pady=20)
+        self.views = ViewStack(self.content_area)
 
     def create_sidebar_button(self, text, command):
         btn = RoundedButton(self.side_bar, width=180, height=40, corner_radius=10, bg_color="#34495e", fg_color="white", text=text, command=command)
         btn.pack(pady=5)
 
-    def clear_content(self):
-        for widget in self.content_area.winfo_children():
-            widget.destroy()
+    def show_view(self, title, setup, refresh):
+        """Switch the content area to a view: built by setup(frame) on the first visit, refreshed afterwards"""
+        # Results still in flight for the old view are no longer wanted
+        self.tasks.cancel("content")
+
+        def build(frame):
+            tk.Label(frame, text=title, font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
+            setup(frame)
+
+        self.views.show(title, build, refresh)
+
+    def show_load_error(self, error):
+        messagebox.showerror("Error", f"Could not load data: {error}")
+
+    def show_action_error(self, error):
+        messagebox.showerror("Error", str(error))
 
     def show_rent_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="Rent a Vehicle", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.rent_frame = tk.Frame(self.content_area, bg="white")
-        self.rent_frame.pack(fill="both", expand=True)
-        self.setup_rent_view()
+        self.show_view("Rent a Vehicle", self.setup_rent_view, self.load_vehicles)
 
     def show_history_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="My Reservations", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.history_frame = tk.Frame(self.content_area, bg="white")
-        self.history_frame.pack(fill="both", expand=True)
-        self.setup_history_view()
+        self.show_view("My Reservations", self.setup_history_view, self.load_reservations)
 
-    def setup_rent_view(self):
+    def setup_rent_view(self, frame):
+        self.rent_frame = frame
         # Filters
         filter_frame = tk.Frame(self.rent_frame, bg="white")
         filter_frame.pack(fill="x", pady=10)
@@ -81,40 +87,45 @@ class MemberDashboard(tk.Frame):
         self.type_var = tk.StringVar(value="All")
         type_cb = ttk.Combobox(filter_frame, textvariable=self.type_var, values=["All", "Car", "Truck", "SUV", "Van", "Motorcycle"])
         type_cb.pack(side="left", padx=5)
+
+        tk.Label(filter_frame, text="From:", bg="white", font=("Segoe UI", 10)).pack(side="left", padx=(15, 5))
+        self.filter_start = DateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2)
+        self.filter_start.pack(side="left", padx=5)
+
+        tk.Label(filter_frame, text="To:", bg="white", font=("Segoe UI", 10)).pack(side="left", padx=(10, 5))
+        self.filter_end = DateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2)
+        self.filter_end.set_date(date.today() + timedelta(days=1))
+        self.filter_end.pack(side="left", padx=5)
+
         RoundedButton(filter_frame, width=80, height=30, corner_radius=10, bg_color="#3498db", fg_color="white", text="Search", command=self.load_vehicles).pack(side="left", padx=10)
 
         # Vehicle Grid (Scrollable)
         self.rent_scroll = ScrollableFrame(self.rent_frame)
         self.rent_scroll.pack(fill="both", expand=True, padx=10)
+        # Quotes depend on the dates, so a card is only reused while its vehicle and price are unchanged
+        self.vehicle_cards = KeyedCardGrid(self.rent_scroll.scrollable_frame, self.create_vehicle_card,
+                                           key=lambda v: v['vehicle_id'], columns=4,
+                                           empty_text="No vehicles available for these dates")
 
         self.load_vehicles()
 
     def load_vehicles(self):
-        # Clear existing
-        for widget in self.rent_scroll.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        vehicles = self.rental_controller.get_available_vehicles(self.type_var.get())
-        
-        # Grid settings
-        columns = 4  # Increased columns for better density
-        row = 0
-        col = 0
-
-        for v in vehicles:
-            self.create_vehicle_card(v, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
-
-    def create_vehicle_card(self, vehicle, row, col):
+        start, end = self.filter_start.get_date(), self.filter_end.get_date()
+        if end < start:
+            messagebox.showerror("Error", "End date cannot be before the start date")
+            return
+
+        self.vehicle_cards.set_loading()
+        # Cheapest first, each card quoting the full price for the chosen dates
+        self.tasks.submit(self.rental_controller.compare_vehicles, self.type_var.get(), start, end,
+                          on_success=self.vehicle_cards.update, on_error=self.show_load_error, key="content")
+
+    def create_vehicle_card(self, parent, vehicle):
         # Card Frame
-        card = RoundedFrame(self.rent_scroll.scrollable_frame, width=250, height=220, corner_radius=15, bg_color="#f8f9fa")
-        card.grid(row=row, column=col, padx=10, pady=10)
+        card = RoundedFrame(parent, width=250, height=220, corner_radius=15, bg_color="#f8f9fa")
         
         # Image
-        img_path = self.get_image_path(vehicle['model'])
+        img_path = ImageHelper.get_image_path(vehicle['model'])
         img = ImageHelper.load_resized_image(img_path, size=(150, 100))
         
         if img:
@@ -126,28 +137,16 @@ class MemberDashboard(tk.Frame):
         # Info
         tk.Label(card.inner_frame, text=f"{vehicle['brand']} {vehicle['model']}", font=("Segoe UI", 11, "bold"), bg="#f8f9fa").pack()
         tk.Label(card.inner_frame, text=f"{vehicle['year']} - {vehicle['type']}", font=("Segoe UI", 9), bg="#f8f9fa", fg="#7f8c8d").pack()
-        tk.Label(card.inner_frame, text=f"₱{vehicle['daily_rate']}/day", font=("Segoe UI", 10, "bold"), bg="#f8f9fa", fg="#27ae60").pack(pady=5)
+        tk.Label(card.inner_frame, text=f"₱{vehicle['daily_rate']}/day", font=("Segoe UI", 10, "bold"), bg="#f8f9fa", fg="#27ae60").pack(pady=(5, 0))
+        if 'quoted_total' in vehicle:
+            tk.Label(card.inner_frame, text=f"₱{vehicle['quoted_total']:,.2f} total", font=("Segoe UI", 9), bg="#f8f9fa", fg="#7f8c8d").pack()
 
         # Click Event on Card
         card.bind("<Button-1>", lambda e, v=vehicle: self.show_rent_popup(v))
         card.inner_frame.bind("<Button-1>", lambda e, v=vehicle: self.show_rent_popup(v))
         for child in card.inner_frame.winfo_children():
             child.bind("<Button-1>", lambda e, v=vehicle: self.show_rent_popup(v))
-
-    def get_image_path(self, model):
-        base_path = os.path.join(os.path.dirname(__file__), "..", "img", "vehicles")
-        clean_model = model.replace(" ", "")
-        candidates = [
-            f"{model}.jpg", f"{model}.png",
-            f"{model.lower()}.jpg", f"{model.lower()}.png",
-            f"{clean_model}.jpg", f"{clean_model}.png",
-            f"{clean_model.lower()}.jpg", f"{clean_model.lower()}.png"
-        ]
-        for c in candidates:
-            p = os.path.join(base_path, c)
-            if os.path.exists(p):
-                return p
-        return ""
+        return card
 
     def show_rent_popup(self, vehicle):
         popup = tk.Toplevel(self)
@@ -157,7 +156,7 @@ class MemberDashboard(tk.Frame):
         popup.grab_set() # Modal
 
         # Image
-        img_path = self.get_image_path(vehicle['model'])
+        img_path = ImageHelper.get_image_path(vehicle['model'])
         img = ImageHelper.load_resized_image(img_path, size=(300, 200))
         if img:
             lbl = tk.Label(popup, image=img, bg="white")
@@ -174,10 +173,12 @@ class MemberDashboard(tk.Frame):
 
         tk.Label(form_frame, text="Start Date:", bg="white").grid(row=0, column=0, sticky="w", pady=5)
         start_date = DateEntry(form_frame, width=12, background='darkblue', foreground='white', borderwidth=2)
+        start_date.set_date(self.filter_start.get_date())
         start_date.grid(row=0, column=1, sticky="w", pady=5)
 
         tk.Label(form_frame, text="End Date:", bg="white").grid(row=1, column=0, sticky="w", pady=5)
         end_date = DateEntry(form_frame, width=12, background='darkblue', foreground='white', borderwidth=2)
+        end_date.set_date(self.filter_end.get_date())
         end_date.grid(row=1, column=1, sticky="w", pady=5)
 
         insurance_var = tk.BooleanVar()
@@ -187,61 +188,64 @@ class MemberDashboard(tk.Frame):
         tk.Label(form_frame, text="Add Equipment:", bg="white", font=("Segoe UI", 10, "bold")).grid(row=3, column=0, columnspan=2, sticky="w", pady=(10, 5))
         
         equipment_vars = {}
-        equipments = self.rental_controller.get_equipment()
-        r = 4
-        for eq in equipments:
-            var = tk.BooleanVar()
-            equipment_vars[eq['equipment_id']] = var
-            tk.Checkbutton(form_frame, text=f"{eq['name']} (+{eq['daily_rate']})", variable=var, bg="white").grid(row=r, column=0, columnspan=2, sticky="w")
-            r += 1
+
+        def show_equipment(equipments):
+            if not popup.winfo_exists():
+                return
+            r = 4
+            for eq in equipments:
+                var = tk.BooleanVar()
+                equipment_vars[eq['equipment_id']] = var
+                # Stock is shown for the dates the popup opened with; booking re-checks the final dates
+                sold_out = eq['available'] < 1
+                text = f"{eq['name']} (+{eq['daily_rate']})" + (" - fully booked" if sold_out else f" - {eq['available']} left")
+                tk.Checkbutton(form_frame, text=text, variable=var, bg="white",
+                               state="disabled" if sold_out else "normal").grid(row=r, column=0, columnspan=2, sticky="w")
+                r += 1
+
+        self.tasks.submit(self.rental_controller.get_equipment_availability, start_date.get_date(), end_date.get_date(),
+                          on_success=show_equipment, on_error=self.show_load_error)
 
         # Action Button
         def confirm_rent():
             eq_ids = [eid for eid, var in equipment_vars.items() if var.get()]
-            try:
-                success = self.rental_controller.create_reservation(
-                    self.user.user_id,
-                    vehicle['vehicle_id'],
-                    start_date.get_date(),
-                    end_date.get_date(),
-                    insurance_var.get(),
-                    eq_ids
-                )
+
+            def on_done(success):
                 if success:
                     messagebox.showinfo("Success", "Reservation created! Waiting for staff approval.")
-                    popup.destroy()
+                    if popup.winfo_exists():
+                        popup.destroy()
                     self.load_vehicles()
                 else:
                     messagebox.showerror("Error", "Failed to create reservation.")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+
+            # Booking locks the vehicle row and may retry on a deadlock - keep it off the Tk thread
+            self.tasks.submit(self.rental_controller.create_reservation, self.user.user_id, vehicle['vehicle_id'],
+                              start_date.get_date(), end_date.get_date(), insurance_var.get(), eq_ids,
+                              on_success=on_done, on_error=self.show_action_error)
 
         tk.Button(popup, text="Confirm Reservation", command=confirm_rent, bg="#27ae60", fg="white", font=("Segoe UI", 12, "bold"), relief="flat", pady=10).pack(fill="x", padx=20, pady=20)
 
-    def setup_history_view(self):
+    def setup_history_view(self, frame):
+        self.history_frame = frame
         self.history_scroll = ScrollableFrame(self.history_frame)
         self.history_scroll.pack(fill="both", expand=True, padx=10)
 
-        # Load Reservations
-        reservations = self.rental_controller.get_user_reservations(self.user.user_id)
-        
-        columns = 3
-        row = 0
-        col = 0
-
-        for res in reservations:
-            self.create_reservation_card(self.history_scroll.scrollable_frame, res, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
-
-    def create_reservation_card(self, parent, res, row, col):
+        self.reservation_cards = KeyedCardGrid(self.history_scroll.scrollable_frame, self.create_reservation_card,
+                                               key=lambda r: r['reservation_id'], columns=3,
+                                               empty_text="No reservations yet")
+        self.load_reservations()
+
+    def load_reservations(self):
+        self.reservation_cards.set_loading()
+        self.tasks.submit(self.rental_controller.get_user_reservations, self.user.user_id,
+                          on_success=self.reservation_cards.update, on_error=self.show_load_error, key="content")
+
+    def create_reservation_card(self, parent, res):
         card = RoundedFrame(parent, width=280, height=200, corner_radius=15, bg_color="#f8f9fa")
-        card.grid(row=row, column=col, padx=10, pady=10)
 
         # Image
-        img_path = self.get_image_path(res['model'])
+        img_path = ImageHelper.get_image_path(res['model'])
         img = ImageHelper.load_resized_image(img_path, size=(150, 100))
         if img:
             lbl = tk.Label(card.inner_frame, image=img, bg="#f8f9fa")
@@ -267,6 +271,7 @@ class MemberDashboard(tk.Frame):
         card.inner_frame.bind("<Button-1>", lambda e, r=res: self.show_reservation_popup(r))
         for child in card.inner_frame.winfo_children():
             child.bind("<Button-1>", lambda e, r=res: self.show_reservation_popup(r))
+        return card
 
     def show_reservation_popup(self, res):
         popup = tk.Toplevel(self)
@@ -289,13 +294,13 @@ class MemberDashboard(tk.Frame):
         if res['status'] == 'Pending':
             def cancel():
                 if messagebox.askyesno("Confirm", "Are you sure you want to cancel this reservation?"):
-                    try:
-                        self.rental_controller.cancel_reservation(res['reservation_id'])
+                    def on_done(result):
                         messagebox.showinfo("Success", "Reservation cancelled.")
-                        popup.destroy()
-                        self.show_history_view() # Refresh
-                    except Exception as e:
-                        messagebox.showerror("Error", str(e))
+                        if popup.winfo_exists():
+                            popup.destroy()
+                        self.load_reservations() # Refresh
+                    self.tasks.submit(self.rental_controller.cancel_reservation, res['reservation_id'],
+                                      on_success=on_done, on_error=self.show_action_error)
 
             tk.Button(popup, text="Cancel Reservation", command=cancel, bg="#e74c3c", fg="white", 
                      font=("Segoe UI", 10, "bold"), relief="flat", pady=5).pack(pady=20)
@@ -2,8 +2,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from src.controllers.rental_controller import RentalController
 from src.utils.image_helper import ImageHelper
-from src.utils.gui_helpers import RoundedFrame, RoundedButton, ScrollableFrame
-import os
+from src.utils.gui_helpers import RoundedFrame, RoundedButton, ScrollableFrame, KeyedCardGrid, ViewStack
+from src.utils.task_runner import TaskRunner
+from src.utils.change_feed import ChangePoller
 
 class StaffDashboard(tk.Frame):
     def __init__(self, parent, user, logout_callback):
@@ -11,9 +12,16 @@ class StaffDashboard(tk.Frame):
         self.user = user
         self.logout_callback = logout_callback
         self.rental_controller = RentalController()
+        self.tasks = TaskRunner(self)
+        self.pending_cards = None
+        self.rental_cards = None
+        # Reservations changed at other counters are patched into the open grids
+        self.changes = ChangePoller(self.tasks, self, self.rental_controller.get_reservation_changes,
+                                    self.apply_changes)
         self.pack(fill="both", expand=True)
         
         self.create_layout()
+        self.changes.start()
         self.show_pending_view()  # Show pending approvals by default
 
     def create_layout(self):
@@ -46,53 +54,95 @@ class StaffDashboard(tk.Frame):
         # Content Area
         self.content_area = tk.Frame(self.main_container, bg="white")
         self.content_area.pack(side="left", fill="both", expand=True, padx=20, pady=20)
+        self.views = ViewStack(self.content_area)
 
     def create_sidebar_button(self, text, command):
         btn = RoundedButton(self.side_bar, width=180, height=40, corner_radius=10, bg_color="#34495e", fg_color="white", text=text, command=command)
         btn.pack(pady=5)
 
-    def clear_content(self):
-        for widget in self.content_area.winfo_children():
-            widget.destroy()
+    def show_view(self, title, setup, refresh):
+        """Switch the content area to a view: built by setup(frame) on the first visit, refreshed afterwards"""
+        # Results still in flight for the old view are no longer wanted
+        self.tasks.cancel("content")
+
+        def build(frame):
+            tk.Label(frame, text=title, font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
+            setup(frame)
+
+        self.views.show(title, build, refresh)
+
+    def show_load_error(self, error):
+        messagebox.showerror("Error", f"Could not load data: {error}")
+
+    def show_action_error(self, error):
+        messagebox.showerror("Error", str(error))
+
+    def load_with_position(self, fetch):
+        """fetch() prefixed by the change feed position, taken first so no change falls in between"""
+        return self.rental_controller.get_latest_event_id(), fetch()
+
+    def track_from(self, position):
+        # Only the first full load sets the cursor; rows from the feed are always
+        # current, so later reloads don't need to move it
+        if self.changes.position is None:
+            self.changes.reset(position)
+
+    def apply_changes(self, rows):
+        """Move changed reservations between the pending and returns grids by their new status"""
+        by_status = {'Pending': [], 'Active': []}
+        for row in rows:
+            by_status.setdefault(row['status'], []).append(row)
+        ids = [row['reservation_id'] for row in rows]
+
+        if self.pending_cards is not None:
+            self.pending_cards.patch(by_status['Pending'], ids)
+            self.pending_rows = self.pending_cards.rows
+        if self.rental_cards is not None:
+            self.rental_cards.patch(by_status['Active'], ids)
 
     def show_pending_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="Pending Approvals", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.pending_frame = tk.Frame(self.content_area, bg="white")
-        self.pending_frame.pack(fill="both", expand=True)
-        self.setup_pending_view()
+        self.show_view("Pending Approvals", self.setup_pending_view, self.load_pending)
+
+    def setup_pending_view(self, frame):
+        self.pending_frame = frame
+        self.pending_rows = []
+        RoundedButton(self.pending_frame, width=200, height=40, corner_radius=10, bg_color="#27ae60", fg_color="white",
+                      text="Approve All", command=self.approve_all_pending).pack(anchor="e", padx=20, pady=(0, 10))
 
-    def setup_pending_view(self):
         self.pend_scroll = ScrollableFrame(self.pending_frame)
         self.pend_scroll.pack(fill="both", expand=True, padx=10)
+        self.pending_cards = KeyedCardGrid(self.pend_scroll.scrollable_frame, self.create_pending_card,
+                                           key=lambda p: p['reservation_id'], columns=3,
+                                           empty_text="No pending reservations")
         self.load_pending()
 
     def load_pending(self):
-        for widget in self.pend_scroll.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        pending = self.rental_controller.get_pending_reservations()
-        
-        if not pending:
-            tk.Label(self.pend_scroll.scrollable_frame, text="No pending reservations", 
-                    font=("Segoe UI", 14), fg="#7f8c8d").pack(pady=50)
+        self.pending_cards.set_loading()
+        self.tasks.submit(self.load_with_position, self.rental_controller.get_pending_reservations,
+                          on_success=self.show_pending, on_error=self.show_load_error, key="content")
+
+    def show_pending(self, result):
+        position, pending = result
+        self.track_from(position)
+        self.pending_rows = pending
+        # Cards of reservations that are still pending and unchanged are kept as they are
+        self.pending_cards.update(pending)
+
+    def approve_all_pending(self):
+        if not self.pending_rows:
             return
-        
-        columns = 3
-        row = 0
-        col = 0
+        if not messagebox.askyesno("Confirm", f"Approve all {len(self.pending_rows)} pending reservations?"):
+            return
+        def on_done(approved):
+            messagebox.showinfo("Success", f"{len(approved)} reservations approved!")
+            self.load_pending()
 
-        for p in pending:
-            self.create_pending_card(p, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+        # Writes can wait on row locks or retry a deadlock - never on the Tk thread
+        self.tasks.submit(self.rental_controller.approve_reservations, [p['reservation_id'] for p in self.pending_rows],
+                          on_success=on_done, on_error=self.show_action_error)
 
-    def create_pending_card(self, pending, row, col):
-        card = RoundedFrame(self.pend_scroll.scrollable_frame, width=280, height=260, corner_radius=15, bg_color="#fff3cd")
-        card.grid(row=row, column=col, padx=10, pady=10)
+    def create_pending_card(self, parent, pending):
+        card = RoundedFrame(parent, width=280, height=260, corner_radius=15, bg_color="#fff3cd")
 
         # Header
         tk.Label(card.inner_frame, text=f"Reservation #{pending['reservation_id']}", 
@@ -121,71 +171,53 @@ class StaffDashboard(tk.Frame):
         btn_frame.pack(fill="x", pady=(5,0))
         
         def approve():
-            try:
-                self.rental_controller.approve_reservation(pending['reservation_id'])
+            def on_done(result):
                 messagebox.showinfo("Success", f"Reservation #{pending['reservation_id']} approved!")
                 self.load_pending()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            self.tasks.submit(self.rental_controller.approve_reservation, pending['reservation_id'],
+                              on_success=on_done, on_error=self.show_action_error)
         
         def reject():
             if messagebox.askyesno("Confirm", f"Reject reservation #{pending['reservation_id']}?"):
-                try:
-                    self.rental_controller.reject_reservation(pending['reservation_id'])
+                def on_done(result):
                     messagebox.showinfo("Success", f"Reservation #{pending['reservation_id']} rejected.")
                     self.load_pending()
-                except Exception as e:
-                    messagebox.showerror("Error", str(e))
+                self.tasks.submit(self.rental_controller.reject_reservation, pending['reservation_id'],
+                                  on_success=on_done, on_error=self.show_action_error)
         
         RoundedButton(btn_frame, width=110, height=30, corner_radius=8, bg_color="#27ae60", 
                      fg_color="white", text="Approve", command=approve).pack(side="left", padx=2)
         RoundedButton(btn_frame, width=110, height=30, corner_radius=8, bg_color="#e74c3c", 
                      fg_color="white", text="Reject", command=reject).pack(side="left", padx=2)
+        return card
 
     def show_returns_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="Process Returns", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.returns_frame = tk.Frame(self.content_area, bg="white")
-        self.returns_frame.pack(fill="both", expand=True)
-        self.setup_returns_view()
-
-    def show_fleet_view(self):
-        self.clear_content()
-        tk.Label(self.content_area, text="Manage Fleet", font=("Segoe UI", 20, "bold"), bg="white").pack(anchor="w", pady=(0, 20))
-        
-        self.fleet_frame = tk.Frame(self.content_area, bg="white")
-        self.fleet_frame.pack(fill="both", expand=True)
-        self.setup_fleet_view()
+        self.show_view("Process Returns", self.setup_returns_view, self.load_rentals)
 
-    def setup_returns_view(self):
+    def setup_returns_view(self, frame):
+        self.returns_frame = frame
         self.ret_scroll = ScrollableFrame(self.returns_frame)
         self.ret_scroll.pack(fill="both", expand=True, padx=10)
+        self.rental_cards = KeyedCardGrid(self.ret_scroll.scrollable_frame, self.create_rental_card,
+                                          key=lambda r: r['reservation_id'], columns=3,
+                                          empty_text="No active rentals")
         self.load_rentals()
 
     def load_rentals(self):
-        for widget in self.ret_scroll.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        rentals = self.rental_controller.get_all_active_rentals()
-        
-        columns = 3
-        row = 0
-        col = 0
+        self.rental_cards.set_loading()
+        self.tasks.submit(self.load_with_position, self.rental_controller.get_all_active_rentals,
+                          on_success=self.show_rentals, on_error=self.show_load_error, key="content")
 
-        for r in rentals:
-            self.create_rental_card(r, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+    def show_rentals(self, result):
+        position, rentals = result
+        self.track_from(position)
+        self.rental_cards.update(rentals)
 
-    def create_rental_card(self, rental, row, col):
-        card = RoundedFrame(self.ret_scroll.scrollable_frame, width=280, height=220, corner_radius=15, bg_color="#f8f9fa")
-        card.grid(row=row, column=col, padx=10, pady=10)
+    def create_rental_card(self, parent, rental):
+        card = RoundedFrame(parent, width=280, height=220, corner_radius=15, bg_color="#f8f9fa")
 
         # Image
-        img_path = self.get_image_path(rental['model'])
+        img_path = ImageHelper.get_image_path(rental['model'])
         img = ImageHelper.load_resized_image(img_path, size=(150, 100))
         if img:
             lbl = tk.Label(card.inner_frame, image=img, bg="#f8f9fa")
@@ -201,6 +233,7 @@ class StaffDashboard(tk.Frame):
         card.inner_frame.bind("<Button-1>", lambda e, r=rental: self.show_return_popup(r))
         for child in card.inner_frame.winfo_children():
             child.bind("<Button-1>", lambda e, r=rental: self.show_return_popup(r))
+        return card
 
     def show_return_popup(self, rental):
         popup = tk.Toplevel(self)
@@ -225,33 +258,14 @@ class StaffDashboard(tk.Frame):
 
         def confirm():
             notes = notes_entry.get() or "Standard return"
-            try:
-                self.rental_controller.return_vehicle(rental['reservation_id'], rental['vehicle_id'], notes)
+
+            def on_done(result):
                 messagebox.showinfo("Success", "Vehicle returned successfully")
-                popup.destroy()
+                if popup.winfo_exists():
+                    popup.destroy()
                 self.load_rentals()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-
-        tk.Button(popup, text="Confirm Return", command=confirm, bg="#f39c12", fg="white", font=("Segoe UI", 12, "bold"), relief="flat", pady=10).pack(fill="x", padx=20, pady=20)
-
-    def get_image_path(self, model):
-        base_path = os.path.join(os.path.dirname(__file__), "..", "img", "vehicles")
-        clean_model = model.replace(" ", "")
-        candidates = [
-            f"{model}.jpg", f"{model}.png",
-            f"{model.lower()}.jpg", f"{model.lower()}.png",
-            f"{clean_model}.jpg", f"{clean_model}.png",
-            f"{clean_model.lower()}.jpg", f"{clean_model.lower()}.png"
-        ]
-        for c in candidates:
-            p = os.path.join(base_path, c)
-            if os.path.exists(p):
-                return p
-        return ""
-
-
-
-
 
+            self.tasks.submit(self.rental_controller.return_vehicle, rental['reservation_id'], rental['vehicle_id'], notes,
+                              on_success=on_done, on_error=self.show_action_error)
 
+        tk.Button(popup, text="Confirm Return", command=confirm, bg="#f39c12", fg="white", font=("Segoe UI", 12, "bold"), relief="flat", pady=10).pack(fill="x", padx=20, pady=20)
@@ -0,0 +1,65 @@
+import json
+import unittest
+from unittest import mock
+
+try:
+    from src.api import server
+except ImportError:
+    server = None
+
+
+class FakeRentals:
+    def create_reservation(self, user_id, vehicle_id, start_date, end_date, insurance, equipment_ids):
+        if vehicle_id == 404:
+            raise server.ValidationError("Vehicle not found")
+        if vehicle_id == 501:
+            raise ValueError("invalid literal for int() with base 10: 'x'")
+        if vehicle_id == 500:
+            raise RuntimeError("connection reset by peer")
+        return 42
+
+
+@unittest.skipIf(server is None, "mysql-connector, numpy or bcrypt is not installed")
+class CreateReservationTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.object(server, "RentalController", FakeRentals), \
+                mock.patch.object(server, "AdminController", object):
+            self.api = server.RentalAPI()
+
+    def post(self, vehicle_id, **fields):
+        body = dict({'user_id': 1, 'vehicle_id': vehicle_id, 'start_date': '2099-01-10', 'end_date': '2099-01-12'},
+                    **fields)
+        return self.api.handle('POST', '/reservations', json.dumps(body).encode('utf-8'))
+
+    def test_created_body_carries_the_reservation_id(self):
+        status, payload = self.post(1)
+        self.assertEqual(status, 201)
+        self.assertIs(type(payload['reservation_id']), int)
+        self.assertEqual(payload['reservation_id'], 42)
+
+    def test_rejected_input_is_a_client_error(self):
+        self.assertEqual(self.post(404), (400, {'error': "Vehicle not found"}))
+
+    def test_unexpected_errors_are_500_without_details(self):
+        with mock.patch('builtins.print'):
+            status, payload = self.post(500)
+        self.assertEqual(status, 500)
+        self.assertNotIn("connection reset", payload['error'])
+
+    def test_ids_must_be_integers(self):
+        self.assertEqual(self.post("1")[0], 400)
+        self.assertEqual(self.post(1, user_id=True)[0], 400)
+
+    def test_insurance_must_be_a_json_boolean(self):
+        self.assertEqual(self.post(1, insurance="false")[0], 400)
+        self.assertEqual(self.post(1, insurance=False)[0], 201)
+
+    def test_internal_value_errors_are_500(self):
+        with mock.patch('builtins.print'):
+            status, payload = self.post(501)
+        self.assertEqual(status, 500)
+        self.assertNotIn("invalid literal", payload['error'])
+
+
+if __name__ == "__main__":
+    unittest.main()